@@ -68,6 +68,42 @@ export const scraperService = {
         }
     },
 
+    // Subscribe to pushed progress (server-sent events) instead of polling.
+    // Every event carries the full status; returns the EventSource so callers can close it.
+    subscribeToScrapingEvents: (onStatus, { onOpen, onError } = {}) => {
+        if (typeof EventSource === 'undefined') {
+            return null;
+        }
+
+        const source = new EventSource(`${API_BASE_URLS.scraper}/scraping-events`);
+        const eventTypes = [
+            'status', 'run_started', 'run_finished', 'city', 'listings_found',
+            'listings_total', 'listing_processed', 'error'
+        ];
+
+        eventTypes.forEach((eventType) => {
+            source.addEventListener(eventType, (event) => {
+                try {
+                    const payload = JSON.parse(event.data);
+                    if (payload.status) {
+                        onStatus(payload.status, payload);
+                    }
+                } catch (error) {
+                    console.warn('Could not parse scraping event:', error);
+                }
+            });
+        });
+
+        source.onopen = () => onOpen && onOpen();
+        source.onerror = (error) => {
+            source.close();
+            if (onError) {
+                onError(error);
+            }
+        };
+        return source;
+    },
+
     getResults: async() => {
         try {
             // Always use the enhanced save_to_frontend=true parameter 
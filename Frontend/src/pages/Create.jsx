@@ -32,6 +32,7 @@ function Create() {
   const [loadingMessage, setLoadingMessage] = useState('')
   const scrapingTimeoutRef = useRef(null)
   const downloadIntervalRef = useRef(null)
+  const statusStreamRef = useRef(null)
   const [scrapingStartTime, setScrapingStartTime] = useState(null)
   const [elapsedTime, setElapsedTime] = useState(0)
   const timerIntervalRef = useRef(null)
@@ -461,6 +462,10 @@ function Create() {
       clearInterval(downloadIntervalRef.current);
       downloadIntervalRef.current = null;
     }
+    if (statusStreamRef.current) {
+      statusStreamRef.current.close();
+      statusStreamRef.current = null;
+    }
     if (scrapingTimeoutRef.current) {
       clearTimeout(scrapingTimeoutRef.current);
       scrapingTimeoutRef.current = null;
@@ -625,12 +630,37 @@ function Create() {
       const frequencyReductionThreshold = calculatedMaxAttempts;
       let hasReducedFrequency = false;
       
-      // Function to perform status check
-      const performStatusCheck = async () => {
-        attempts++;
+      // Stop both pushed and polled status updates
+      const stopStatusUpdates = () => {
+        clearInterval(downloadIntervalRef.current);
+        downloadIntervalRef.current = null;
+        if (statusStreamRef.current) {
+          statusStreamRef.current.close();
+          statusStreamRef.current = null;
+        }
+      };
+      
+      // Only the fields this page displays; live stats change with every event
+      const displayedStatus = (status) => JSON.stringify({
+        is_running: status.is_running,
+        progress: status.progress,
+        current_phase: status.current_phase,
+        last_completed: status.last_completed,
+        current_url: status.current_url,
+        completed: status.completed,
+        error: status.error,
+        no_results: status.no_results
+      });
+      
+      // Function to perform status check; pushed status from the event stream skips the request
+      const performStatusCheck = async (pushedStatus = null) => {
+        // Pushed events are not polls, so they do not count towards the check thresholds
+        if (!pushedStatus) {
+          attempts++;
+        }
         
         try {
-          const status = await checkScrapingStatus();
+          const status = pushedStatus || await checkScrapingStatus();
           
           if (status) {
             // Reset error counter and back-off delay on successful status check
@@ -643,7 +673,7 @@ function Create() {
             }
             
             // After many attempts, reduce the frequency of status checks to avoid server load
-            if (attempts >= frequencyReductionThreshold && !hasReducedFrequency) {
+            if (!pushedStatus && attempts >= frequencyReductionThreshold && !hasReducedFrequency) {
               console.log(`Reducing status check frequency after ${attempts} checks`);
               clearInterval(downloadIntervalRef.current);
               statusCheckDelay = 30000; // Check every 30 seconds after the threshold
@@ -660,7 +690,7 @@ function Create() {
             }
             
             // Only update if status has changed
-            if (JSON.stringify(status) !== JSON.stringify(lastStatus)) {
+            if (!lastStatus || displayedStatus(status) !== displayedStatus(lastStatus)) {
               lastStatus = status;
               
               // Handle different status cases
@@ -682,7 +712,7 @@ function Create() {
                   toast.info("Scraping is taking longer than usual to start. This is normal for many URLs.");
                 }
               } else if (status.completed) {
-                clearInterval(downloadIntervalRef.current);
+                stopStatusUpdates();
                 stopScrapingTimer();
                 setCurrentUrl(null);
                 setLoadingMessage('Scraping completed! Getting results...');
@@ -694,12 +724,12 @@ function Create() {
                   navigate('/generate');
                 }
               } else if (status.no_results || (status.current_phase === null && status.last_completed === null)) {
-                clearInterval(downloadIntervalRef.current);
+                stopStatusUpdates();
                 stopScrapingTimer();
                 setIsLoading(false);
                 toast.error('No results found for the specified criteria');
               } else if (status.error) {
-                clearInterval(downloadIntervalRef.current);
+                stopStatusUpdates();
                 stopScrapingTimer();
                 setIsLoading(false);
                 toast.error(`Scraping error: ${status.last_completed || 'Unknown error'}`);
@@ -819,9 +849,28 @@ function Create() {
         setLoadingMessage('Unable to get initial status, will continue monitoring...');
       }
       
-      // Begin regular status polling
+      // Begin regular status polling; it stops once the event stream is connected
       const downloadInterval = setInterval(performStatusCheck, statusCheckDelay);
       downloadIntervalRef.current = downloadInterval;
+      
+      statusStreamRef.current = scraperService.subscribeToScrapingEvents(
+        (status) => performStatusCheck(status),
+        {
+          onOpen: () => {
+            console.log('Status stream connected, stopping status polling');
+            clearInterval(downloadIntervalRef.current);
+            downloadIntervalRef.current = null;
+          },
+          onError: () => {
+            // Fall back to polling if the stream drops while scraping is still in progress
+            statusStreamRef.current = null;
+            if (!downloadIntervalRef.current && lastStatus && lastStatus.is_running) {
+              console.warn('Status stream lost, falling back to polling');
+              downloadIntervalRef.current = setInterval(performStatusCheck, statusCheckDelay);
+            }
+          }
+        }
+      );
 
     } catch (error) {
       console.error('Error in scraping process:', error);
@@ -838,6 +887,10 @@ function Create() {
         clearInterval(downloadIntervalRef.current);
         downloadIntervalRef.current = null;
       }
+      if (statusStreamRef.current) {
+        statusStreamRef.current.close();
+        statusStreamRef.current = null;
+      }
       if (scrapingTimeoutRef.current) {
         clearTimeout(scrapingTimeoutRef.current);
         scrapingTimeoutRef.current = null;
@@ -876,6 +929,9 @@ function Create() {
       if (downloadIntervalRef.current) {
         clearInterval(downloadIntervalRef.current);
       }
+      if (statusStreamRef.current) {
+        statusStreamRef.current.close();
+      }
       if (scrapingTimeoutRef.current) {
         clearTimeout(scrapingTimeoutRef.current);
       }
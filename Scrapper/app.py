@@ -1,5 +1,5 @@
 from fastapi import FastAPI, HTTPException, BackgroundTasks, APIRouter, Request
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, ValidationError
 from typing import Optional, Dict, Any, List, Set
@@ -10,8 +10,14 @@ import base64
 import asyncio
 import time
 import traceback
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from scraper import CraigslistScraper
+from run_manifest import RunManifest
+from events import bus
+from rate_limiter import rate_limiter
+from circuit_breaker import circuit_breaker
 import subprocess
 import sys
 import logging
@@ -47,9 +53,20 @@ scraping_status = {
     "completed": False,
     "error": False,
     "no_results": False,
-    "current_url": None
+    "current_url": None,
+    "listings_total": 0,
+    "listings_processed": 0,
+    "listings_skipped": 0,
+    "duplicates_skipped": 0
 }
 
+# Guards multi-field status updates made from the scraper worker thread
+status_lock = threading.Lock()
+
+# Dedicated worker thread for the blocking Selenium pipeline, so the event loop
+# keeps serving status polls and other requests while a scrape runs
+scraper_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="scraper")
+
 # Current configuration (modified via API)
 current_config = {
     "urls": CRAIGSLIST_URLS,
@@ -58,7 +75,8 @@ current_config = {
     "non_remote_keywords": NON_REMOTE_KEYWORDS,
     "use_headless": os.getenv('USE_HEADLESS', 'false').lower() == 'true',
     "batch_size": int(os.getenv('BATCH_SIZE', 10)),
-    "max_retries": int(os.getenv('MAX_RETRIES', 3))
+    "max_retries": int(os.getenv('MAX_RETRIES', 3)),
+    **rate_limiter.settings()
 }
 
 class ConfigUpdate(BaseModel):
@@ -69,6 +87,10 @@ class ConfigUpdate(BaseModel):
     use_headless: Optional[bool] = None
     batch_size: Optional[int] = None
     max_retries: Optional[int] = None
+    rate_limit_per_host: Optional[float] = None
+    rate_limit_burst: Optional[int] = None
+    rate_limit_global: Optional[float] = None
+    rate_limit_jitter: Optional[float] = None
 
 def update_config_file(config: Dict[str, Any]):
     """Update the config.py file with new configuration values."""
@@ -81,19 +103,68 @@ NON_REMOTE_KEYWORDS = {json.dumps(config['non_remote_keywords'], indent=4)}
         f.write(config_content)
         f.flush()
 
-def reset_status():
-    """Reset the scraping status to default values."""
-    global scraping_status
-    scraping_status = {
-        "is_running": False,
-        "progress": 0,
-        "current_phase": "Not Started",
-        "last_completed": None,
-        "completed": False,
-        "error": False,
-        "no_results": False,
-        "current_url": None
-    }
+def reset_status(running=False):
+    """Reset the scraping status to default values, keeping a claimed run marked as running."""
+    # Mutate in place so the scraper thread keeps writing to the same dict
+    with status_lock:
+        scraping_status.clear()
+        scraping_status.update({
+            "is_running": running,
+            "progress": 0,
+            "current_phase": "Not Started",
+            "last_completed": None,
+            "completed": False,
+            "error": False,
+            "no_results": False,
+            "current_url": None,
+            "listings_total": 0,
+            "listings_processed": 0,
+            "listings_skipped": 0,
+            "duplicates_skipped": 0
+        })
+
+def claim_run():
+    """Mark a run as started unless one already is; returns False if it was."""
+    with status_lock:
+        if scraping_status["is_running"]:
+            return False
+        scraping_status["is_running"] = True
+        return True
+
+def update_status(fields: Dict[str, Any]):
+    """Apply several status fields at once so pollers never see a half-updated phase."""
+    with status_lock:
+        scraping_status.update(fields)
+    bus.publish("status", fields=fields)
+
+def status_snapshot():
+    """Current status plus throughput figures, as sent to pollers and stream clients."""
+    with status_lock:
+        status = dict(scraping_status)
+    status["stats"] = bus.stats.snapshot()
+    status["rate_limits"] = rate_limiter.snapshot()
+    status["circuits"] = circuit_breaker.snapshot()
+    if scraper is not None and scraper.page_cache:
+        status["page_cache"] = scraper.page_cache.snapshot()
+    return status
+
+def apply_scraper_event(event):
+    """Mirror scraper progress events into scraping_status for /api/scraping-status."""
+    event_type = event["type"]
+    with status_lock:
+        if event_type == "city":
+            scraping_status["current_city"] = event.get("city")
+        elif event_type == "listings_total":
+            # A streaming run raises the total as search pages come in
+            scraping_status["listings_total"] = event.get("total", 0)
+            scraping_status["listings_skipped"] = event.get("skipped", 0)
+        elif event_type == "listing_processed":
+            scraping_status["listings_processed"] = event.get("processed", 0)
+        elif event_type == "duplicates_skipped":
+            # Postings found again by an overlapping search, never fetched twice
+            scraping_status["duplicates_skipped"] = event.get("total", 0)
+
+bus.add_listener(apply_scraper_event)
 
 # Configure logging
 log_dir = "logs"
@@ -121,7 +192,9 @@ async def root():
         "endpoints": {
             "GET /api": "This information",
             "POST /api/start-scraping": "Start the scraping process",
+            "POST /api/resume-scraping": "Resume an interrupted scraping run from its checkpoint",
             "GET /api/scraping-status": "Get current scraping status",
+            "GET /api/scraping-events": "Stream scraping progress as server-sent events",
             "GET /api/download-results": "Download or save results to frontend public folder",
             "POST /api/update-config": "Update scraper configuration",
             "GET /api/current-config": "Get current configuration",
@@ -139,7 +212,8 @@ async def start_scraping(background_tasks: BackgroundTasks):
     """Start the scraping process in the background."""
     global scraper, scraping_status
     
-    if scraping_status["is_running"]:
+    # Claimed before any await, so a second request cannot start a run alongside this one
+    if not claim_run():
         raise HTTPException(status_code=400, detail="Scraping is already running")
     
     try:
@@ -160,7 +234,7 @@ async def start_scraping(background_tasks: BackgroundTasks):
         
         # Reset status if not in no_results state
         if not scraping_status["no_results"]:
-            reset_status()
+            reset_status(running=True)
         
         # Open a new terminal to display scraping logs on Windows
         try:
@@ -175,15 +249,12 @@ async def start_scraping(background_tasks: BackgroundTasks):
         except Exception as e:
             print(f"Warning: Could not open separate terminal for logs: {str(e)}")
         
-        # Create a new scraper instance
-        scraper = CraigslistScraper()
-        
-        # Handle existing result file
-        output_file = os.getenv('OUTPUT_FILE', 'output/results.csv')
-        if os.path.exists(output_file):
-            os.remove(output_file)
+        # Create a new scraper instance (starts Chrome) on the scraper worker thread
+        scraper = await asyncio.get_running_loop().run_in_executor(scraper_executor, CraigslistScraper)
         
-        scraping_status["is_running"] = True
+        # Handle existing result file (offline runs have their own)
+        if os.path.exists(scraper.output_file):
+            os.remove(scraper.output_file)
         
         # Log scraping start
         scraping_logger.info("Scraping process started")
@@ -191,18 +262,62 @@ async def start_scraping(background_tasks: BackgroundTasks):
         background_tasks.add_task(run_scraper)
         return {"message": "Scraping started successfully", "status": "running"}
     except Exception as e:
-        scraping_status["is_running"] = False
+        update_status({"is_running": False})
         scraper = None
         scraping_logger.error(f"Error starting scraping: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
-async def run_scraper():
-    """Run the scraper process."""
+@router.post("/resume-scraping")
+async def resume_scraping(background_tasks: BackgroundTasks):
+    """Resume an interrupted scraping run without re-fetching completed links."""
     global scraper, scraping_status
     
+    if not claim_run():
+        raise HTTPException(status_code=400, detail="Scraping is already running")
+    
+    manifest = RunManifest(os.getenv('RUN_MANIFEST_FILE', 'checkpoints/run_manifest.json'))
+    if not manifest.load() or not manifest.is_resumable():
+        update_status({"is_running": False})
+        raise HTTPException(status_code=404, detail="No interrupted scraping run to resume")
+    
+    try:
+        reset_status(running=True)
+        
+        # Create a new scraper instance on the worker thread; existing results are kept
+        scraper = await asyncio.get_running_loop().run_in_executor(scraper_executor, CraigslistScraper)
+        
+        counts = manifest.counts()
+        searches = len(manifest.pending_searches())
+        scraping_logger.info(f"Scraping process resumed: {counts['done']} done, "
+                             f"{counts['pending'] + counts['failed']} remaining, {searches} searches left")
+        
+        background_tasks.add_task(run_scraper, resume=True)
+        return {
+            "message": "Scraping resumed successfully",
+            "status": "running",
+            "done": counts["done"],
+            "remaining": counts["pending"] + counts["failed"],
+            "searches_remaining": searches
+        }
+    except Exception as e:
+        update_status({"is_running": False})
+        scraper = None
+        scraping_logger.error(f"Error resuming scraping: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+async def run_scraper(resume=False):
+    """Run the scraper pipeline on the scraper worker thread."""
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(scraper_executor, run_scraper_blocking, resume)
+
+def run_scraper_blocking(resume=False):
+    """Run the scraper process, or only the remaining details of an interrupted run."""
+    global scraper
+    
+    bus.publish("run_started", resume=resume)
     try:
         # Phase 1: Scrape listings
-        scraping_status.update({
+        update_status({
             "is_running": True,
             "progress": 0,
             "current_phase": "Phase 1: Scraping listings",
@@ -215,14 +330,17 @@ async def run_scraper():
         # Redirect logging
         scraping_logger.info("Phase 1: Starting to scrape listings")
         
-        # Verify the driver is responsive
+        # Verify the driver is responsive; offline runs only parse cached pages and have none
         try:
-            current_url = scraper.driver.current_url
-            scraping_logger.info(f"Driver initialized, current URL: {current_url}")
+            if scraper.offline:
+                scraping_logger.info("Offline mode: parsing cached pages only, no browser")
+            else:
+                current_url = scraper.driver.current_url
+                scraping_logger.info(f"Driver initialized, current URL: {current_url}")
         except Exception as e:
             error_msg = f"Error with ChromeDriver: {str(e)}"
             scraping_logger.error(error_msg)
-            scraping_status.update({
+            update_status({
                 "is_running": False,
                 "current_phase": "Error",
                 "last_completed": error_msg,
@@ -231,51 +349,83 @@ async def run_scraper():
             })
             return
         
-        # Scrape listings
-        scraping_logger.info("Scraping listings from configured URLs...")
-        df = scraper.scrape_listings()
-        
-        if df is None or df.empty:
-            scraping_logger.info("No listings found - scraping complete")
-            scraping_status.update({
-                "is_running": False,
-                "progress": 0,
-                "current_phase": "Completed",
-                "last_completed": "No listings found",
-                "completed": True,
-                "error": False,
-                "no_results": True
+        if resume:
+            # Continue the checkpointed run; completed links are not fetched again
+            scraping_logger.info("Resuming interrupted scraping run from its checkpoint")
+            update_status({
+                "is_running": True,
+                "progress": 50,
+                "current_phase": "Phase 2: Scraping details",
+                "last_completed": "Resuming interrupted run",
             })
-            return
-        
-        scraping_logger.info(f"Found {len(df)} listings")
+            results_df = scraper.resume()
+        elif scraper.streaming_pipeline:
+            # Search pages feed the detail workers directly; both phases overlap
+            scraping_logger.info("Scraping listings and details as a streaming pipeline...")
+            update_status({
+                "current_phase": "Scraping listings and details",
+                "progress": 10,
+            })
+            results_df = scraper.scrape_pipeline()
             
-        # Phase 2 - Step 1: Clean listings
-        scraping_status.update({
-            "is_running": True,
-            "progress": 30,
-            "current_phase": "Phase 2: Cleaning listings",
-            "last_completed": f"Found {len(df)} listings",
-        })
-        
-        scraping_logger.info("Phase 2: Cleaning listings and removing duplicates")
-        df = scraper.clean_listings(df)
-        scraping_logger.info(f"After cleaning: {len(df)} unique listings remain")
-        
-        # Phase 2 - Step 2: Scrape details
-        scraping_status.update({
-            "is_running": True,
-            "progress": 50,
-            "current_phase": "Phase 2: Scraping details",
-            "last_completed": f"Processing {len(df)} listings",
-        })
-        
-        scraping_logger.info(f"Phase 2: Scraping details for {len(df)} listings")
-        results_df = scraper.scrape_details(df)
+            if results_df.empty:
+                scraping_logger.info("No listings found - scraping complete")
+                update_status({
+                    "is_running": False,
+                    "progress": 0,
+                    "current_phase": "Completed",
+                    "last_completed": "No listings found",
+                    "completed": True,
+                    "error": False,
+                    "no_results": True
+                })
+                return
+        else:
+            # Scrape listings
+            scraping_logger.info("Scraping listings from configured URLs...")
+            df = scraper.scrape_listings()
+            
+            if df is None or df.empty:
+                scraping_logger.info("No listings found - scraping complete")
+                update_status({
+                    "is_running": False,
+                    "progress": 0,
+                    "current_phase": "Completed",
+                    "last_completed": "No listings found",
+                    "completed": True,
+                    "error": False,
+                    "no_results": True
+                })
+                return
+            
+            scraping_logger.info(f"Found {len(df)} listings")
+            
+            # Phase 2 - Step 1: Clean listings
+            update_status({
+                "is_running": True,
+                "progress": 30,
+                "current_phase": "Phase 2: Cleaning listings",
+                "last_completed": f"Found {len(df)} listings",
+            })
+            
+            scraping_logger.info("Phase 2: Cleaning listings and removing duplicates")
+            df = scraper.clean_listings(df)
+            scraping_logger.info(f"After cleaning: {len(df)} unique listings remain")
+            
+            # Phase 2 - Step 2: Scrape details
+            update_status({
+                "is_running": True,
+                "progress": 50,
+                "current_phase": "Phase 2: Scraping details",
+                "last_completed": f"Processing {len(df)} listings",
+            })
+            
+            scraping_logger.info(f"Phase 2: Scraping details for {len(df)} listings")
+            results_df = scraper.scrape_details(df)
         
         # Update final status
         scraping_logger.info(f"Scraping complete! Total results: {len(results_df)} listings")
-        scraping_status.update({
+        update_status({
             "is_running": False,
             "progress": 100,
             "current_phase": "Completed",
@@ -289,7 +439,7 @@ async def run_scraper():
         error_msg = f"Error during scraping: {str(e)}"
         scraping_logger.error(error_msg)
         scraping_logger.error(traceback.format_exc())
-        scraping_status.update({
+        update_status({
             "is_running": False,
             "current_phase": "Error",
             "last_completed": f"Error: {str(e)}",
@@ -306,17 +456,55 @@ async def run_scraper():
             except Exception as e:
                 scraping_logger.error(f"Error closing browser: {str(e)}")
             scraper = None
+        bus.publish("run_finished")
 
 @router.get("/scraping-status")
 async def get_scraping_status():
     """Get the current status of the scraping process."""
-    return scraping_status
+    return status_snapshot()
+
+@router.get("/scraping-events")
+async def scraping_events(request: Request):
+    """
+    Push scraping progress as server-sent events instead of having clients poll.
+    Every event carries the full status and throughput stats, so a client only
+    needs the latest one.
+    """
+    loop = asyncio.get_running_loop()
+    queue = bus.subscribe(loop)
+    
+    def frame(event_type, payload, event_id=None):
+        lines = [f"id: {event_id}"] if event_id is not None else []
+        lines.append(f"event: {event_type}")
+        lines.append(f"data: {json.dumps(payload, default=str)}")
+        return "\n".join(lines) + "\n\n"
+    
+    async def stream():
+        try:
+            yield frame("status", {"type": "status", "status": status_snapshot()})
+            while True:
+                if await request.is_disconnected():
+                    break
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=15)
+                except asyncio.TimeoutError:
+                    # Keep proxies from closing an idle connection
+                    yield ": keepalive\n\n"
+                    continue
+                payload = dict(event)
+                payload["status"] = status_snapshot()
+                yield frame(event["type"], payload, event["id"])
+        finally:
+            bus.unsubscribe(queue)
+    
+    return StreamingResponse(stream(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
 
 @router.get("/download-results")
 async def download_results(save_to_frontend: bool = True):
     """Download scraped results as CSV and save to frontend public folder if requested."""
     try:
-        output_file = os.getenv('OUTPUT_FILE', 'output/results.csv')
+        output_file = scraper.output_file if scraper is not None else os.getenv('OUTPUT_FILE', 'output/results.csv')
         
         if not os.path.exists(output_file):
             raise HTTPException(
@@ -476,9 +664,22 @@ async def update_config(config_update: ConfigUpdate):
         if 'max_retries' in update_dict and not isinstance(update_dict['max_retries'], int):
             raise HTTPException(status_code=422, detail="max_retries must be an integer")
         
+        if any(key.startswith('rate_limit_') and value is not None and value < 0
+               for key, value in update_dict.items()):
+            raise HTTPException(status_code=422, detail="Rate limit settings must not be negative")
+        
         # Update the current config
         current_config.update(update_dict)
         
+        # Rate limits apply immediately, including to a scrape that is already running
+        rate_limiter.configure(
+            per_host=update_dict.get('rate_limit_per_host'),
+            burst=update_dict.get('rate_limit_burst'),
+            global_rate=update_dict.get('rate_limit_global'),
+            jitter=update_dict.get('rate_limit_jitter')
+        )
+        current_config.update(rate_limiter.settings())
+        
         # Update global variables directly
         if 'urls' in update_dict:
             CRAIGSLIST_URLS = update_dict['urls']
@@ -515,7 +716,7 @@ async def cleanup():
         # Close the scraper if it's running
         if scraper:
             try:
-                scraper.close()
+                await asyncio.get_running_loop().run_in_executor(None, scraper.close)
                 scraper = None
             except:
                 pass
@@ -0,0 +1,114 @@
+"""
+Micro-benchmark for the DataFrame clean-up steps of the scraper.
+
+Builds synthetic listing frames shaped like Frontend/public/output/results.csv
+and compares the old row-by-row implementations of the blacklist filter and
+the null-filling step with the vectorized ones in CraigslistScraper.
+
+Run from the Scrapper directory:
+    python benchmarks/bench_dataframe_filters.py [--rows 10000 100000]
+"""
+import os
+import sys
+import time
+import argparse
+import contextlib
+import io
+
+import numpy as np
+import pandas as pd
+
+SCRAPPER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SCRAPPER_DIR)
+
+from scraper import CraigslistScraper, BLACKLISTED_KEYWORDS  # noqa: E402
+
+SAMPLE_CSV = os.path.join(os.path.dirname(SCRAPPER_DIR), 'Frontend', 'public', 'output', 'results.csv')
+
+
+def legacy_filter_blacklisted_keywords(df):
+    """Row-by-row blacklist filter as it was before vectorization."""
+    filtered_df = df.copy()
+    rows_to_drop = []
+    for idx, row in filtered_df.iterrows():
+        should_filter = False
+        if 'NormalizedTitle' in row:
+            title = row['NormalizedTitle'].lower()
+            should_filter = any(keyword.lower() in title for keyword in BLACKLISTED_KEYWORDS)
+        if not should_filter and 'Title' in row:
+            title = str(row['Title']).lower()
+            should_filter = any(keyword.lower() in title for keyword in BLACKLISTED_KEYWORDS)
+        if not should_filter and 'Description' in row and pd.notna(row['Description']):
+            desc = str(row['Description']).lower()
+            should_filter = any(keyword.lower() in desc for keyword in BLACKLISTED_KEYWORDS)
+        if should_filter:
+            rows_to_drop.append(idx)
+    return filtered_df.drop(rows_to_drop)
+
+
+def legacy_replace_empty_with_null(df):
+    """Per-cell null filling as it was before vectorization."""
+    df_copy = df.copy()
+    has_data_mask = df_copy.notna().any(axis=1) & (df_copy != "").any(axis=1)
+    for idx in df_copy[has_data_mask].index:
+        for col in df_copy.columns:
+            if pd.isna(df_copy.at[idx, col]) or df_copy.at[idx, col] == "":
+                df_copy.at[idx, col] = "null"
+    return df_copy
+
+
+def build_frame(rows, seed=0):
+    """Sample rows from the recorded results file and sprinkle in blanks and blacklisted titles."""
+    sample = pd.read_csv(SAMPLE_CSV)
+    rng = np.random.default_rng(seed)
+    df = sample.iloc[rng.integers(0, len(sample), rows)].reset_index(drop=True)
+    df['Title'] = df['Title'].astype(str) + " #" + pd.Series(np.arange(rows)).astype(str)
+
+    spam = rng.random(rows) < 0.1
+    df.loc[spam, 'Title'] = "Paid research study " + df.loc[spam, 'Title']
+    for column in ['Gmail', 'Yahoo', 'Outlook', 'AOL', 'Default Mail']:
+        blanks = rng.random(rows) < 0.3
+        df[column] = df[column].astype(object)
+        df.loc[blanks, column] = ""
+    df['NormalizedTitle'] = df['Title'].str.lower()
+    return df
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, nargs='+', default=[10000, 100000])
+    parser.add_argument('--skip-legacy-above', type=int, default=100000,
+                        help="Skip the slow legacy null filling for frames larger than this")
+    args = parser.parse_args()
+
+    scraper = CraigslistScraper.__new__(CraigslistScraper)
+
+    print(f"{'rows':>8} {'step':<28} {'legacy (s)':>12} {'vectorized (s)':>15} {'speedup':>9}")
+    for rows in args.rows:
+        df = build_frame(rows)
+
+        legacy, legacy_time = timed(legacy_filter_blacklisted_keywords, df)
+        vectorized, vectorized_time = timed(scraper._filter_blacklisted_keywords, df)
+        assert legacy.index.equals(vectorized.index), "blacklist filter results differ"
+        print(f"{rows:>8} {'_filter_blacklisted_keywords':<28} {legacy_time:>12.3f} "
+              f"{vectorized_time:>15.3f} {legacy_time / vectorized_time:>8.1f}x")
+
+        vectorized, vectorized_time = timed(scraper._replace_empty_with_null, df)
+        if rows <= args.skip_legacy_above:
+            legacy, legacy_time = timed(legacy_replace_empty_with_null, df)
+            assert legacy.astype(str).equals(vectorized.astype(str)), "null filling results differ"
+            print(f"{rows:>8} {'_replace_empty_with_null':<28} {legacy_time:>12.3f} "
+                  f"{vectorized_time:>15.3f} {legacy_time / vectorized_time:>8.1f}x")
+        else:
+            print(f"{rows:>8} {'_replace_empty_with_null':<28} {'skipped':>12} {vectorized_time:>15.3f}")
+
+
+if __name__ == '__main__':
+    main()
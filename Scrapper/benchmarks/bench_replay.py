@@ -0,0 +1,262 @@
+"""
+End-to-end replay benchmark for CraigslistScraper, Phases 1 and 2.
+
+Starts the Craigslist stand-in from replay_server.py in a child process and
+drives the scraper through the search and detail phases against its recorded
+search-result, posting, reply-info and CAPTCHA pages. Reports pages/sec,
+per-phase latency percentiles and the peak RSS of the scraper process. Needs
+no network and no Chrome: the browser leg (postings that came back blocked and
+the reply flow) is replaced by a counter.
+
+Run from the Scrapper directory:
+    python benchmarks/bench_replay.py [--cities 8] [--per-city 120] [--workers 4] [--mode pipeline]
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import contextlib
+import io
+import logging
+import resource
+import tempfile
+import threading
+import multiprocessing
+from unittest import mock
+
+SCRAPPER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SCRAPPER_DIR)
+
+import config  # noqa: E402
+from scraper import CraigslistScraper  # noqa: E402
+from events import bus  # noqa: E402
+from rate_limiter import rate_limiter  # noqa: E402
+from replay_server import ReplaySite, ReplayServer  # noqa: E402
+
+CITIES = [
+    "fortcollins", "quincy", "denver", "boulder", "cheyenne", "pueblo", "greeley", "laramie",
+    "omaha", "lincoln", "wichita", "topeka", "tulsa", "amarillo", "santafe", "albuquerque"
+]
+
+
+def serve(conn, site_args, latency):
+    """Child process: run the stand-in until told to stop, then send back its request counts."""
+    server = ReplayServer(ReplaySite(**site_args), latency=latency).start()
+    conn.send(server.proxy_url)
+    conn.recv()
+    server.stop()
+    conn.send(server.counts)
+
+
+class ReplayScraper(CraigslistScraper):
+    """CraigslistScraper with per-phase timers and the Chrome leg replaced by counters."""
+
+    def __init__(self):
+        self.timings = {"search_page": [], "listing": []}
+        self.browser_visits = {"search": 0, "listing": 0}
+        self._counter_lock = threading.Lock()
+        with mock.patch('scraper.kill_chromedriver_processes'):
+            super().__init__()
+
+    def _count_browser_visit(self, kind):
+        with self._counter_lock:
+            self.browser_visits[kind] += 1
+
+    def _setup_driver(self):
+        return None
+
+    @contextlib.contextmanager
+    def _leased_driver(self):
+        yield None
+
+    def _scrape_search_page_selenium(self, url, city):
+        self._count_browser_visit("search")
+        return None
+
+    def _scrape_listing(self, link, listing_data, has_description=False, reply_tried=False):
+        self._count_browser_visit("listing")
+        return has_description
+
+    def _scrape_search_url(self, url, limit=None):
+        start = time.perf_counter()
+        try:
+            return super()._scrape_search_url(url, limit)
+        finally:
+            self.timings["search_page"].append(time.perf_counter() - start)
+
+    def _fetch_listing(self, idx, link, listing_data, defer=True):
+        start = time.perf_counter()
+        try:
+            return super()._fetch_listing(idx, link, listing_data, defer)
+        finally:
+            self.timings["listing"].append(time.perf_counter() - start)
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, int(round(pct / 100.0 * len(ordered))))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def peak_rss_mb():
+    # ru_maxrss is in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run(scraper, mode, max_listings):
+    """Run Phases 1-2 in the given mode; returns (results_df, phase wall times)."""
+    walls = {}
+    start = time.perf_counter()
+    if mode == 'pipeline':
+        df = scraper.scrape_pipeline(max_listings=max_listings)
+        walls["phases 1+2"] = time.perf_counter() - start
+        return df, walls
+
+    df = scraper.scrape_listings(max_listings=max_listings)
+    walls["phase 1"] = time.perf_counter() - start
+    start = time.perf_counter()
+    df = scraper.clean_listings(df)
+    df = scraper.scrape_details(df, max_listings=max_listings)
+    walls["phase 2"] = time.perf_counter() - start
+    return df, walls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--cities', type=int, default=8, help=f"Number of search URLs (max {len(CITIES)})")
+    parser.add_argument('--per-city', type=int, default=120, help="Postings listed for each city")
+    parser.add_argument('--page-size', type=int, default=120, help="Postings on each search result page")
+    parser.add_argument('--workers', type=int, default=4, help="DETAIL_WORKERS for Phase 2")
+    parser.add_argument('--mode', choices=['pipeline', 'batch'], default='pipeline')
+    parser.add_argument('--max-listings', type=int, default=None)
+    parser.add_argument('--latency-ms', type=float, default=20, help="Simulated server latency per request")
+    parser.add_argument('--captcha-rate', type=float, default=0.05, help="Share of postings first served a CAPTCHA")
+    parser.add_argument('--reply-rate', type=float, default=0.7, help="Share of postings with a reply button")
+    parser.add_argument('--overlap', type=float, default=0.1,
+                        help="Share of the next city's postings also listed on each search page")
+    parser.add_argument('--rate', type=float, default=50, help="Per-host request rate limit (requests/s)")
+    parser.add_argument('--global-rate', type=float, default=0, help="Overall request rate limit, 0 for none")
+    parser.add_argument('--json', help="Also write the report to this file")
+    parser.add_argument('--verbose', action='store_true', help="Show the scraper's own output")
+    args = parser.parse_args()
+
+    site_args = {
+        "cities": CITIES[:max(1, min(args.cities, len(CITIES)))],
+        "per_city": args.per_city,
+        "page_size": args.page_size,
+        "keywords": config.KEYWORDS,
+        "captcha_rate": args.captcha_rate,
+        "reply_rate": args.reply_rate,
+        "overlap": args.overlap
+    }
+    parent_conn, child_conn = multiprocessing.Pipe()
+    server_process = multiprocessing.Process(target=serve, args=(child_conn, site_args, args.latency_ms / 1000.0),
+                                             daemon=True)
+    server_process.start()
+    proxy_url = parent_conn.recv()
+
+    workdir = tempfile.TemporaryDirectory(prefix="bench_replay_")
+    os.environ.update({
+        "FETCH_ENGINE": "http",
+        "PAGE_CACHE_ENABLED": "false",
+        "INCREMENTAL_SCRAPE": "false",
+        "STREAMING_PIPELINE": "true" if args.mode == 'pipeline' else "false",
+        "DETAIL_WORKERS": str(args.workers),
+        "HTTP_POOL_SIZE": str(max(10, args.workers * 2)),
+        "LINKS_FILE": os.path.join(workdir.name, "links.csv"),
+        "HISTORY_LINKS_FILE": os.path.join(workdir.name, "history_links.csv"),
+        "OUTPUT_FILE": os.path.join(workdir.name, "results.csv"),
+        "RESULTS_JOURNAL_FILE": os.path.join(workdir.name, "results.jsonl"),
+        "RUN_MANIFEST_FILE": os.path.join(workdir.name, "run_manifest.json"),
+        "LISTING_DB_FILE": os.path.join(workdir.name, "listings.db"),
+        "NEAR_DUP_FILE": os.path.join(workdir.name, "near_duplicates.db"),
+        "CONTACT_CACHE_FILE": os.path.join(workdir.name, "contacts.db")
+    })
+    rate_limiter.configure(per_host=args.rate, global_rate=args.global_rate, jitter=0)
+    if not args.verbose:
+        logging.disable(logging.WARNING)
+
+    first_result = []
+    bus.add_listener(lambda event: first_result.append(time.perf_counter())
+                     if event["type"] == 'listing_processed' and not first_result else None)
+
+    rss_before = peak_rss_mb()
+    scraper = ReplayScraper()
+    scraper.urls = ReplaySite(**site_args).search_urls()
+    # Route every request through the stand-in; nothing leaves this machine
+    scraper.http_fetcher.session.trust_env = False
+    scraper.http_fetcher.session.proxies = {"http": proxy_url, "https": proxy_url}
+
+    output = io.StringIO()
+    start = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(sys.stdout if args.verbose else output):
+            df, walls = run(scraper, args.mode, args.max_listings)
+    finally:
+        total = time.perf_counter() - start
+        scraper.close()
+        parent_conn.send("stop")
+        counts = parent_conn.recv()
+        server_process.join(timeout=5)
+        workdir.cleanup()
+
+    pages = sum(counts.values())
+    listings = 0 if df is None else len(df)
+    described = 0
+    if listings and 'Description' in df.columns:
+        described = int((~df['Description'].astype(str).str.startswith("Error:")).sum())
+    report = {
+        "mode": args.mode,
+        "workers": args.workers,
+        "search_urls": len(scraper.urls),
+        "pages_served": counts,
+        "pages_per_sec": round(pages / total, 1) if total else 0.0,
+        "wall_seconds": {name: round(value, 3) for name, value in dict(walls, total=total).items()},
+        "first_result_seconds": round(first_result[0] - start, 3) if first_result else None,
+        "duplicates_skipped": scraper.discovery_stats['duplicates'],
+        "near_duplicates_skipped": scraper.discovery_stats['near_duplicates'],
+        "listings": listings,
+        "listings_with_description": described,
+        "browser_visits_stubbed": scraper.browser_visits,
+        "reply_paths": scraper.reply_stats,
+        "latency_ms": {
+            phase: {f"p{pct}": round(percentile(values, pct) * 1000, 1) for pct in (50, 90, 99)}
+            for phase, values in scraper.timings.items()
+        },
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "rss_growth_mb": round(peak_rss_mb() - rss_before, 1)
+    }
+
+    print(f"mode {report['mode']}, {report['workers']} workers, {report['search_urls']} search URLs, "
+          f"{args.per_city} postings each in pages of {args.page_size}, {args.latency_ms:g} ms server latency")
+    print(f"{'pages served':<28} {pages:>10}  ({', '.join(f'{k} {v}' for k, v in counts.items() if v)})")
+    print(f"{'pages/sec':<28} {report['pages_per_sec']:>10.1f}")
+    for name, value in report["wall_seconds"].items():
+        print(f"{'wall ' + name + ' (s)':<28} {value:>10.3f}")
+    if report["first_result_seconds"] is not None:
+        print(f"{'first result (s)':<28} {report['first_result_seconds']:>10.3f}")
+    print(f"{'duplicates / near skipped':<28} {report['duplicates_skipped']:>10} / "
+          f"{report['near_duplicates_skipped']}")
+    print(f"{'listings / with description':<28} {listings:>10} / {described}")
+    print(f"{'browser visits (stubbed)':<28} {sum(scraper.browser_visits.values()):>10}  "
+          f"(search {scraper.browser_visits['search']}, listing {scraper.browser_visits['listing']})")
+    http = scraper.reply_stats['http']
+    print(f"{'reply info via HTTP':<28} {http['found']:>10} / {http['attempts']}  "
+          f"({http['seconds'] / max(1, http['attempts']) * 1000:.1f} ms each)")
+    print(f"{'phase latency (ms)':<28} {'p50':>10} {'p90':>10} {'p99':>10} {'n':>8}")
+    for phase, values in scraper.timings.items():
+        stats = report["latency_ms"][phase]
+        print(f"{'  ' + phase:<28} {stats['p50']:>10.1f} {stats['p90']:>10.1f} {stats['p99']:>10.1f} {len(values):>8}")
+    print(f"{'peak RSS (MB)':<28} {report['peak_rss_mb']:>10.1f}  (+{report['rss_growth_mb']} during the run)")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,241 @@
+"""
+Local stand-in for the Craigslist hosts used by the replay benchmark.
+
+Serves the recorded page templates in benchmarks/fixtures as search result
+pages, postings, reply-info fragments and CAPTCHA challenges. Clients reach
+it as an HTTP proxy, so the scraper keeps requesting the usual
+`<city>.craigslist.org` URLs and per-host rate limits and circuits behave as
+they do against the real site. Nothing is ever sent past this server.
+"""
+import os
+import time
+import random
+import threading
+from string import Template
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+FIRST_POSTING_ID = 7800000000
+
+# Title shapes: matching ones are filled in with a configured keyword
+MATCHING_TITLES = [
+    "Need a {keyword} developer for a small business site",
+    "Looking for {keyword} help - contract",
+    "{keyword} freelancer wanted, remote ok",
+    "Part time {keyword} work available"
+]
+OTHER_TITLES = [
+    "Moving help needed this weekend",
+    "Line cook wanted for busy kitchen",
+    "Warehouse associate - day shift"
+]
+BLACKLISTED_TITLES = [
+    "Paid research study for {keyword} users",
+    "Get paid to test {keyword} apps"
+]
+# Per-posting details, so only the deliberate reposts look alike
+COMPANIES = ["Acme", "Bluebird", "Cedar", "Driftwood", "Ember", "Foxglove", "Granite", "Harbor",
+             "Ironwood", "Juniper", "Keystone", "Lakeside", "Maple", "Northstar", "Oakridge", "Pinecrest"]
+DETAILS = ["invoicing", "booking", "inventory", "checkout", "dashboard", "newsletter", "portal",
+           "catalog", "scheduling", "payments", "analytics", "onboarding", "reporting", "search"]
+DESCRIPTIONS = [
+    "We are a small team looking for someone to help with an ongoing project.",
+    "This is a fully remote position, work from home on your own schedule.",
+    "Must be able to work on site at our downtown office three days a week.",
+    "Please reply with a short summary of similar work and your rate."
+]
+
+
+def load_fixture(name):
+    with open(os.path.join(FIXTURES_DIR, name), encoding='utf-8') as f:
+        return Template(f.read())
+
+
+class ReplaySite:
+    """
+    Deterministic catalogue of search pages and postings for a set of cities.
+
+    Every city has `per_city` postings, listed `page_size` to a search result
+    page and paged with the `s` offset like the real site. Titles cycle through matching,
+    non-matching and blacklisted shapes, and some matching titles are reposted
+    in every city so the duplicate filters have work to do. A `captcha_rate`
+    share of the postings answers its first request with a CAPTCHA page, and
+    a `reply_rate` share exposes a reply button with a reply-info page.
+    Search radii overlap: each page also lists the first `overlap` share of the
+    next city's postings, linked to that city's host.
+    """
+
+    def __init__(self, cities, per_city, keywords, page_size=120, captcha_rate=0.05, reply_rate=0.7, overlap=0.1,
+                 seed=0):
+        self.cities = list(cities)
+        self.per_city = per_city
+        self.page_size = page_size
+        self.overlap = overlap
+        self.templates = {name: load_fixture(f"{name}.html") for name in
+                          ('search_page', 'search_row', 'posting', 'reply_button', 'reply_info', 'captcha')}
+        rng = random.Random(seed)
+        self.postings = {}
+        self.by_city = {}
+        for city_index, city in enumerate(self.cities):
+            ids = []
+            for j in range(per_city):
+                pid = FIRST_POSTING_ID + city_index * 100000 + j
+                keyword = rng.choice(keywords)
+                shape = j % 10
+                if shape < 7 and j % 3 == 0:
+                    # Reposted in every city, so only the first copy survives the title dedupe
+                    title = MATCHING_TITLES[j % len(MATCHING_TITLES)].format(keyword=keywords[j % len(keywords)])
+                elif shape < 7:
+                    title = (MATCHING_TITLES[j % len(MATCHING_TITLES)].format(keyword=keyword)
+                             + f" ({rng.choice(COMPANIES)} {rng.choice(DETAILS)} {pid % 1000})")
+                elif shape < 9:
+                    title = OTHER_TITLES[j % len(OTHER_TITLES)]
+                else:
+                    title = BLACKLISTED_TITLES[j % len(BLACKLISTED_TITLES)].format(keyword=keyword)
+                slug = "-".join(title.lower().split()[:5]).replace('#', '')
+                self.postings[pid] = {
+                    "pid": pid,
+                    "city": city,
+                    "title": title,
+                    "path": f"/{city[:3]}/sof/d/{slug}/{pid}.html",
+                    "body": " ".join(rng.sample(DESCRIPTIONS, 2) + [
+                        f"{rng.choice(COMPANIES)} needs a {' and '.join(rng.sample(DETAILS, 3))} "
+                        f"feature, reference {rng.getrandbits(32):08x}, budget {rng.randint(5, 90) * 100} dollars."
+                    ]),
+                    "reply": rng.random() < reply_rate,
+                    "captcha": rng.random() < captcha_rate,
+                    "email": f"{rng.getrandbits(64):016x}@job.craigslist.org"
+                }
+                ids.append(pid)
+            self.by_city[city] = ids
+
+    def host(self, city):
+        return f"{city}.craigslist.org"
+
+    def search_urls(self):
+        return [f"http://{self.host(city)}/search/sof?postedToday=1" for city in self.cities]
+
+    def listed_on(self, city):
+        """Posting ids on a city's search page, including the overlap with the next city."""
+        neighbour = self.cities[(self.cities.index(city) + 1) % len(self.cities)]
+        shared = self.by_city[neighbour][:int(self.per_city * self.overlap)] if neighbour != city else []
+        return self.by_city[city] + shared
+
+    def render_search(self, city, offset=0):
+        listed = self.listed_on(city)
+        page = listed[offset:offset + self.page_size]
+        rows = []
+        for pid in page:
+            posting = self.postings[pid]
+            link = f"http://{self.host(posting['city'])}{posting['path']}"
+            rows.append(self.templates['search_row'].substitute(title=posting['title'], link=link, city=city))
+        return self.templates['search_page'].substitute(
+            city=city, host=self.host(city), first=offset + 1 if page else 0, last=offset + len(page),
+            count=len(listed), results="".join(rows)
+        )
+
+    def render_posting(self, posting):
+        link = f"http://{self.host(posting['city'])}{posting['path']}"
+        reply_button = ""
+        if posting['reply']:
+            reply_button = self.templates['reply_button'].substitute(area=posting['city'][:3], pid=posting['pid'])
+        paragraphs = "".join(f"                <p>{sentence.rstrip('.')}.</p>\n" for sentence in posting['body'].split('. '))
+        return self.templates['posting'].substitute(
+            title=posting['title'], link=link, city=posting['city'], pid=posting['pid'],
+            reply_button=reply_button, body=paragraphs, posted=time.strftime("%Y-%m-%dT%H:%M:%S%z")
+        )
+
+    def render_reply(self, posting):
+        subject = posting['title'].replace(' ', '%20')
+        return self.templates['reply_info'].substitute(email=posting['email'], subject=subject)
+
+    def render_captcha(self):
+        return self.templates['captcha'].substitute()
+
+
+class ReplayServer:
+    """Threaded HTTP server answering proxy-style requests from a ReplaySite."""
+
+    def __init__(self, site, latency=0.0, host='127.0.0.1', port=0):
+        self.site = site
+        self.latency = latency
+        self.counts = {"search": 0, "posting": 0, "reply": 0, "captcha": 0, "not_found": 0}
+        self._lock = threading.Lock()
+        self._challenged = set()
+        self.httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def proxy_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _count(self, key):
+        with self._lock:
+            self.counts[key] += 1
+
+    def _first_visit(self, pid):
+        with self._lock:
+            if pid in self._challenged:
+                return False
+            self._challenged.add(pid)
+            return True
+
+    def route(self, host, path, query=""):
+        """Return (status, html) for a request to `host` + `path`."""
+        site = self.site
+        city = host.split('.')[0]
+        if path.startswith('/search/') and city in site.by_city:
+            self._count("search")
+            offset = parse_qs(query).get('s', ['0'])[0]
+            return 200, site.render_search(city, int(offset) if offset.isdigit() else 0)
+        name = path.rstrip('/').rsplit('/', 1)[-1].split('.')[0]
+        posting = site.postings.get(int(name)) if name.isdigit() else None
+        if posting is None or posting['city'] != city:
+            self._count("not_found")
+            return 404, "<html><body><p>This posting has been deleted by its author.</p></body></html>"
+        if path.startswith('/reply/'):
+            self._count("reply")
+            return 200, site.render_reply(posting)
+        if posting['captcha'] and self._first_visit(posting['pid']):
+            self._count("captcha")
+            return 200, site.render_captcha()
+        self._count("posting")
+        return 200, site.render_posting(posting)
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                # Proxied requests carry the absolute URL in the request line
+                parts = urlsplit(self.path)
+                host = (parts.netloc or self.headers.get('Host', '')).split(':')[0].lower()
+                if server.latency:
+                    time.sleep(server.latency)
+                status, html = server.route(host, parts.path, parts.query)
+                body = html.encode('utf-8')
+                self.send_response(status)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="replay-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
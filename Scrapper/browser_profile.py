@@ -0,0 +1,200 @@
+import os
+import json
+import time
+import threading
+import logging
+
+logger = logging.getLogger('scraper.BrowserProfile')
+
+# Resources the scraper never reads. CDP wildcard patterns, matched against the whole URL.
+BLOCKED_URL_PATTERNS = [
+    "*images.craigslist.org/*",
+    "*.png*", "*.jpg*", "*.jpeg*", "*.gif*", "*.webp*", "*.avif*", "*.svg*", "*.ico*", "*.bmp*",
+    "*.mp4*", "*.webm*", "*.m3u8*", "*.mp3*", "*.ogg*", "*.wav*",
+    "*.woff*", "*.ttf*", "*.otf*", "*.eot*"
+]
+
+# Hosts a lean browser may resolve. Craigslist itself plus the CAPTCHA providers,
+# so a challenge can still be solved by hand in the visible browser.
+DEFAULT_ALLOWED_HOSTS = (
+    "craigslist.org,*.craigslist.org,hcaptcha.com,*.hcaptcha.com,"
+    "www.google.com,*.gstatic.com,recaptcha.net,*.recaptcha.net"
+)
+
+# Chrome features with background work or memory cost that scraping never uses
+DISABLED_FEATURES = [
+    "VizDisplayCompositor",
+    "Translate",
+    "OptimizationHints",
+    "MediaRouter",
+    "AutofillServerCommunication",
+    "CertificateTransparencyComponentUpdater",
+    "InterestFeedContentSuggestions"
+]
+
+LEAN_ARGUMENTS = [
+    "--blink-settings=imagesEnabled=false",
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--disable-client-side-phishing-detection",
+    "--disable-domain-reliability",
+    "--metrics-recording-only",
+    "--mute-audio",
+    "--no-first-run",
+    "--no-default-browser-check"
+]
+
+LEAN_PREFS = {
+    "profile.managed_default_content_settings.images": 2,
+    "profile.default_content_setting_values.media_stream": 2,
+    "profile.default_content_setting_values.plugins": 2
+}
+
+
+def lean_profile_enabled():
+    return os.getenv('CHROME_LEAN_PROFILE', 'true').lower() == 'true'
+
+
+def allowed_hosts():
+    hosts = os.getenv('CHROME_ALLOWED_HOSTS', DEFAULT_ALLOWED_HOSTS)
+    return [host.strip() for host in hosts.split(',') if host.strip()]
+
+
+def host_resolver_rules(hosts):
+    """Chrome --host-resolver-rules value that fails DNS for every host not in `hosts`."""
+    return ", ".join(["MAP * ~NOTFOUND"] + [f"EXCLUDE {host}" for host in hosts])
+
+
+def apply_lean_options(chrome_options, prefs):
+    """
+    Configure a lean browsing profile on `chrome_options` and extend `prefs` in place.
+
+    Navigation returns at DOMContentLoaded (`eager`) instead of waiting for every
+    subresource, images are off, background services are disabled and hosts
+    outside the allow list never resolve, which blocks third-party scripts.
+    """
+    chrome_options.page_load_strategy = os.getenv('CHROME_PAGE_LOAD_STRATEGY', 'eager')
+    for argument in LEAN_ARGUMENTS:
+        chrome_options.add_argument(argument)
+    hosts = allowed_hosts()
+    if hosts and hosts != ['*']:
+        chrome_options.add_argument(f"--host-resolver-rules={host_resolver_rules(hosts)}")
+    prefs.update(LEAN_PREFS)
+
+
+def disabled_features_argument(lean):
+    # Chrome only honours the last --disable-features switch, so build a single one
+    features = DISABLED_FEATURES if lean else DISABLED_FEATURES[:1]
+    return f"--disable-features={','.join(features)}"
+
+
+def block_resources(driver, patterns=None):
+    """Block image, media and font requests in `driver` through CDP; returns True on success."""
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns or BLOCKED_URL_PATTERNS})
+        return True
+    except Exception as e:
+        logger.warning(f"Could not set blocked URLs: {str(e)}")
+        return False
+
+
+def saved_cookies(path, max_age_hours):
+    """
+    Craigslist cookies saved by an earlier session that are still usable: the file
+    is younger than `max_age_hours` and expired cookies are dropped. [] if none.
+    """
+    try:
+        if time.time() - os.path.getmtime(path) > max_age_hours * 3600:
+            return []
+        with open(path) as f:
+            cookies = json.load(f)
+    except (OSError, ValueError):
+        return []
+    now = time.time()
+    return [
+        cookie for cookie in cookies
+        if isinstance(cookie, dict) and cookie.get('name') and 'craigslist' in cookie.get('domain', '')
+        and (cookie.get('expiry') is None or cookie['expiry'] > now)
+    ]
+
+
+def inject_cookies(driver, cookies):
+    """Load WebDriver-format cookies through CDP, which needs no page of the cookie's domain to be open."""
+    params = []
+    for cookie in cookies:
+        param = {
+            "name": cookie['name'],
+            "value": cookie.get('value', ''),
+            "domain": cookie['domain'],
+            "path": cookie.get('path', '/'),
+            "secure": bool(cookie.get('secure', False)),
+            "httpOnly": bool(cookie.get('httpOnly', False))
+        }
+        if cookie.get('expiry') is not None:
+            param["expires"] = cookie['expiry']
+        if cookie.get('sameSite') in ("Strict", "Lax", "None"):
+            param["sameSite"] = cookie['sameSite']
+        params.append(param)
+    try:
+        driver.execute_cdp_cmd("Network.setCookies", {"cookies": params})
+        return True
+    except Exception as e:
+        logger.warning(f"Could not load saved cookies: {str(e)}")
+        return False
+
+
+def profile_has_cookies(profile_dir):
+    """True if a persistent Chrome profile already holds a cookie store from an earlier session."""
+    return any(os.path.exists(os.path.join(profile_dir, 'Default', *parts))
+               for parts in (('Network', 'Cookies'), ('Cookies',)))
+
+
+class PersistentProfiles:
+    """
+    Hands out persistent Chrome user data directories under `base_dir`.
+
+    Chrome locks a profile while it runs, so every live driver gets its own
+    slot (`profile-0`, `profile-1`, ...). A slot is free again once the
+    chromedriver process bound to it has exited.
+    """
+
+    def __init__(self, base_dir):
+        self.base_dir = os.path.abspath(base_dir)
+        self._lock = threading.Lock()
+        self._slots = {}
+
+    @staticmethod
+    def _exited(driver):
+        try:
+            return driver.service.process.poll() is not None
+        except Exception:
+            return True
+
+    def claim(self):
+        with self._lock:
+            for slot, driver in list(self._slots.items()):
+                if driver is not None and self._exited(driver):
+                    del self._slots[slot]
+            slot = 0
+            while slot in self._slots:
+                slot += 1
+            # Reserved until bind(); a failed start releases it
+            self._slots[slot] = None
+        path = os.path.join(self.base_dir, f"profile-{slot}")
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    def _slot_of(self, path):
+        return int(os.path.basename(path).rsplit('-', 1)[1])
+
+    def bind(self, path, driver):
+        with self._lock:
+            self._slots[self._slot_of(path)] = driver
+
+    def release(self, path):
+        with self._lock:
+            self._slots.pop(self._slot_of(path), None)
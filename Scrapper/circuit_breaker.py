@@ -0,0 +1,131 @@
+import os
+import time
+import threading
+import logging
+from urllib.parse import urlparse
+
+from events import bus
+
+logger = logging.getLogger('scraper.CircuitBreaker')
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitBreaker:
+    """
+    Per-host circuit breaker for Craigslist subdomains.
+
+    `failure_threshold` consecutive failures (timeouts, connection errors,
+    pages that never load) open a host's circuit: its requests are refused
+    without touching the network. After `cooldown` seconds the circuit is half
+    open and lets one trial request through. A success closes it again, and a
+    failure reopens it for another cooldown.
+    """
+
+    def __init__(self, failure_threshold=None, cooldown=None):
+        if failure_threshold is None:
+            failure_threshold = int(os.getenv('CIRCUIT_FAILURE_THRESHOLD', 3))
+        if cooldown is None:
+            cooldown = float(os.getenv('CIRCUIT_COOLDOWN', 120))
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.cooldown = max(0.0, float(cooldown))
+        self._lock = threading.Lock()
+        self._hosts = {}
+
+    @staticmethod
+    def host_of(url):
+        return urlparse(url).netloc.lower()
+
+    def _circuit(self, host):
+        return self._hosts.setdefault(host, {
+            "state": CLOSED, "failures": 0, "opened_at": None, "trips": 0, "trial": None
+        })
+
+    def _cooled_down(self, circuit):
+        return time.monotonic() - circuit["opened_at"] >= self.cooldown
+
+    def _trial_in_flight(self, circuit):
+        # A trial whose outcome was never reported expires after one cooldown
+        return circuit["trial"] is not None and time.monotonic() - circuit["trial"] < self.cooldown
+
+    def is_available(self, url):
+        """True if a request to this host would be let through right now (does not claim a trial)."""
+        with self._lock:
+            circuit = self._hosts.get(self.host_of(url))
+            if circuit is None or circuit["state"] == CLOSED:
+                return True
+            if circuit["state"] == OPEN:
+                return self._cooled_down(circuit)
+            return not self._trial_in_flight(circuit)
+
+    def allow(self, url):
+        """Decide whether to send a request to this host; half-open circuits admit one trial at a time."""
+        host = self.host_of(url)
+        with self._lock:
+            circuit = self._circuit(host)
+            if circuit["state"] == CLOSED:
+                return True
+            if circuit["state"] == OPEN:
+                if not self._cooled_down(circuit):
+                    return False
+                circuit["state"] = HALF_OPEN
+                circuit["trial"] = None
+            if self._trial_in_flight(circuit):
+                return False
+            circuit["trial"] = time.monotonic()
+        logger.info(f"Circuit for {host} is half open, sending a trial request")
+        bus.publish('circuit', host=host, state=HALF_OPEN)
+        return True
+
+    def record_success(self, url):
+        host = self.host_of(url)
+        with self._lock:
+            circuit = self._circuit(host)
+            was_closed = circuit["state"] == CLOSED
+            circuit.update(state=CLOSED, failures=0, opened_at=None, trial=None)
+        if not was_closed:
+            logger.info(f"Circuit for {host} closed")
+            bus.publish('circuit', host=host, state=CLOSED)
+
+    def record_failure(self, url, reason=None):
+        """Count a failed request; returns True if the host's circuit is now open."""
+        host = self.host_of(url)
+        with self._lock:
+            circuit = self._circuit(host)
+            circuit["failures"] += 1
+            if circuit["state"] == OPEN:
+                return True
+            if circuit["state"] == CLOSED and circuit["failures"] < self.failure_threshold:
+                return False
+            circuit.update(state=OPEN, opened_at=time.monotonic(), trial=None)
+            circuit["trips"] += 1
+            failures = circuit["failures"]
+        logger.warning(f"Circuit for {host} opened after {failures} consecutive failures"
+                       f"{f' ({reason})' if reason else ''}; retrying in {self.cooldown:.0f}s")
+        bus.publish('circuit', host=host, state=OPEN, failures=failures, reason=reason)
+        return True
+
+    def snapshot(self):
+        """State of every host that has had a failure, with seconds until an open circuit half-opens."""
+        with self._lock:
+            now = time.monotonic()
+            hosts = {}
+            for host, circuit in self._hosts.items():
+                if circuit["state"] == CLOSED and not circuit["failures"] and not circuit["trips"]:
+                    continue
+                retry_in = None
+                if circuit["state"] == OPEN:
+                    retry_in = round(max(0.0, self.cooldown - (now - circuit["opened_at"])), 1)
+                hosts[host] = {
+                    "state": circuit["state"],
+                    "failures": circuit["failures"],
+                    "trips": circuit["trips"],
+                    "retry_in_seconds": retry_in
+                }
+            return hosts
+
+
+# Process-wide breaker shared by the HTTP and browser fetch paths
+circuit_breaker = CircuitBreaker()
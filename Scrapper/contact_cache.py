@@ -0,0 +1,99 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+import logging
+
+from listing_store import posting_id
+
+logger = logging.getLogger('scraper.ContactCache')
+
+NOT_AVAILABLE = "Not Available"
+
+# Result fields filled in by the reply flow
+CONTACT_FIELDS = ['Email', 'Default Mail', 'Gmail', 'Yahoo', 'Outlook', 'AOL']
+
+
+class ContactCache:
+    """
+    Persistent cache of reply contact details, keyed by posting id.
+
+    Stores the email and webmail fields the reply flow extracted for a
+    posting, so reruns and retries of the same posting skip that flow.
+    Postings whose reply flow found no address ("Not Available") are cached
+    too, with the shorter `negative_ttl`, since that result may come from a
+    transient CAPTCHA or timeout rather than a posting without an email.
+    """
+
+    def __init__(self, path=None, ttl=None, negative_ttl=None):
+        if path is None:
+            path = os.getenv('CONTACT_CACHE_FILE', 'cache/contacts.db')
+        if ttl is None:
+            ttl = float(os.getenv('CONTACT_CACHE_TTL', 30 * 24 * 3600))
+        if negative_ttl is None:
+            negative_ttl = float(os.getenv('CONTACT_CACHE_NEGATIVE_TTL', 6 * 3600))
+        self.path = path
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.stats = {"hits": 0, "negative_hits": 0, "misses": 0, "stale": 0, "stored": 0}
+
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS contacts (
+                posting_id TEXT PRIMARY KEY,
+                found INTEGER NOT NULL,
+                fields TEXT NOT NULL,
+                fetched_at REAL NOT NULL
+            );
+        """)
+        self._purge()
+        self._conn.commit()
+
+    def _purge(self):
+        # Entries past their TTL are never served again
+        now = time.time()
+        self._conn.execute(
+            "DELETE FROM contacts WHERE (found = 1 AND fetched_at < ?) OR (found = 0 AND fetched_at < ?)",
+            (now - self.ttl, now - self.negative_ttl)
+        )
+
+    def get(self, link):
+        """Return the cached contact fields of a posting if present and within their TTL, else None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT found, fields, fetched_at FROM contacts WHERE posting_id = ?", (posting_id(link),)
+            ).fetchone()
+            if row is None:
+                self.stats["misses"] += 1
+                return None
+            found, fields, fetched_at = row
+            if time.time() - fetched_at > (self.ttl if found else self.negative_ttl):
+                self.stats["stale"] += 1
+                return None
+            self.stats["hits" if found else "negative_hits"] += 1
+        return json.loads(fields)
+
+    def put(self, link, email_data):
+        """Store the contact fields the reply flow extracted for a posting."""
+        fields = {field: email_data.get(field, "") for field in CONTACT_FIELDS}
+        found = bool(fields['Email']) and fields['Email'] != NOT_AVAILABLE
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO contacts (posting_id, found, fields, fetched_at) VALUES (?, ?, ?, ?)",
+                (posting_id(link), int(found), json.dumps(fields), time.time())
+            )
+            self._conn.commit()
+            self.stats["stored"] += 1
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self.stats)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,209 @@
+import os
+import queue
+import shutil
+import threading
+import logging
+from contextlib import contextmanager
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+logger = logging.getLogger('scraper.DriverPool')
+
+
+class PooledDriver:
+    """A Chrome session owned by the pool together with its bookkeeping."""
+
+    def __init__(self, driver, user_data_dir):
+        self.driver = driver
+        self.user_data_dir = user_data_dir
+        self.pages = 0
+        # Set once the session is gone and its slot given back to the pool
+        self.retired = False
+
+    def memory_mb(self):
+        """Return the resident memory of chromedriver and its Chrome children in MB."""
+        if psutil is None:
+            return 0
+        try:
+            root = psutil.Process(self.driver.service.process.pid)
+            processes = [root] + root.children(recursive=True)
+            total = 0
+            for proc in processes:
+                try:
+                    total += proc.memory_info().rss
+                except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                    continue
+            return total / (1024 * 1024)
+        except Exception:
+            return 0
+
+
+class DriverPool:
+    """
+    Keep up to `size` warm WebDriver sessions and lease them out to listing fetches.
+
+    Sessions are created lazily through `factory`, which must return a
+    `(driver, user_data_dir)` tuple. A session is only torn down when it fails
+    the health check, has served `max_pages` pages or grows past `max_memory_mb`.
+    """
+
+    def __init__(self, factory, size=1, max_pages=50, max_memory_mb=1024, health_check=None):
+        self.factory = factory
+        self.size = max(1, int(size))
+        self.max_pages = max(1, int(max_pages))
+        self.max_memory_mb = float(max_memory_mb)
+        self.health_check = health_check
+
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._created = 0
+        self._closed = False
+
+    def _spawn(self):
+        driver, user_data_dir = self.factory()
+        logger.info("Created pooled Chrome session")
+        return PooledDriver(driver, user_data_dir)
+
+    def _destroy(self, pooled):
+        try:
+            pooled.driver.quit()
+        except Exception as e:
+            logger.error(f"Error quitting pooled driver: {str(e)}")
+        if pooled.user_data_dir and os.path.exists(pooled.user_data_dir):
+            try:
+                shutil.rmtree(pooled.user_data_dir)
+            except Exception as e:
+                logger.error(f"Error removing pooled user data directory: {str(e)}")
+
+    def _is_healthy(self, pooled):
+        if self.health_check is None:
+            return True
+        try:
+            return bool(self.health_check(pooled.driver))
+        except Exception:
+            return False
+
+    def _needs_recycle(self, pooled):
+        if pooled.pages >= self.max_pages:
+            logger.info(f"Recycling pooled session after {pooled.pages} pages")
+            return True
+        memory = pooled.memory_mb()
+        if memory > self.max_memory_mb:
+            logger.info(f"Recycling pooled session using {memory:.0f} MB")
+            return True
+        return False
+
+    def acquire(self, timeout=None):
+        """Lease a healthy session, creating one if the pool is not yet full."""
+        if self._closed:
+            raise RuntimeError("Driver pool is closed")
+
+        try:
+            pooled = self._idle.get_nowait()
+        except queue.Empty:
+            pooled = None
+            with self._lock:
+                create = self._created < self.size
+                if create:
+                    self._created += 1
+            if create:
+                try:
+                    pooled = self._spawn()
+                except Exception:
+                    with self._lock:
+                        self._created -= 1
+                    raise
+            else:
+                try:
+                    pooled = self._idle.get(timeout=timeout)
+                except queue.Empty:
+                    raise TimeoutError(f"No pooled Chrome session became free within {timeout}s")
+
+        if not self._is_healthy(pooled):
+            logger.warning("Pooled session failed health check, replacing it")
+            self.recycle(pooled)
+        return pooled
+
+    def _retire(self, pooled):
+        """Tear down a session for good and free its slot for a new one."""
+        if pooled.retired:
+            return
+        pooled.retired = True
+        self._destroy(pooled)
+        with self._lock:
+            self._created -= 1
+
+    def release(self, pooled):
+        """Return a leased session, retiring it if it died or reached its page or memory limit."""
+        if pooled.retired:
+            return
+        pooled.pages += 1
+        if self._closed:
+            self._destroy(pooled)
+            return
+        if not self._is_healthy(pooled):
+            logger.warning("Leased session is no longer alive, retiring it")
+            self._retire(pooled)
+            return
+        with self._lock:
+            # A lease revived by recycle() may have pushed the pool past its size
+            over_size = self._created > self.size
+        if over_size or self._needs_recycle(pooled):
+            self._retire(pooled)
+            return
+        self._idle.put(pooled)
+
+    def recycle(self, pooled):
+        """
+        Replace the session behind a lease in place with a fresh one. If no new
+        session can be started the lease is retired and its slot freed; a later
+        successful recycle of the same lease claims a slot again.
+        """
+        if not pooled.retired:
+            self._destroy(pooled)
+        try:
+            pooled.driver, pooled.user_data_dir = self.factory()
+        except Exception:
+            # The old session is already gone; give its slot back so a later lease can retry
+            pooled.user_data_dir = None
+            if not pooled.retired:
+                pooled.retired = True
+                with self._lock:
+                    self._created -= 1
+            raise
+        if pooled.retired:
+            # An earlier recycle of this lease failed and gave its slot back; take it again
+            pooled.retired = False
+            with self._lock:
+                self._created += 1
+        pooled.pages = 0
+        return pooled
+
+    @contextmanager
+    def lease(self, timeout=None):
+        """Context manager that acquires a session and always releases it."""
+        pooled = self.acquire(timeout=timeout)
+        try:
+            yield pooled
+        finally:
+            self.release(pooled)
+
+    def close(self, before_quit=None):
+        """Shut down all idle sessions; sessions still leased are closed on release."""
+        self._closed = True
+        while True:
+            try:
+                pooled = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            if before_quit is not None:
+                try:
+                    before_quit(pooled.driver)
+                except Exception as e:
+                    logger.error(f"Error before closing pooled driver: {str(e)}")
+            self._destroy(pooled)
+        with self._lock:
+            self._created = 0
@@ -0,0 +1,135 @@
+import time
+import asyncio
+import threading
+import logging
+from collections import deque
+
+logger = logging.getLogger('scraper.events')
+
+
+class ThroughputTracker:
+    """Per-run listing counters with a rolling listings-per-second figure."""
+
+    def __init__(self, window=60):
+        self.window = window
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.started = time.time()
+            self.listings_found = 0
+            self.listings_processed = 0
+            self.listings_failed = 0
+            self.errors = 0
+            self._recent = deque()
+
+    def record(self, event):
+        with self._lock:
+            event_type = event['type']
+            if event_type == 'listings_found':
+                self.listings_found += event.get('count', 0)
+            elif event_type == 'listing_processed':
+                self.listings_processed += 1
+                if not event.get('ok', True):
+                    self.listings_failed += 1
+                self._recent.append(event['time'])
+            elif event_type == 'error':
+                self.errors += 1
+
+    def snapshot(self):
+        with self._lock:
+            now = time.time()
+            while self._recent and now - self._recent[0] > self.window:
+                self._recent.popleft()
+            elapsed = max(now - self.started, 1e-9)
+            window = min(self.window, elapsed)
+            return {
+                "elapsed_seconds": round(elapsed, 1),
+                "listings_found": self.listings_found,
+                "listings_processed": self.listings_processed,
+                "listings_failed": self.listings_failed,
+                "errors": self.errors,
+                "listings_per_second": round(len(self._recent) / window, 3),
+                "average_listings_per_second": round(self.listings_processed / elapsed, 3)
+            }
+
+
+class EventBus:
+    """
+    In-process publish/subscribe channel for scrape progress events.
+
+    The scraper publishes from its worker threads. Synchronous listeners run
+    inline in the publishing thread. Asyncio subscribers (the SSE endpoint)
+    receive events through their own queue on their own event loop.
+    """
+
+    def __init__(self, history=500):
+        self._lock = threading.Lock()
+        self._listeners = []
+        self._subscribers = []
+        self._recent = deque(maxlen=history)
+        self._next_id = 1
+        self.stats = ThroughputTracker()
+
+    def publish(self, event_type, **data):
+        """Publish an event; safe to call from any thread."""
+        with self._lock:
+            event = {"id": self._next_id, "type": event_type, "time": time.time()}
+            event.update(data)
+            self._next_id += 1
+            self._recent.append(event)
+            listeners = list(self._listeners)
+            subscribers = list(self._subscribers)
+
+        if event_type == 'run_started':
+            self.stats.reset()
+        self.stats.record(event)
+
+        for listener in listeners:
+            try:
+                listener(event)
+            except Exception as e:
+                logger.error(f"Event listener failed on {event_type}: {str(e)}")
+
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(self._offer, queue, event)
+            except RuntimeError:
+                # The subscriber's loop has been closed
+                self.unsubscribe(queue)
+        return event
+
+    @staticmethod
+    def _offer(queue, event):
+        if queue.full():
+            # Slow consumer: drop its oldest event rather than block the scraper
+            try:
+                queue.get_nowait()
+            except Exception:
+                pass
+        queue.put_nowait(event)
+
+    def add_listener(self, listener):
+        with self._lock:
+            self._listeners.append(listener)
+
+    def subscribe(self, loop, maxsize=1000):
+        """Register an asyncio.Queue that receives every future event on `loop`."""
+        queue = asyncio.Queue(maxsize=maxsize)
+        with self._lock:
+            self._subscribers.append((loop, queue))
+        return queue
+
+    def unsubscribe(self, queue):
+        with self._lock:
+            self._subscribers = [(loop, q) for loop, q in self._subscribers if q is not queue]
+
+    def recent(self, after_id=0):
+        """Return buffered events newer than `after_id`, for reconnecting clients."""
+        with self._lock:
+            return [event for event in self._recent if event["id"] > after_id]
+
+
+# Process-wide bus shared by the scraper and the API
+bus = EventBus()
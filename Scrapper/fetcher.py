@@ -0,0 +1,302 @@
+import os
+import re
+import copy
+import logging
+from datetime import datetime
+from urllib.parse import urljoin, urlsplit, urlunsplit, parse_qsl, urlencode
+
+import requests
+from requests.adapters import HTTPAdapter
+from bs4 import BeautifulSoup
+
+from utils import get_random_user_agent
+from rate_limiter import rate_limiter as shared_rate_limiter
+from circuit_breaker import circuit_breaker as shared_circuit_breaker
+
+logger = logging.getLogger('scraper.HttpFetcher')
+
+# Page text that means Craigslist is blocking or challenging us
+BLOCK_INDICATORS = [
+    "IP has been automatically blocked",
+    "please solve the CAPTCHA below",
+    "your connection has been limited",
+    "detected unusual activity"
+]
+
+# HTTP statuses Craigslist uses when throttling
+BLOCK_STATUS_CODES = {403, 429}
+
+
+def is_blocked_html(html):
+    """Return True if the page text contains one of the blocking indicators."""
+    if not html:
+        return False
+    text = html.lower()
+    return any(indicator.lower() in text for indicator in BLOCK_INDICATORS)
+
+
+class FetchResult:
+    """Outcome of a single HTTP page fetch."""
+
+    def __init__(self, url, status=None, html=None, blocked=False, error=None):
+        self.url = url
+        self.status = status
+        self.html = html
+        self.blocked = blocked
+        self.error = error
+
+    @property
+    def ok(self):
+        return self.html is not None and not self.blocked and self.error is None
+
+
+class HttpFetcher:
+    """Pooled HTTP client for pages whose data is present in the raw HTML."""
+
+    def __init__(self, pool_size=None, timeout=None, rate_limiter=None, circuit_breaker=None):
+        if pool_size is None:
+            pool_size = int(os.getenv('HTTP_POOL_SIZE', 10))
+        if timeout is None:
+            timeout = float(os.getenv('HTTP_TIMEOUT', 15))
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter or shared_rate_limiter
+        self.circuit_breaker = circuit_breaker or shared_circuit_breaker
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({
+            "User-Agent": get_random_user_agent(),
+            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+            "Accept-Language": "en-US,en;q=0.9"
+        })
+
+    def get(self, url):
+        """Fetch a page and report whether it is usable, blocked or failed."""
+        if not self.circuit_breaker.allow(url):
+            return FetchResult(url, error="Host unavailable (circuit open)")
+        self.rate_limiter.acquire(url)
+        try:
+            response = self.session.get(url, timeout=self.timeout)
+        except requests.RequestException as e:
+            logger.warning(f"HTTP fetch failed for {url}: {str(e)}")
+            self.circuit_breaker.record_failure(url, reason=type(e).__name__)
+            return FetchResult(url, error=str(e))
+
+        html = response.text
+        if response.status_code in BLOCK_STATUS_CODES or is_blocked_html(html):
+            logger.warning(f"HTTP fetch blocked for {url} (status {response.status_code})")
+            self.rate_limiter.record_block(url, reason=f"HTTP {response.status_code}")
+            return FetchResult(url, status=response.status_code, html=html, blocked=True)
+        if response.status_code >= 500:
+            self.circuit_breaker.record_failure(url, reason=f"HTTP {response.status_code}")
+        if response.status_code >= 400:
+            return FetchResult(url, status=response.status_code, error=f"HTTP {response.status_code}")
+        self.rate_limiter.record_success(url)
+        self.circuit_breaker.record_success(url)
+        return FetchResult(url, status=response.status_code, html=html)
+
+    def load_cookies(self, cookies):
+        """Add WebDriver-format cookies (as saved from the browser) to the session."""
+        for cookie in cookies:
+            try:
+                self.session.cookies.set(
+                    cookie['name'], cookie.get('value', ''),
+                    domain=cookie.get('domain'), path=cookie.get('path', '/'),
+                    secure=bool(cookie.get('secure', False)), expires=cookie.get('expiry')
+                )
+            except (KeyError, TypeError) as e:
+                logger.warning(f"Skipping unusable cookie: {str(e)}")
+
+    def close(self):
+        self.session.close()
+
+
+def _text(element):
+    return element.get_text(" ", strip=True) if element is not None else ""
+
+
+def parse_html(html):
+    """
+    Parse a page once for several of the helpers below, which all take either
+    the page's HTML or this parsed soup.
+    """
+    return BeautifulSoup(html, "lxml")
+
+
+def _soup(page):
+    return page if isinstance(page, BeautifulSoup) else parse_html(page)
+
+
+def parse_search_results(page, base_url):
+    """
+    Extract listing rows (Title, Link, Post Date) from a search results page.
+    Handles the rendered `div.cl-search-result` markup, the static
+    `li.cl-static-search-result` fallback Craigslist serves without JavaScript
+    and the legacy `li.result-row` layout. Rows without a date on the page
+    get an empty post_date.
+    """
+    soup = _soup(page)
+    rows = []
+
+    for listing in soup.select("div.cl-search-result, div.result-info"):
+        anchor = listing.select_one("a.cl-app-anchor.cl-search-anchor.posting-title, a.posting-title")
+        if anchor is None:
+            continue
+        title = _text(anchor) or _text(anchor.select_one("span.label"))
+        date_element = listing.select_one("span[title], time.posted-date, time.result-date")
+        post_date = ""
+        if date_element is not None:
+            post_date = date_element.get("title") or _text(date_element)
+        rows.append({"title": title, "link": urljoin(base_url, anchor.get("href", "")), "post_date": post_date})
+
+    if not rows:
+        for listing in soup.select("li.cl-static-search-result"):
+            anchor = listing.select_one("a")
+            if anchor is None:
+                continue
+            title = listing.get("title") or _text(listing.select_one("div.title"))
+            rows.append({"title": title, "link": urljoin(base_url, anchor.get("href", "")), "post_date": ""})
+
+    if not rows:
+        for listing in soup.select("li.result-row"):
+            anchor = listing.select_one("a.result-title, a.posting-title")
+            if anchor is None:
+                continue
+            date_element = listing.select_one("time.result-date, time.posted-date")
+            post_date = ""
+            if date_element is not None:
+                post_date = date_element.get("title") or date_element.get("datetime") or _text(date_element)
+            rows.append({"title": _text(anchor), "link": urljoin(base_url, anchor.get("href", "")), "post_date": post_date})
+
+    return [row for row in rows if row["title"] and row["link"]]
+
+
+def parse_result_count(page):
+    """
+    Return (page_size, total) from a search page's result counter
+    ("1 - 120 of 345" or the legacy rangeTo/totalcount spans), or None if absent.
+    """
+    soup = _soup(page)
+    counter = soup.select_one("span.cl-page-number, div.cl-page-number, span.cl-results-count")
+    if counter is not None:
+        match = re.search(r'(\d[\d,]*)\s*-\s*(\d[\d,]*)\s+of\s+(\d[\d,]*)', _text(counter))
+        if match:
+            first, last, total = (int(group.replace(',', '')) for group in match.groups())
+            return last - first + 1, total
+    total = soup.select_one("span.totalcount")
+    range_to = soup.select_one("span.rangeTo")
+    range_from = soup.select_one("span.rangeFrom")
+    if total is not None and range_to is not None:
+        try:
+            first = int(_text(range_from)) if range_from is not None else 1
+            return int(_text(range_to)) - first + 1, int(_text(total))
+        except ValueError:
+            return None
+    return None
+
+
+def search_page_url(url, page, page_size):
+    """
+    URL of result page `page` (0-based) of a search: the `s` offset for the
+    server-rendered list and the `#search=<version>~<view>~<page>` fragment
+    the JavaScript search app reads.
+    """
+    parts = urlsplit(url)
+    query = [(key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True) if key != 's']
+    if page:
+        query.append(('s', str(page * page_size)))
+    fragment = re.sub(r'^(search=\d+~\w+~)\d+', lambda match: f"{match.group(1)}{page}", parts.fragment)
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(query), fragment))
+
+
+def parse_post_date(value):
+    """Best-effort date of a result's post date text; None if it cannot be read."""
+    value = str(value or '')
+    match = re.search(r'(\d{4})-(\d{2})-(\d{2})', value)
+    if match:
+        try:
+            return datetime(*(int(group) for group in match.groups())).date()
+        except ValueError:
+            return None
+    # "Fri Oct 16 2026 14:03:12 GMT-0600" as rendered in span[title]
+    match = re.search(r'([A-Z][a-z]{2}) (\d{1,2}) (\d{4})', value)
+    if match:
+        try:
+            return datetime.strptime(" ".join(match.groups()), "%b %d %Y").date()
+        except ValueError:
+            return None
+    return None
+
+
+def parse_posting_body(page):
+    """Return the visible text of a posting's description block, or None if absent."""
+    body = _soup(page).select_one("#postingbody, section#postingbody, div[data-testid='postingbody']")
+    if body is None:
+        return None
+    # The QR code block is hidden by CSS in the browser, so drop it here too,
+    # from a copy so a soup shared with the other helpers stays intact
+    body = copy.copy(body)
+    for hidden in body.select(".print-information, .print-qrcode-container"):
+        hidden.decompose()
+    return body.get_text("\n", strip=True)
+
+
+def has_reply_button(page):
+    """Return True if the posting exposes a reply button for the email flow."""
+    return _soup(page).select_one(
+        "button.reply-button, button[data-href*='/reply/'], a.reply-button, "
+        "a[href*='/reply/'], button[class*='show-email'], a[class*='show-email']"
+    ) is not None
+
+
+def reply_url(page, base_url):
+    """Absolute URL of the posting's reply endpoint (the /reply/ href on its reply button), or None."""
+    button = _soup(page).select_one("button[data-href*='/reply/'], a[href*='/reply/']")
+    if button is None:
+        return None
+    return urljoin(base_url, button.get("data-href") or button.get("href"))
+
+
+def parse_reply_info(page):
+    """
+    Read the email address and webmail compose links from a reply-info page into
+    the result fields (Email, Default Mail, Gmail, Yahoo, Outlook, AOL).
+    None if the page holds no email address.
+    """
+    soup = _soup(page)
+    container = soup.select_one("div.reply-info, div[class*='reply-email']") or soup
+    address = container.select_one(
+        "div.reply-email-address a, p.reply-email-address a, a[href^='mailto:'], "
+        "span[class*='email-address'], div[class*='email-address']"
+    )
+    email = _text(address)
+    if not email:
+        return None
+    
+    email_data = {
+        'Email': email,
+        'Default Mail': "",
+        'Gmail': "",
+        'Yahoo': "",
+        'Outlook': "",
+        'AOL': ""
+    }
+    href = address.get("href") or ""
+    if href.startswith("mailto:"):
+        email_data['Default Mail'] = href
+    
+    webmail = (('Gmail', 'gmail', 'mail.google'), ('Yahoo', 'yahoo', 'yahoo'),
+               ('Outlook', 'outlook', 'outlook'), ('AOL', 'aol', 'aol'))
+    for link in container.select("ul.reply-options a, a[class*='webmail'], a[href*='gmail'], a[href*='mail.google'], "
+                                 "a[href*='yahoo'], a[href*='outlook'], a[href*='aol']"):
+        href = link.get("href")
+        if not href or href.startswith("mailto:"):
+            continue
+        class_attr = " ".join(link.get("class", [])).lower()
+        for key, name, host in webmail:
+            if name in class_attr or host in href:
+                email_data[key] = href
+                break
+    return email_data
@@ -0,0 +1,144 @@
+import re
+from collections import deque
+from functools import lru_cache
+
+
+class KeywordMatcher:
+    """
+    Multi-pattern keyword matcher built on an Aho-Corasick automaton.
+
+    Matching is case-insensitive and finds every keyword in a single pass over
+    the text. By default a keyword matches anywhere as a substring, which is how
+    the scraper has always compared titles and descriptions; with
+    `word_boundary=True` a match must not be surrounded by letters or digits.
+
+    The partial-word mode reproduces the title check that also accepts any
+    single word of a multi-word keyword (longer than `min_part_length - 1`
+    characters) appearing as a whole word in the text.
+    """
+
+    def __init__(self, keywords, word_boundary=False, min_part_length=4):
+        self.keywords = list(keywords)
+        self.word_boundary = word_boundary
+
+        # Automaton: per-state transitions, failure links and matched keyword ids
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]
+        for keyword_id, keyword in enumerate(self.keywords):
+            self._add(keyword.lower(), keyword_id)
+        self._build_failure_links()
+
+        # Whole-word lookup table for partial matches: word -> first keyword id
+        self._parts = {}
+        for keyword_id, keyword in enumerate(self.keywords):
+            for part in keyword.lower().split():
+                if len(part) >= min_part_length and part not in self._parts:
+                    self._parts[part] = keyword_id
+
+    def _add(self, pattern, keyword_id):
+        if not pattern:
+            return
+        state = 0
+        for char in pattern:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = next_state
+        self._output[state].append(keyword_id)
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def _at_word_boundary(self, text, start, end):
+        before = text[start - 1] if start > 0 else " "
+        after = text[end] if end < len(text) else " "
+        return not before.isalnum() and not after.isalnum()
+
+    def iter_matches(self, text):
+        """Yield (keyword_id, start, end) for every keyword occurrence in the text."""
+        if not text:
+            return
+        text = str(text).lower()
+        goto, fail, output = self._goto, self._fail, self._output
+        state = 0
+        for index, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for keyword_id in output[state]:
+                end = index + 1
+                start = end - len(self.keywords[keyword_id])
+                if self.word_boundary and not self._at_word_boundary(text, start, end):
+                    continue
+                yield keyword_id, start, end
+
+    def find_all(self, text):
+        """Return the sorted ids of all keywords found in the text."""
+        return sorted({keyword_id for keyword_id, _, _ in self.iter_matches(text)})
+
+    def first_match(self, text):
+        """Return the earliest keyword in list order found in the text, or None."""
+        ids = self.find_all(text)
+        return self.keywords[ids[0]] if ids else None
+
+    def partial_match(self, text):
+        """Return (word, keyword) for the first keyword word found as a whole word, or None."""
+        if not text:
+            return None
+        best = None
+        for word in str(text).lower().split():
+            keyword_id = self._parts.get(word)
+            if keyword_id is not None and (best is None or keyword_id < best[1]):
+                best = (word, keyword_id)
+        if best is None:
+            return None
+        return best[0], self.keywords[best[1]]
+
+
+def build_alternation(keywords):
+    """
+    Return a regex source matching any of the lowercased keywords.
+
+    Keywords are factored into a prefix trie (e.g. ``stud(?:ies|y)``) so the
+    regex engine tries each shared prefix once instead of once per keyword.
+    """
+    trie = {}
+    for keyword in sorted({keyword.lower() for keyword in keywords if keyword}):
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def render(node):
+        branches = [re.escape(char) + render(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        pattern = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        return '(?:' + pattern + ')?' if '' in node else pattern
+
+    return render(trie)
+
+
+@lru_cache(maxsize=32)
+def _compile(keywords, word_boundary):
+    return KeywordMatcher(keywords, word_boundary=word_boundary)
+
+
+def get_matcher(keywords, word_boundary=False):
+    """Return a compiled matcher, reusing it while the keyword list is unchanged."""
+    return _compile(tuple(keywords), word_boundary)
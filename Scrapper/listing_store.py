@@ -0,0 +1,169 @@
+import os
+import re
+import csv
+import json
+import sqlite3
+import threading
+import logging
+from datetime import datetime
+from urllib.parse import urlsplit, urlunsplit
+
+logger = logging.getLogger('scraper.ListingStore')
+
+# Craigslist posting URLs end in /<posting id>.html
+POSTING_ID_PATTERN = re.compile(r'/(\d{6,})\.html?$')
+
+
+def canonical_link(link):
+    """Normalize a posting URL: lowercase host, https, no query string or fragment."""
+    if not link:
+        return ""
+    parts = urlsplit(str(link).strip())
+    return urlunsplit(("https", parts.netloc.lower(), parts.path.rstrip('/'), "", ""))
+
+
+def posting_id(link):
+    """Return the stable Craigslist posting id of a link, or its canonical form if it has none."""
+    canonical = canonical_link(link)
+    match = POSTING_ID_PATTERN.search(canonical)
+    return match.group(1) if match else canonical
+
+
+class ListingStore:
+    """
+    SQLite store (WAL mode) of every posting the scraper has seen and scraped.
+
+    `listings` holds the link history keyed by posting id, `results` holds the
+    scraped detail rows. Lookups are primary-key lookups, so checking whether a
+    link was seen before costs the same with ten rows or millions.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS listings (
+                posting_id TEXT PRIMARY KEY,
+                link TEXT NOT NULL,
+                city TEXT,
+                title TEXT,
+                post_date TEXT,
+                first_seen TEXT NOT NULL,
+                last_seen TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS results (
+                posting_id TEXT PRIMARY KEY,
+                data TEXT NOT NULL,
+                scraped_at TEXT NOT NULL
+            );
+        """)
+        self._conn.commit()
+
+    def record_links(self, rows):
+        """
+        Add discovered listings (dicts with Link, City, Title, Post Date) to the history.
+        Returns the number of postings that were not seen before.
+        """
+        now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        records = []
+        for row in rows:
+            link = row.get('Link') or row.get('link')
+            if not link:
+                continue
+            records.append((
+                posting_id(link), link, row.get('City') or row.get('city'),
+                row.get('Title') or row.get('title'), row.get('Post Date'), now, now
+            ))
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.executemany("""
+                INSERT OR IGNORE INTO listings (posting_id, link, city, title, post_date, first_seen, last_seen)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, records)
+            added = self._conn.total_changes - before
+            self._conn.executemany(
+                "UPDATE listings SET last_seen = ? WHERE posting_id = ?",
+                [(now, record[0]) for record in records]
+            )
+            self._conn.commit()
+        return added
+
+    def seen_ids(self, links):
+        """Return the posting ids among `links` that are already in the history."""
+        ids = list({posting_id(link) for link in links if link})
+        seen = set()
+        with self._lock:
+            # Stay under SQLite's bound-parameter limit
+            for start in range(0, len(ids), 500):
+                chunk = ids[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                cursor = self._conn.execute(
+                    f"SELECT posting_id FROM listings WHERE posting_id IN ({placeholders})", chunk
+                )
+                seen.update(row[0] for row in cursor)
+        return seen
+
+    def has_seen(self, link):
+        return posting_id(link) in self.seen_ids([link])
+
+    def save_result(self, row):
+        """Store (or replace) the scraped detail row of a posting."""
+        link = row.get('Link')
+        if not link:
+            return
+        data = json.dumps(row, default=str, ensure_ascii=False)
+        now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results (posting_id, data, scraped_at) VALUES (?, ?, ?)",
+                (posting_id(link), data, now)
+            )
+            self._conn.commit()
+
+    def get_results(self, links):
+        """Return {posting_id: result row} for the links that have a stored result."""
+        ids = list({posting_id(link) for link in links if link})
+        results = {}
+        with self._lock:
+            for start in range(0, len(ids), 500):
+                chunk = ids[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                cursor = self._conn.execute(
+                    f"SELECT posting_id, data FROM results WHERE posting_id IN ({placeholders})", chunk
+                )
+                results.update((row[0], json.loads(row[1])) for row in cursor)
+        return results
+
+    def get_result(self, link):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM results WHERE posting_id = ?", (posting_id(link),)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def count(self, table='listings'):
+        if table not in ('listings', 'results'):
+            raise ValueError(f"Unknown table: {table}")
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+    def import_history_csv(self, history_file):
+        """One-time import of a legacy history_links.csv (link,city,title,date_scraped)."""
+        if not os.path.exists(history_file):
+            return 0
+        with open(history_file, 'r', encoding='utf-8', newline='') as f:
+            rows = [
+                {'Link': row.get('link'), 'City': row.get('city'), 'Title': row.get('title')}
+                for row in csv.DictReader(f)
+            ]
+        added = self.record_links(rows)
+        logger.info(f"Imported {added} links from {history_file}")
+        return added
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -5,6 +5,17 @@ from scraper import CraigslistScraper
 from dotenv import load_dotenv
 
 def main():
+    parser = argparse.ArgumentParser(description="Craigslist job listing scraper")
+    parser.add_argument("--resume", action="store_true",
+                        help="Continue the last interrupted run from its checkpoint")
+    parser.add_argument("--offline", action="store_true",
+                        help="Re-run parsing and filters over cached pages only, without network, "
+                             "writing to OFFLINE_OUTPUT_DIR")
+    args = parser.parse_args()
+    
+    if args.offline:
+        os.environ['PAGE_CACHE_OFFLINE'] = 'true'
+    
     try:
         # Load environment variables
         load_dotenv()
@@ -12,8 +23,22 @@ def main():
         print("Initializing Craigslist Scraper...")
         scraper = CraigslistScraper()
         
+        if args.resume:
+            print("Resuming interrupted scraping run...")
+            results_df = scraper.resume()
+            print(f"Total results saved: {len(results_df)}")
+            return
+        
         print("Starting scraping process...")
         
+        if scraper.streaming_pipeline:
+            # Listings flow from the search pages straight into the detail workers
+            print("Scraping listings and details as a streaming pipeline...")
+            results_df = scraper.scrape_pipeline()
+            print("Scraping completed successfully!")
+            print(f"Total results saved: {len(results_df)}")
+            return
+        
         # Phase 1: Scrape job listings from all cities
         print("Phase 1: Scraping job listings from all cities...")
         listings_df = scraper.scrape_listings()
@@ -0,0 +1,299 @@
+import os
+import re
+import time
+import zlib
+import sqlite3
+import hashlib
+import threading
+import logging
+
+import numpy as np
+
+logger = logging.getLogger('scraper.NearDuplicateIndex')
+
+TITLE = 'title'
+DESCRIPTION = 'description'
+
+# Largest Mersenne prime below 2^64, for the universal hash family of the permutations
+MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+MAX_HASH = np.uint64((1 << 32) - 1)
+
+
+def _normalize(text):
+    return re.sub(r'\s+', ' ', re.sub(r'[^a-z0-9]+', ' ', str(text).lower())).strip()
+
+
+def shingles(text, kind):
+    """
+    Shingle set of a text: character 4-grams for short titles, word 3-grams for
+    descriptions. Returns the 32-bit hashes of the shingles.
+    """
+    text = _normalize(text)
+    if kind == TITLE:
+        grams = {text[i:i + 4] for i in range(len(text) - 3)}
+    else:
+        words = text.split()
+        grams = {" ".join(words[i:i + 3]) for i in range(len(words) - 2)}
+    return np.array(sorted(zlib.crc32(gram.encode('utf-8')) for gram in grams), dtype=np.uint64)
+
+
+def _area(xs, ys):
+    return float(np.sum((ys[1:] + ys[:-1]) / 2 * np.diff(xs)))
+
+
+def _false_positive_area(threshold, bands, rows, steps=100):
+    xs = np.linspace(0.0, threshold, steps)
+    return _area(xs, 1 - (1 - xs ** rows) ** bands)
+
+
+def _false_negative_area(threshold, bands, rows, steps=100):
+    xs = np.linspace(threshold, 1.0, steps)
+    return _area(xs, (1 - xs ** rows) ** bands)
+
+
+def lsh_params(threshold, num_perm):
+    """Bands and rows per band that minimize false positives plus false negatives around `threshold`."""
+    best, best_error = (1, num_perm), None
+    for bands in range(1, num_perm + 1):
+        for rows in range(1, num_perm // bands + 1):
+            error = _false_positive_area(threshold, bands, rows) + _false_negative_area(threshold, bands, rows)
+            if best_error is None or error < best_error:
+                best, best_error = (bands, rows), error
+    return best
+
+
+class NearDuplicateIndex:
+    """
+    Persistent MinHash/LSH index of posting titles and descriptions.
+
+    Every text is shingled and reduced to a `num_perm` MinHash signature whose
+    bands are hashed into LSH buckets, all stored in SQLite so the index grows
+    across runs. A lookup reads the postings sharing at least one bucket with
+    one indexed query, then confirms candidates whose estimated Jaccard
+    similarity reaches the threshold of that text kind. Lookups stay well
+    under a millisecond with hundreds of thousands of postings indexed.
+
+    Only postings first seen within the repost window of a text kind
+    (`windows`, in hours, 0 for no limit) count as earlier copies, and older
+    ones are dropped from the index. A common title like "Need a website
+    built" thus only suppresses reposts, not every later posting using it.
+    """
+
+    def __init__(self, path=None, thresholds=None, num_perm=None, min_shingles=None, windows=None):
+        if path is None:
+            path = os.getenv('NEAR_DUP_FILE', 'near_duplicates.db')
+        if thresholds is None:
+            thresholds = {
+                TITLE: float(os.getenv('NEAR_DUP_TITLE_THRESHOLD', 0.8)),
+                DESCRIPTION: float(os.getenv('NEAR_DUP_DESCRIPTION_THRESHOLD', 0.7))
+            }
+        if num_perm is None:
+            num_perm = int(os.getenv('NEAR_DUP_NUM_PERM', 64))
+        if min_shingles is None:
+            min_shingles = int(os.getenv('NEAR_DUP_MIN_SHINGLES', 10))
+        if windows is None:
+            windows = {
+                TITLE: float(os.getenv('NEAR_DUP_TITLE_WINDOW_HOURS', 72)),
+                DESCRIPTION: float(os.getenv('NEAR_DUP_DESCRIPTION_WINDOW_HOURS', 30 * 24))
+            }
+        self.path = path
+        self.thresholds = thresholds
+        self.num_perm = num_perm
+        # Very short texts (generic titles like "web developer") are not compared
+        self.min_shingles = min_shingles
+        self.windows = windows
+        self.params = {kind: lsh_params(threshold, num_perm) for kind, threshold in thresholds.items()}
+
+        # Fixed seed: signatures must stay comparable across runs
+        rng = np.random.RandomState(1)
+        self._a = rng.randint(1, int(MERSENNE_PRIME), size=num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, int(MERSENNE_PRIME), size=num_perm, dtype=np.uint64)
+
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._lock = threading.Lock()
+        # Texts held for the current run but not indexed yet, by kind: {posting_id: signature}
+        self._held = {kind: {} for kind in thresholds}
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS signatures (
+                kind TEXT NOT NULL,
+                posting_id TEXT NOT NULL,
+                signature BLOB NOT NULL,
+                indexed_at REAL NOT NULL DEFAULT 0,
+                PRIMARY KEY (kind, posting_id)
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS buckets (
+                kind TEXT NOT NULL,
+                bucket INTEGER NOT NULL,
+                posting_id TEXT NOT NULL,
+                PRIMARY KEY (kind, bucket, posting_id)
+            ) WITHOUT ROWID;
+        """)
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(signatures)")]
+        if 'indexed_at' not in columns:
+            # Indexes from before the repost window: their postings count as expired
+            self._conn.execute("ALTER TABLE signatures ADD COLUMN indexed_at REAL NOT NULL DEFAULT 0")
+        self._purge()
+        self._conn.commit()
+
+    def _cutoff(self, kind):
+        """Oldest first-seen time still inside the repost window of `kind`, or None for no limit."""
+        hours = self.windows.get(kind)
+        return time.time() - hours * 3600 if hours else None
+
+    def _purge(self):
+        # Postings past their repost window can never match again
+        for kind in self.thresholds:
+            cutoff = self._cutoff(kind)
+            if cutoff is None:
+                continue
+            expired = self._conn.execute(
+                "SELECT posting_id, signature FROM signatures WHERE kind = ? AND indexed_at < ?", (kind, cutoff)
+            ).fetchall()
+            for posting_id, blob in expired:
+                self._remove(kind, posting_id, np.frombuffer(blob, dtype=np.uint32))
+            if expired:
+                logger.info(f"Dropped {len(expired)} {kind} signatures older than the repost window")
+
+    def _remove(self, kind, posting_id, signature):
+        self._conn.executemany(
+            "DELETE FROM buckets WHERE kind = ? AND bucket = ? AND posting_id = ?",
+            [(kind, bucket, posting_id) for bucket in self._buckets(signature, kind)]
+        )
+        self._conn.execute("DELETE FROM signatures WHERE kind = ? AND posting_id = ?", (kind, posting_id))
+
+    def signature(self, text, kind):
+        """MinHash signature of a text, or None if it is too short to compare."""
+        hashes = shingles(text, kind)
+        if len(hashes) < self.min_shingles:
+            return None
+        # (a * x + b) mod p over all permutations at once; uint64 wrap-around is part of the hash
+        with np.errstate(over='ignore'):
+            values = (np.outer(self._a, hashes) + self._b[:, None]) % MERSENNE_PRIME
+        return (values & MAX_HASH).min(axis=1).astype(np.uint32)
+
+    def _buckets(self, signature, kind):
+        bands, rows = self.params[kind]
+        keys = []
+        for band in range(bands):
+            digest = hashlib.blake2b(signature[band * rows:(band + 1) * rows].tobytes(),
+                                     digest_size=8, salt=band.to_bytes(2, 'little')).digest()
+            keys.append(int.from_bytes(digest, 'little', signed=True))
+        return keys
+
+    def _query(self, kind, signature, buckets, exclude):
+        placeholders = ",".join("?" * len(buckets))
+        candidates = [row[0] for row in self._conn.execute(
+            f"SELECT DISTINCT posting_id FROM buckets WHERE kind = ? AND bucket IN ({placeholders})",
+            [kind] + buckets
+        ) if row[0] != exclude]
+        if not candidates:
+            return None
+
+        best = None
+        placeholders = ",".join("?" * len(candidates))
+        cutoff = self._cutoff(kind)
+        for candidate, blob in self._conn.execute(
+            f"SELECT posting_id, signature FROM signatures WHERE kind = ? AND posting_id IN ({placeholders}) "
+            f"AND indexed_at >= ?",
+            [kind] + candidates + [cutoff or 0]
+        ):
+            similarity = float(np.mean(np.frombuffer(blob, dtype=np.uint32) == signature))
+            if similarity >= self.thresholds[kind] and (best is None or similarity > best[1]):
+                best = (candidate, similarity)
+        return best
+
+    def _add(self, kind, posting_id, signature, buckets):
+        # Re-indexing an edited posting: drop the buckets of its previous signature
+        old = self._conn.execute(
+            "SELECT signature FROM signatures WHERE kind = ? AND posting_id = ?", (kind, posting_id)
+        ).fetchone()
+        if old is not None:
+            self._remove(kind, posting_id, np.frombuffer(old[0], dtype=np.uint32))
+        self._conn.execute(
+            "INSERT INTO signatures (kind, posting_id, signature, indexed_at) VALUES (?, ?, ?, ?)",
+            (kind, posting_id, signature.tobytes(), time.time())
+        )
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO buckets (kind, bucket, posting_id) VALUES (?, ?, ?)",
+            [(kind, bucket, posting_id) for bucket in buckets]
+        )
+
+    def query(self, kind, text, exclude=None):
+        """Return (posting_id, similarity) of the closest indexed near-duplicate of `text`, or None."""
+        signature = self.signature(text, kind)
+        if signature is None:
+            return None
+        with self._lock:
+            return self._query(kind, signature, self._buckets(signature, kind), exclude)
+
+    def check_and_add(self, kind, posting_id, text):
+        """
+        Look up a posting's text and index it in one step. Returns the
+        (posting_id, similarity) of an earlier, different posting it nearly
+        duplicates, or None. A posting never matches itself.
+        """
+        signature = self.signature(text, kind)
+        if signature is None:
+            return None
+        buckets = self._buckets(signature, kind)
+        with self._lock:
+            match = self._query(kind, signature, buckets, exclude=posting_id)
+            if match is None:
+                self._add(kind, posting_id, signature, buckets)
+                self._conn.commit()
+        return match
+
+    def _match_held(self, kind, signature, exclude):
+        held = {key: value for key, value in self._held[kind].items() if key != exclude}
+        if not held:
+            return None
+        keys = list(held)
+        similarities = np.mean(np.stack([held[key] for key in keys]) == signature, axis=1)
+        best = int(np.argmax(similarities))
+        if similarities[best] >= self.thresholds[kind]:
+            return keys[best], float(similarities[best])
+        return None
+
+    def check_and_hold(self, kind, posting_id, text):
+        """
+        Like check_and_add, but a posting that is not a duplicate is only held
+        in memory: later texts of this run are compared against it, while the
+        persistent index only gets it through add() once the posting is kept.
+        """
+        signature = self.signature(text, kind)
+        if signature is None:
+            return None
+        buckets = self._buckets(signature, kind)
+        with self._lock:
+            match = (self._query(kind, signature, buckets, exclude=posting_id)
+                     or self._match_held(kind, signature, posting_id))
+            if match is None:
+                self._held[kind][posting_id] = signature
+        return match
+
+    def add(self, kind, posting_id, text):
+        """Index a posting's text (replacing its earlier entry) without looking it up."""
+        signature = self.signature(text, kind)
+        with self._lock:
+            self._held[kind].pop(posting_id, None)
+            if signature is None:
+                return
+            self._add(kind, posting_id, signature, self._buckets(signature, kind))
+            self._conn.commit()
+
+    def clear_held(self):
+        """Forget the texts held by check_and_hold, e.g. when a new run starts."""
+        with self._lock:
+            for held in self._held.values():
+                held.clear()
+
+    def count(self, kind):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM signatures WHERE kind = ?", (kind,)).fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
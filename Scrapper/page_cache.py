@@ -0,0 +1,166 @@
+import os
+import time
+import zlib
+import sqlite3
+import hashlib
+import threading
+import logging
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+from listing_store import POSTING_ID_PATTERN
+
+logger = logging.getLogger('scraper.PageCache')
+
+SEARCH = 'search'
+POSTING = 'posting'
+REPLY = 'reply'
+OTHER = 'other'
+
+
+def canonical_url(url):
+    """Normalize a page URL for caching: https, lowercase host, sorted query, no fragment."""
+    parts = urlsplit(str(url).strip())
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    path = parts.path.rstrip('/') or '/'
+    return urlunsplit(("https", parts.netloc.lower(), path, query, ""))
+
+
+def page_type(url):
+    """Classify a Craigslist URL as a search, posting, reply or other page."""
+    path = urlsplit(str(url)).path
+    if '/reply/' in path:
+        return REPLY
+    if '/search/' in path:
+        return SEARCH
+    if POSTING_ID_PATTERN.search(path.rstrip('/')):
+        return POSTING
+    return OTHER
+
+
+class PageCache:
+    """
+    On-disk cache of fetched HTML pages, keyed by the hash of the canonical URL.
+
+    Pages are stored zlib-compressed in SQLite with their fetch time. Each page
+    type has its own TTL (search results go stale quickly, postings rarely
+    change), and once the stored size passes `max_bytes` the least recently
+    used pages are evicted. With `offline=True` every cached copy is served
+    regardless of age, so parsing and filters can be re-run without network.
+    """
+
+    def __init__(self, path=None, ttls=None, max_bytes=None, offline=None):
+        if path is None:
+            path = os.getenv('PAGE_CACHE_FILE', 'cache/pages.db')
+        if ttls is None:
+            ttls = {
+                SEARCH: float(os.getenv('PAGE_CACHE_TTL_SEARCH', 1800)),
+                POSTING: float(os.getenv('PAGE_CACHE_TTL_POSTING', 7 * 24 * 3600)),
+                REPLY: float(os.getenv('PAGE_CACHE_TTL_REPLY', 7 * 24 * 3600)),
+                OTHER: float(os.getenv('PAGE_CACHE_TTL_OTHER', 3600))
+            }
+        if max_bytes is None:
+            max_bytes = int(float(os.getenv('PAGE_CACHE_MAX_MB', 500)) * 1024 * 1024)
+        if offline is None:
+            offline = os.getenv('PAGE_CACHE_OFFLINE', 'false').lower() == 'true'
+        self.path = path
+        self.ttls = ttls
+        self.max_bytes = max_bytes
+        self.offline = offline
+        self.stats = {"hits": 0, "misses": 0, "stale": 0, "stored": 0, "evicted": 0}
+
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS pages (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                page_type TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                size INTEGER NOT NULL,
+                body BLOB NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS pages_accessed ON pages (accessed_at);
+        """)
+        self._conn.commit()
+        self._size = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+
+    @staticmethod
+    def key(url):
+        return hashlib.sha1(canonical_url(url).encode('utf-8')).hexdigest()
+
+    def get(self, url):
+        """Return the cached HTML of `url` if present and within its TTL, else None."""
+        key = self.key(url)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT page_type, fetched_at, body FROM pages WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.stats["misses"] += 1
+                return None
+            kind, fetched_at, body = row
+            if not self.offline and now - fetched_at > self.ttls.get(kind, self.ttls[OTHER]):
+                self.stats["stale"] += 1
+                return None
+            self._conn.execute("UPDATE pages SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.stats["hits"] += 1
+        return zlib.decompress(body).decode('utf-8')
+
+    def put(self, url, html):
+        """Store the HTML of a successfully fetched page."""
+        if not html:
+            return
+        body = zlib.compress(html.encode('utf-8'), 6)
+        now = time.time()
+        key = self.key(url)
+        with self._lock:
+            old = self._conn.execute("SELECT size FROM pages WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages (key, url, page_type, fetched_at, accessed_at, size, body) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, canonical_url(url), page_type(url), now, now, len(body), body)
+            )
+            self._size += len(body) - (old[0] if old else 0)
+            self.stats["stored"] += 1
+            if self._size > self.max_bytes:
+                self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        # Drop least recently used pages until 90% of the budget is free, keeping headroom
+        target = int(self.max_bytes * 0.9)
+        cursor = self._conn.execute("SELECT key, size FROM pages ORDER BY accessed_at")
+        evict = []
+        for key, size in cursor:
+            if self._size <= target:
+                break
+            evict.append((key,))
+            self._size -= size
+        self._conn.executemany("DELETE FROM pages WHERE key = ?", evict)
+        self.stats["evicted"] += len(evict)
+        logger.info(f"Evicted {len(evict)} pages from the page cache")
+
+    def urls(self, kind=None):
+        """Canonical URLs of all cached pages, optionally of one page type."""
+        with self._lock:
+            if kind is None:
+                cursor = self._conn.execute("SELECT url FROM pages ORDER BY fetched_at")
+            else:
+                cursor = self._conn.execute(
+                    "SELECT url FROM pages WHERE page_type = ? ORDER BY fetched_at", (kind,)
+                )
+            return [row[0] for row in cursor]
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self.stats, size_mb=round(self._size / (1024 * 1024), 2), offline=self.offline)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,227 @@
+import os
+import time
+import random
+import threading
+import logging
+from collections import deque
+from urllib.parse import urlparse
+
+from events import bus
+
+logger = logging.getLogger('scraper.RateLimiter')
+
+
+class TokenBucket:
+    """
+    Token bucket that hands out future reservations instead of blocking.
+
+    `reserve` always takes a token and returns how long the caller must wait
+    for it, letting the balance go negative. Waiting then happens outside any
+    lock, so concurrent callers queue up in reservation order without holding
+    each other up.
+    """
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+
+    def drain(self, now):
+        """Drop any saved-up burst so the next request waits a full interval."""
+        self._refill(now)
+        self.tokens = min(self.tokens, 0.0)
+
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, now):
+        self._refill(now)
+        self.tokens -= 1
+        return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def configure(self, rate, burst, now):
+        self._refill(now)
+        self.rate = rate
+        self.burst = burst
+        self.tokens = min(self.tokens, float(burst))
+
+
+class RateLimiter:
+    """
+    Per-host request budget shared by every fetch path and worker thread.
+
+    Each host gets its own token bucket (`per_host` requests per second, up to
+    `burst` back-to-back), and all hosts together draw from a global bucket
+    (`global_rate` requests per second, 0 disables it). A random jitter of up to
+    `jitter` times the per-host interval is added to each wait so workers do not
+    hit a host in lockstep.
+
+    With `adaptive` on, each host's rate follows AIMD feedback from the fetch
+    layer: every `increase_after` clean responses raise it by `increase`
+    (up to `max_per_host`), and a block or CAPTCHA multiplies it by `decrease`
+    (down to `min_per_host`), at most once per `decrease_cooldown` seconds.
+    """
+
+    def __init__(self, per_host=None, burst=None, global_rate=None, jitter=None, adaptive=None):
+        self._lock = threading.Lock()
+        self._hosts = {}
+        self._global = None
+        self._stats = {}
+        self._decisions = deque(maxlen=100)
+        self.per_host = self.burst = self.global_rate = self.jitter = None
+        
+        self.adaptive = (os.getenv('RATE_ADAPTIVE', 'true').lower() == 'true') if adaptive is None else adaptive
+        self.min_per_host = float(os.getenv('RATE_LIMIT_MIN_PER_HOST', 0.05))
+        self.max_per_host = float(os.getenv('RATE_LIMIT_MAX_PER_HOST', 2.0))
+        self.increase = float(os.getenv('RATE_ADAPT_INCREASE', 0.05))
+        self.increase_after = max(1, int(os.getenv('RATE_ADAPT_INCREASE_AFTER', 10)))
+        self.decrease = float(os.getenv('RATE_ADAPT_DECREASE', 0.5))
+        self.decrease_cooldown = float(os.getenv('RATE_ADAPT_DECREASE_COOLDOWN', 10))
+        
+        self.configure(
+            per_host=float(os.getenv('RATE_LIMIT_PER_HOST', 0.3)) if per_host is None else per_host,
+            burst=int(os.getenv('RATE_LIMIT_BURST', 2)) if burst is None else burst,
+            global_rate=float(os.getenv('RATE_LIMIT_GLOBAL', 1.0)) if global_rate is None else global_rate,
+            jitter=float(os.getenv('RATE_LIMIT_JITTER', 0.3)) if jitter is None else jitter
+        )
+
+    def configure(self, per_host=None, burst=None, global_rate=None, jitter=None):
+        """
+        Change the budget at runtime; existing buckets keep their current balance.
+        Only a changed per-host rate or burst restarts the adaptively learned rates.
+        """
+        with self._lock:
+            host_changed = global_changed = False
+            if per_host is not None and max(0.01, float(per_host)) != self.per_host:
+                self.per_host = max(0.01, float(per_host))
+                host_changed = True
+            if burst is not None and max(1, int(burst)) != self.burst:
+                self.burst = max(1, int(burst))
+                host_changed = global_changed = True
+            if global_rate is not None and max(0.0, float(global_rate)) != self.global_rate:
+                self.global_rate = max(0.0, float(global_rate))
+                global_changed = True
+            if jitter is not None:
+                self.jitter = max(0.0, float(jitter))
+
+            # A new base rate also restarts adaptation from it
+            now = time.monotonic()
+            if host_changed:
+                for bucket in self._hosts.values():
+                    bucket.configure(self.per_host, self.burst, now)
+            if not self.global_rate:
+                self._global = None
+            elif self._global is None:
+                self._global = TokenBucket(self.global_rate, self.burst)
+            elif global_changed:
+                self._global.configure(self.global_rate, self.burst, now)
+        logger.info(f"Rate limit: {self.per_host}/s per host (burst {self.burst}), "
+                    f"{self.global_rate or 'unlimited'}/s overall, jitter {self.jitter}")
+
+    def settings(self):
+        return {
+            "rate_limit_per_host": self.per_host,
+            "rate_limit_burst": self.burst,
+            "rate_limit_global": self.global_rate,
+            "rate_limit_jitter": self.jitter,
+            "rate_adaptive": self.adaptive
+        }
+
+    @staticmethod
+    def host_of(url):
+        return urlparse(url).netloc.lower()
+
+    def acquire(self, url):
+        """Block until a request to the host of `url` fits the budget; returns the seconds waited."""
+        host = self.host_of(url)
+        with self._lock:
+            now = time.monotonic()
+            bucket = self._hosts.get(host)
+            if bucket is None:
+                bucket = self._hosts[host] = TokenBucket(self.per_host, self.burst)
+            delay = bucket.reserve(now)
+            if self._global is not None:
+                delay = max(delay, self._global.reserve(now))
+            if delay > 0 and self.jitter:
+                # Scaled to the host's current (adapted) interval, not the base rate
+                delay += random.uniform(0, self.jitter / bucket.rate)
+
+            stats = self._host_stats(host)
+            stats["requests"] += 1
+            stats["waited_seconds"] += delay
+
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    def _host_stats(self, host):
+        return self._stats.setdefault(host, {
+            "requests": 0, "waited_seconds": 0.0, "clean": 0, "blocked": 0,
+            "increases": 0, "decreases": 0, "_streak": 0, "_last_decrease": None
+        })
+
+    def record_success(self, url):
+        """Feedback: a response from the host of `url` came back clean."""
+        host = self.host_of(url)
+        with self._lock:
+            stats = self._host_stats(host)
+            stats["clean"] += 1
+            stats["_streak"] += 1
+            bucket = self._hosts.get(host)
+            if not self.adaptive or bucket is None or stats["_streak"] < self.increase_after:
+                return
+            stats["_streak"] = 0
+            new_rate = min(self.max_per_host, bucket.rate + self.increase)
+            if new_rate <= bucket.rate:
+                return
+            decision = self._set_rate(host, bucket, new_rate, "increase")
+            stats["increases"] += 1
+        bus.publish('throttle', **decision)
+
+    def record_block(self, url, reason="blocked"):
+        """Feedback: the host of `url` answered with a block, rate limit or CAPTCHA page."""
+        host = self.host_of(url)
+        with self._lock:
+            stats = self._host_stats(host)
+            stats["blocked"] += 1
+            stats["_streak"] = 0
+            bucket = self._hosts.get(host)
+            if bucket is None:
+                bucket = self._hosts[host] = TokenBucket(self.per_host, self.burst)
+            now = time.monotonic()
+            bucket.drain(now)
+            # One cut per cooldown: requests already in flight report the same block
+            last_decrease = stats["_last_decrease"]
+            if not self.adaptive or (last_decrease is not None and now - last_decrease < self.decrease_cooldown):
+                return
+            stats["_last_decrease"] = now
+            new_rate = max(self.min_per_host, bucket.rate * self.decrease)
+            decision = self._set_rate(host, bucket, new_rate, "decrease", reason)
+            stats["decreases"] += 1
+        logger.warning(f"Throttling {host} to {decision['rate']}/s after {reason}")
+        bus.publish('throttle', **decision)
+
+    def _set_rate(self, host, bucket, rate, action, reason=None):
+        old_rate = bucket.rate
+        bucket.configure(rate, self.burst, time.monotonic())
+        decision = {"host": host, "action": action, "old_rate": round(old_rate, 3),
+                    "rate": round(rate, 3), "reason": reason, "at": time.time()}
+        self._decisions.append(decision)
+        return decision
+
+    def snapshot(self):
+        """Per-host request counts, waits, feedback and current rates, plus recent rate decisions."""
+        with self._lock:
+            hosts = {}
+            for host, stats in self._stats.items():
+                bucket = self._hosts.get(host)
+                hosts[host] = {key: value for key, value in stats.items() if not key.startswith('_')}
+                hosts[host]["waited_seconds"] = round(stats["waited_seconds"], 2)
+                hosts[host]["rate"] = round(bucket.rate if bucket else self.per_host, 3)
+            return {"hosts": hosts, "decisions": list(self._decisions)}
+
+
+# Process-wide limiter, so every scraper instance and the config API share one budget
+rate_limiter = RateLimiter()
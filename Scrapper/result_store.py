@@ -0,0 +1,106 @@
+import os
+import json
+import threading
+import logging
+
+import pandas as pd
+
+logger = logging.getLogger('scraper.ResultStore')
+
+
+class ResultStore:
+    """
+    Append-only journal of scraped listings.
+
+    Each finished listing is appended as one JSON line tagged with its position
+    in the input, so a batch costs only the new rows. `sync` flushes and fsyncs
+    at batch boundaries and `compact` turns the journal into the results CSV
+    in input order.
+    """
+
+    POSITION_FIELD = '_position'
+
+    def __init__(self, path):
+        self.path = path
+        self._file = None
+        self._lock = threading.Lock()
+
+    def reset(self):
+        """Start a new journal, discarding rows from a previous run."""
+        with self._lock:
+            self._close_file()
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            self._file = open(self.path, 'w', encoding='utf-8')
+
+    def _ensure_open(self):
+        if self._file is None:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            self._file = open(self.path, 'a', encoding='utf-8')
+
+    def append(self, position, row):
+        """Append one result row to the journal."""
+        record = dict(row)
+        record[self.POSITION_FIELD] = position
+        line = json.dumps(record, default=str, ensure_ascii=False)
+        with self._lock:
+            self._ensure_open()
+            self._file.write(line + '\n')
+
+    def sync(self):
+        """Flush buffered rows and fsync so a crash cannot lose a finished batch."""
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def read(self):
+        """Return the journaled rows ordered by input position (last write wins)."""
+        if not os.path.exists(self.path):
+            return []
+        records = {}
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # A torn final line from a crash mid-write
+                    logger.warning(f"Skipping unreadable journal line in {self.path}")
+                    continue
+                records[record.pop(self.POSITION_FIELD, len(records))] = record
+        return [records[position] for position in sorted(records)]
+
+    def compact(self, output_file, remove_journal=True):
+        """Write the journal out as the results CSV and return it as a DataFrame."""
+        self.sync()
+        df = pd.DataFrame(self.read())
+
+        os.makedirs(os.path.dirname(output_file) or '.', exist_ok=True)
+        tmp_file = f"{output_file}.tmp"
+        df.to_csv(tmp_file, index=False)
+        os.replace(tmp_file, output_file)
+        print(f"Successfully saved {len(df)} rows to {output_file}")
+
+        if remove_journal:
+            with self._lock:
+                self._close_file()
+                try:
+                    os.remove(self.path)
+                except OSError:
+                    pass
+        return df
+
+    def _close_file(self):
+        if self._file is not None:
+            try:
+                self._file.close()
+            except Exception:
+                pass
+            self._file = None
+
+    def close(self):
+        with self._lock:
+            self._close_file()
@@ -0,0 +1,219 @@
+import os
+import json
+import threading
+import logging
+from datetime import datetime
+
+from listing_store import posting_id
+
+logger = logging.getLogger('scraper.RunManifest')
+
+PENDING = 'pending'
+DONE = 'done'
+FAILED = 'failed'
+# Scraped, but a near-duplicate of an earlier posting, so kept out of the results
+DUPLICATE = 'duplicate'
+
+
+def _json_default(value):
+    # numpy/pandas scalars from DataFrame rows
+    if hasattr(value, 'item'):
+        return value.item()
+    return str(value)
+
+
+class RunManifest:
+    """
+    Checkpoint of a detail scraping run, keyed by posting link.
+
+    Every listing of the run is recorded with its state (pending, done,
+    failed or duplicate), attempt count and the links.csv row it came from. The run's rows
+    are written once as a JSON snapshot; listings added later and every state
+    change are appended to a JSONL log next to it (`<path>.log`), so a finished
+    listing costs one short line instead of a rewrite of the whole manifest.
+    `sync` fsyncs the log at batch boundaries and `finish` compacts it into the
+    snapshot. A crashed or cancelled run can be resumed without re-fetching
+    completed links.
+
+    A streaming run also records the search URLs it covers and which of them
+    are finished, so resuming it can carry on with the unfinished searches.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.log_path = f"{path}.log"
+        self._lock = threading.Lock()
+        self._log = None
+        self.data = None
+
+    def start(self, rows, searches=None):
+        """
+        Begin a new run over `rows` (dicts from links.csv), all pending. A run that
+        discovers its rows as it goes passes the search URLs it will cover as `searches`.
+        """
+        now = datetime.now().isoformat()
+        with self._lock:
+            self.data = {'created': now, 'updated': now, 'completed': False, 'order': [], 'links': {}}
+            if searches is not None:
+                self.data['searches'] = {url: False for url in searches}
+            self._add(rows)
+            self._compact()
+
+    def add(self, rows):
+        """Append more pending rows to a started run, e.g. as a streaming run discovers them."""
+        with self._lock:
+            added = self._add(rows)
+            if added:
+                self._append([{'add': entry} for entry in added])
+
+    def _add(self, rows):
+        added = []
+        entries = self.data['links']
+        for row in rows:
+            link = row.get('Link')
+            if not link:
+                continue
+            key = posting_id(link)
+            if key in entries:
+                continue
+            self.data['order'].append(key)
+            entries[key] = {'link': link, 'row': row, 'state': PENDING, 'attempts': 0, 'error': None}
+            added.append(entries[key])
+        return added
+
+    def load(self):
+        """Load the manifest and replay its state log; returns False if there is no run to resume."""
+        if not os.path.exists(self.path):
+            return False
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.error(f"Could not read run manifest {self.path}: {str(e)}")
+            return False
+        with self._lock:
+            self.data = data
+            self._replay()
+        return True
+
+    def _replay(self):
+        if not os.path.exists(self.log_path):
+            return
+        with open(self.log_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # A torn final line from a crash mid-write
+                    logger.warning(f"Skipping unreadable manifest log line in {self.log_path}")
+                    continue
+                if 'search' in record:
+                    self.data['searches'][record['search']] = True
+                elif 'add' in record:
+                    entry = record['add']
+                    key = posting_id(entry['link'])
+                    if key not in self.data['links']:
+                        self.data['order'].append(key)
+                        self.data['links'][key] = entry
+                else:
+                    self._apply(record['key'], record['state'], record.get('error'))
+
+    def _apply(self, key, state, error):
+        entry = self.data['links'].get(key)
+        if entry is None:
+            return False
+        entry['state'] = state
+        entry['attempts'] += 1
+        entry['error'] = error
+        return True
+
+    def mark(self, link, state, error=None):
+        """Record the outcome of one fetch attempt for `link`."""
+        key = posting_id(link)
+        with self._lock:
+            if self._apply(key, state, error):
+                self._append([{'key': key, 'state': state, 'error': error}])
+
+    def finish_search(self, url):
+        """Record that every listing of search `url` has been added to the run."""
+        with self._lock:
+            self.data['searches'][url] = True
+            self._append([{'search': url}])
+
+    def pending_searches(self):
+        """Return the search URLs of the run that were not finished, in run order."""
+        with self._lock:
+            return [url for url, finished in self.data.get('searches', {}).items() if not finished]
+
+    def sync(self):
+        """Flush and fsync the state log so a crash cannot lose a finished batch."""
+        with self._lock:
+            if self._log is None:
+                return
+            self._log.flush()
+            os.fsync(self._log.fileno())
+
+    def finish(self):
+        with self._lock:
+            self.data['completed'] = True
+            self._compact()
+
+    def entries(self, *states):
+        """Return manifest entries in run order, optionally only those in `states`."""
+        with self._lock:
+            entries = [self.data['links'][key] for key in self.data['order']]
+        if states:
+            entries = [entry for entry in entries if entry['state'] in states]
+        return entries
+
+    def is_resumable(self):
+        if not self.data or self.data.get('completed'):
+            return False
+        return bool(self.entries(PENDING, FAILED)) or bool(self.pending_searches())
+
+    def counts(self):
+        counts = {PENDING: 0, DONE: 0, FAILED: 0, DUPLICATE: 0}
+        for entry in self.entries():
+            counts[entry['state']] = counts.get(entry['state'], 0) + 1
+        return counts
+
+    def close(self):
+        with self._lock:
+            self._close_log()
+
+    def _close_log(self):
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+
+    def _append(self, records):
+        if self._log is None:
+            os.makedirs(os.path.dirname(self.log_path) or '.', exist_ok=True)
+            torn = False
+            if os.path.exists(self.log_path) and os.path.getsize(self.log_path):
+                with open(self.log_path, 'rb') as f:
+                    f.seek(-1, os.SEEK_END)
+                    torn = f.read(1) != b'\n'
+            self._log = open(self.log_path, 'a', encoding='utf-8')
+            if torn:
+                # Keep new records off a line torn by a crash
+                self._log.write('\n')
+        self._log.write("".join(json.dumps(record, default=_json_default) + '\n' for record in records))
+
+    def _compact(self):
+        """Write the full state as the snapshot and start an empty log."""
+        self.data['updated'] = datetime.now().isoformat()
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.data, f, default=_json_default)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        # The snapshot now holds everything the log recorded
+        self._close_log()
+        if os.path.exists(self.log_path):
+            os.remove(self.log_path)
@@ -11,16 +11,42 @@ from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from webdriver_manager.chrome import ChromeDriverManager
 import pandas as pd
 import importlib
-from utils import random_delay, save_to_csv, load_from_csv, remove_duplicates, get_random_user_agent
+from utils import save_to_csv, load_from_csv, remove_duplicates, get_random_user_agent
 import traceback
 import shutil
-from datetime import datetime
+from datetime import datetime, timedelta
 import logging
 import tempfile
 import subprocess
 import sys
 import json
-import random
+import threading
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from driver_pool import DriverPool
+from keyword_matcher import get_matcher, build_alternation
+from result_store import ResultStore
+from listing_store import ListingStore, posting_id
+from events import bus
+from rate_limiter import rate_limiter
+from circuit_breaker import circuit_breaker
+from page_cache import PageCache
+from contact_cache import ContactCache
+from near_duplicates import NearDuplicateIndex, TITLE, DESCRIPTION
+from browser_profile import (
+    lean_profile_enabled, apply_lean_options, disabled_features_argument, block_resources,
+    saved_cookies, inject_cookies, profile_has_cookies, PersistentProfiles
+)
+from run_manifest import RunManifest, PENDING, DONE, FAILED, DUPLICATE
+from fetcher import (HttpFetcher, BLOCK_INDICATORS, parse_search_results, parse_posting_body, has_reply_button,
+                     parse_result_count, search_page_url, parse_post_date, reply_url, parse_reply_info, parse_html)
+
+def normalize_title(title):
+    """Normalize titles by removing emojis, extra spaces, and lowercasing"""
+    title = re.sub(r'[^\x00-\x7F]+', '', str(title))  # Remove emojis
+    title = re.sub(r'\s+', ' ', title)                # Remove extra spaces
+    return title.lower().strip()                      # Lowercase
 
 # Configure logging
 def setup_logging():
@@ -71,6 +97,32 @@ os.makedirs('cookies', exist_ok=True)
 # Default cookies file path
 COOKIES_FILE = os.path.join('cookies', 'cookies.json')
 
+# Keywords that mark a listing as spam/unwanted in titles and descriptions
+BLACKLISTED_KEYWORDS = [
+    "paid research",
+    "get paid",
+    "paid wellness",
+    "sis4",
+    "research",
+    "study",
+    "studies",
+    "make america",
+    "thinking about drinking less",
+    "paid cash",
+    "survey",
+    "cash relief",
+    "local",
+    "extra income",
+    "daily pay",
+    "easiest money online",
+    "paid to post",
+    "paid for your opinions",
+    "online survey"
+]
+
+# Single alternation regex over the blacklist, for column-wise filtering of lowercased text
+BLACKLIST_PATTERN = re.compile(build_alternation(BLACKLISTED_KEYWORDS))
+
 def kill_chromedriver_processes():
     """Kill any running ChromeDriver processes to avoid conflicts."""
     try:
@@ -106,144 +158,209 @@ class CraigslistScraper:
         self.remote_keywords = config.REMOTE_KEYWORDS
         self.non_remote_keywords = config.NON_REMOTE_KEYWORDS
         
+        # Compiled matchers, shared while the config keyword lists stay the same
+        self.keyword_matcher = get_matcher(self.keywords)
+        self.remote_matcher = get_matcher(self.remote_keywords)
+        self.non_remote_matcher = get_matcher(self.non_remote_keywords)
+        self.blacklist_matcher = get_matcher(BLACKLISTED_KEYWORDS)
+        
         # Initialize attributes
-        self.driver = None
+        self._local = threading.local()
+        self._driver = None
         self._captcha_detected = False
         self.use_headless = os.getenv('USE_HEADLESS', 'false').lower() == 'true'
+        # Lean Chrome profile: eager page loads, no images/media/fonts or third-party hosts
+        self.lean_browser = lean_profile_enabled()
+        
+        # Phase 1 discovery counts of the current run (unique postings, cross-search
+        # duplicates, near-duplicate reposts)
+        self.discovery_stats = {'postings': 0, 'duplicates': 0, 'near_duplicates': 0}
+        
+        # Persistent MinHash/LSH index of titles and descriptions for catching reworded reposts
+        near_dup_enabled = os.getenv('NEAR_DUP_ENABLED', 'true').lower() == 'true'
+        self.near_duplicates = NearDuplicateIndex() if near_dup_enabled else None
+        
+        # Reuse the saved session (cookies, optionally a persistent profile) in new drivers
+        # instead of warming each one up on the craigslist.org home page
+        self.session_reuse = os.getenv('SESSION_REUSE', 'true').lower() == 'true'
+        self.session_max_age_hours = float(os.getenv('SESSION_MAX_AGE_HOURS', 24))
+        profile_dir = os.getenv('CHROME_PROFILE_DIR', '')
+        self.profiles = PersistentProfiles(profile_dir) if profile_dir else None
+        self._cookies_lock = threading.Lock()
         
         # Ensure output directory exists
         os.makedirs('output', exist_ok=True)
         
         # Initialize paths and settings
         self.links_file = os.getenv('LINKS_FILE', 'output/links.csv')
+        # Legacy CSV history, imported into the listing store on first run
         self.history_links_file = os.getenv('HISTORY_LINKS_FILE', 'history_links.csv')
         self.output_file = os.getenv('OUTPUT_FILE', 'output/results.csv')
+        self.results_journal_file = os.getenv('RESULTS_JOURNAL_FILE', 'output/results.jsonl')
+        self.run_manifest_file = os.getenv('RUN_MANIFEST_FILE', 'checkpoints/run_manifest.json')
         self.batch_size = int(os.getenv('BATCH_SIZE', 10))
         self.max_retries = int(os.getenv('MAX_RETRIES', 3))
+        self.detail_workers = max(1, int(os.getenv('DETAIL_WORKERS', 1)))
+        
+        # Stream search results straight into the detail workers instead of
+        # running each phase to completion first
+        self.streaming_pipeline = os.getenv('STREAMING_PIPELINE', 'true').lower() == 'true'
+        self.pipeline_queue_size = max(1, int(os.getenv('PIPELINE_QUEUE_SIZE', 50)))
+        
+        # Result pages fetched per search (120 postings each) and how many are fetched at once
+        self.search_max_pages = max(1, int(os.getenv('SEARCH_MAX_PAGES', 10)))
+        self.search_page_workers = max(1, int(os.getenv('SEARCH_PAGE_WORKERS', 3)))
+        
+        # Skip postings already scraped in earlier runs unless their title or date changed
+        self.incremental = os.getenv('INCREMENTAL_SCRAPE', 'false').lower() == 'true'
+        # Posting ids incremental mode re-fetches because they changed; their cached pages are stale
+        self._changed_postings = set()
+        
+        # Fetch engine for search and posting pages: "selenium" or "http".
+        # Selenium stays the fallback for blocked pages and the reply/email flow.
+        self.fetch_engine = os.getenv('FETCH_ENGINE', 'selenium').lower()
+        self.http_fetcher = HttpFetcher() if self.fetch_engine == 'http' else None
+        
+        # Read the reply options straight from the posting's /reply/ endpoint instead of
+        # clicking through them in the browser, which stays the fallback
+        self.reply_fast_path = os.getenv('REPLY_FAST_PATH', 'true').lower() == 'true'
+        self.reply_fetcher = None
+        if self.reply_fast_path:
+            self.reply_fetcher = self.http_fetcher or HttpFetcher()
+            self.reply_fetcher.load_cookies(saved_cookies(COOKIES_FILE, self.session_max_age_hours))
+        self.reply_stats = {path: {'attempts': 0, 'found': 0, 'seconds': 0.0} for path in ('http', 'browser')}
+        self._reply_stats_lock = threading.Lock()
+        
+        # Reply contacts already extracted in earlier runs, by posting id
+        self.contact_cache = ContactCache() if os.getenv('CONTACT_CACHE_ENABLED', 'true').lower() == 'true' else None
+        
+        # On-disk cache of fetched search and posting pages; in offline mode the
+        # scraper only re-parses cached pages and never touches the network
+        self.page_cache = PageCache() if os.getenv('PAGE_CACHE_ENABLED', 'true').lower() == 'true' else None
+        self.offline = bool(self.page_cache and self.page_cache.offline)
+        if self.offline:
+            # Offline runs write their own links, results and checkpoint, never those of real runs
+            offline_dir = os.getenv('OFFLINE_OUTPUT_DIR', 'output/offline')
+            self.links_file, self.output_file, self.results_journal_file, self.run_manifest_file = (
+                os.path.join(offline_dir, os.path.basename(path))
+                for path in (self.links_file, self.output_file, self.results_journal_file, self.run_manifest_file)
+            )
+        
+        # Per-host request budget shared by the HTTP and browser fetch paths and all workers
+        self.rate_limiter = rate_limiter
+        
+        # Stops retrying hosts that keep failing until they cool down
+        self.circuit_breaker = circuit_breaker
+        
+        # Pool of warm Chrome sessions used for listing detail pages
+        self.driver_pool = DriverPool(
+            self._create_driver,
+            size=max(int(os.getenv('DRIVER_POOL_SIZE', 1)), self.detail_workers),
+            max_pages=int(os.getenv('DRIVER_MAX_PAGES', 50)),
+            max_memory_mb=float(os.getenv('DRIVER_MAX_MEMORY_MB', 1024)),
+            health_check=self._is_session_alive
+        )
+        # Longest a listing waits for a free pooled session before it is given up
+        self.driver_lease_timeout = float(os.getenv('DRIVER_LEASE_TIMEOUT', 300))
         
         # Setup ChromeDriver logging
         self.chromedriver_log = os.path.join('logs', 'chromedriver.log')
         
-        # Ensure the history file exists
-        if not os.path.exists(self.history_links_file):
-            # Create an empty history file with headers if it doesn't exist
-            with open(self.history_links_file, 'w', encoding='utf-8') as f:
-                f.write('link,city,title,date_scraped\n')
+        # SQLite store of every posting seen and scraped, replacing history_links.csv
+        self.listing_store = ListingStore(os.getenv('LISTING_DB_FILE', 'listings.db'))
+        if self.listing_store.count() == 0 and os.path.exists(self.history_links_file):
+            # One-time migration of the legacy CSV history
+            self.listing_store.import_history_csv(self.history_links_file)
         
-        # If output/links.csv exists, copy its contents to history_links.csv
+        # If output/links.csv exists, record its links in the history
         if os.path.exists(self.links_file):
             self._update_history_file()
         
+        if self.offline:
+            self.logger.info("Offline mode: parsing cached pages only, no browser")
+            return
+        
         # Kill any existing ChromeDriver processes before setting up a new one
         kill_chromedriver_processes()
         
         # Setup the driver
         self.driver = self._setup_driver()
         
-    def _setup_driver(self):
-        """Set up and return a Chrome WebDriver instance."""
+    @property
+    def driver(self):
+        """The driver leased to the current thread, or the scraper's own driver."""
+        lease = getattr(self._local, 'lease', None)
+        if lease is not None:
+            return lease.driver
+        return self._driver
+
+    @driver.setter
+    def driver(self, value):
+        lease = getattr(self._local, 'lease', None)
+        if lease is not None:
+            lease.driver = value
+        else:
+            self._driver = value
+
+    @contextmanager
+    def _leased_driver(self):
+        """Bind a pooled driver to the current thread for the duration of the block."""
+        with self.driver_pool.lease(timeout=self.driver_lease_timeout) as lease:
+            self._local.lease = lease
+            try:
+                yield lease.driver
+            finally:
+                self._local.lease = None
+
+    def _reset_driver(self):
+        """Replace the current driver with a fresh Chrome session."""
+        lease = getattr(self._local, 'lease', None)
+        if lease is not None:
+            # Only this session is replaced; other pooled sessions stay alive
+            self.driver_pool.recycle(lease)
+            return
         try:
-            chrome_options = Options()
-            if self.use_headless:
-                chrome_options.add_argument("--headless=new")
-            
-            # Create a temporary directory for user data
-            self.user_data_dir = tempfile.mkdtemp()
-            chrome_options.add_argument(f"--user-data-dir={self.user_data_dir}")
-            
-            # Add essential options
-            chrome_options.add_argument("--disable-dev-shm-usage")
-            chrome_options.add_argument("--no-sandbox")
-            chrome_options.add_argument("--disable-gpu")
-            chrome_options.add_argument("--window-size=1920,1080")
-            chrome_options.add_argument("--disable-notifications")
-            chrome_options.add_argument("--disable-popup-blocking")
-            chrome_options.add_argument("--disable-features=VizDisplayCompositor")
-            chrome_options.add_argument("--disable-site-isolation-trials")
-            chrome_options.add_argument("--disable-web-security")  # Add this to handle cross-domain issues
-            chrome_options.add_argument("--allow-running-insecure-content")  # Add this for mixed content
-            
-            # Set random user agent
-            chrome_options.add_argument(f"user-agent={get_random_user_agent()}")
-            
-            # Add experimental options
-            chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-            chrome_options.add_experimental_option("useAutomationExtension", False)
-            
-            # Add prefs to handle permissions and geolocation
-            prefs = {
-                "profile.default_content_setting_values.notifications": 2,
-                "profile.default_content_setting_values.geolocation": 2,
-                "profile.managed_default_content_settings.geolocation": 2,
-                "profile.default_content_settings.cookies": 1,  # Allow cookies
-                "profile.block_third_party_cookies": False  # Allow third-party cookies
-            }
-            chrome_options.add_experimental_option("prefs", prefs)
-            
-            # Set up service
-            driver_path = "/usr/local/bin/chromedriver"
-            service = Service(driver_path)
-            
-            # Create driver
-            self.logger.info("Creating Chrome WebDriver instance...")
-            driver = webdriver.Chrome(service=service, options=chrome_options)
-            driver.set_page_load_timeout(30)
-            
-            # Test the driver
+            if self._driver:
+                self._driver.quit()
+        except Exception as quit_error:
+            self.logger.error(f"Error quitting driver: {str(quit_error)}")
+        
+        # Clean up the user data directory
+        if getattr(self, 'user_data_dir', None) and os.path.exists(self.user_data_dir):
             try:
-                self.logger.info("Testing driver with initial page load...")
-                driver.get("https://www.craigslist.org")
-                time.sleep(2)  # Short wait to ensure page loads
-            except Exception as e:
-                self.logger.error(f"Error during initial page load: {str(e)}")
-                raise
-            
-            return driver
-            
-        except Exception as e:
-            self.logger.error(f"Error setting up Chrome WebDriver: {str(e)}")
-            if hasattr(self, 'user_data_dir') and os.path.exists(self.user_data_dir):
-                try:
-                    shutil.rmtree(self.user_data_dir)
-                except Exception:
-                    pass
-            raise
+                shutil.rmtree(self.user_data_dir)
+            except Exception as cleanup_error:
+                self.logger.error(f"Error cleaning up user data directory: {str(cleanup_error)}")
+        
+        # Only this driver is replaced: a process-wide kill would take down the
+        # pooled sessions detail workers are using at the same time
+        self._driver = self._setup_driver()
+
+    @staticmethod
+    def _is_session_alive(driver):
+        """Return True if the driver still answers WebDriver commands."""
+        try:
+            # Try to execute a simple command to check session
+            driver.current_url
+            return True
+        except Exception:
+            return False
 
     def _check_session_valid(self):
         """Check if the current session is valid and try to recover if not."""
+        if self._is_session_alive(self.driver):
+            return True
+        self.logger.warning("Session invalid")
+        self.logger.info("Attempting to recover session...")
         try:
-            # Try to execute a simple command to check session
-            self.driver.current_url
+            # Create a new driver
+            self._reset_driver()
+            self.logger.info("Session recovered successfully")
             return True
-        except Exception as e:
-            self.logger.warning(f"Session invalid: {str(e)}")
-            self.logger.info("Attempting to recover session...")
-            try:
-                # Close the current driver if it exists
-                if hasattr(self, 'driver') and self.driver:
-                    try:
-                        self.driver.quit()
-                    except Exception as quit_error:
-                        self.logger.error(f"Error quitting driver: {str(quit_error)}")
-                
-                # Clean up the user data directory
-                if hasattr(self, 'user_data_dir') and os.path.exists(self.user_data_dir):
-                    try:
-                        shutil.rmtree(self.user_data_dir)
-                    except Exception as cleanup_error:
-                        self.logger.error(f"Error cleaning up user data directory: {str(cleanup_error)}")
-                
-                # Kill any existing ChromeDriver processes
-                kill_chromedriver_processes()
-                
-                # Create a new driver
-                self.driver = self._setup_driver()
-                self.logger.info("Session recovered successfully")
-                return True
-            except Exception as recovery_error:
-                self.logger.error(f"Failed to recover session: {str(recovery_error)}")
-                self.logger.error(f"Traceback: {traceback.format_exc()}")
-                return False
+        except Exception as recovery_error:
+            self.logger.error(f"Failed to recover session: {str(recovery_error)}")
+            self.logger.error(f"Traceback: {traceback.format_exc()}")
+            return False
 
     def _load_page_with_retry(self, url, max_retries=None):
         """Load a page with retries for reliability."""
@@ -252,6 +369,10 @@ class CraigslistScraper:
             
         if not url or not isinstance(url, str):
             return False
+        
+        if not self.circuit_breaker.allow(url):
+            self.logger.warning(f"Skipping {url}: host circuit is open")
+            return False
             
         attempts = 0
         while attempts < max_retries:
@@ -262,17 +383,9 @@ class CraigslistScraper:
                 is_listing_page = '/d/' in url
                 
                 # Check if driver is still valid
-                try:
-                    # Quick test of driver
-                    _ = self.driver.current_url
-                except Exception:
+                if not self._is_session_alive(self.driver):
                     self.logger.warning("Driver appears invalid, attempting to recreate...")
-                    try:
-                        self.driver.quit()
-                    except:
-                        pass
-                    kill_chromedriver_processes()
-                    self.driver = self._setup_driver()
+                    self._reset_driver()
                 
                 # Set shorter timeout for listing pages
                 if is_listing_page:
@@ -282,6 +395,7 @@ class CraigslistScraper:
                 
                 # Load the page
                 try:
+                    self.rate_limiter.acquire(url)
                     self.driver.get(url)
                 except Exception as e:
                     if "timeout" in str(e).lower():
@@ -321,9 +435,10 @@ class CraigslistScraper:
                             pass
                         raise TimeoutException("Timed out waiting for posting body")
                 else:
-                    # For search pages, wait for complete page load
+                    # For search pages, wait until the DOM is parsed; the results
+                    # themselves are waited for by the caller
                     WebDriverWait(self.driver, 30).until(
-                        lambda driver: driver.execute_script("return document.readyState") == "complete"
+                        lambda driver: driver.execute_script("return document.readyState") in ("interactive", "complete")
                     )
                 
                 # Check for CAPTCHA/blocking
@@ -332,6 +447,8 @@ class CraigslistScraper:
                     continue
                 
                 self.logger.info(f"Successfully loaded page: {url}")
+                self.rate_limiter.record_success(url)
+                self.circuit_breaker.record_success(url)
                 return True
                 
             except Exception as e:
@@ -339,19 +456,18 @@ class CraigslistScraper:
                 self.logger.error(f"Traceback: {traceback.format_exc()}")
                 attempts += 1
                 
+                # Stop burning retries and browser restarts on a host that keeps failing
+                if self.circuit_breaker.record_failure(url, reason=type(e).__name__):
+                    self.logger.error(f"Giving up on {url}: host circuit is open")
+                    return False
+                
                 if attempts < max_retries:
                     wait_time = 5 * (2 ** attempts)  # Exponential backoff
                     self.logger.info(f"Waiting {wait_time} seconds before retry")
                     time.sleep(wait_time)
                     
                     # Try to recover the session
-                    try:
-                        if self.driver:
-                            self.driver.quit()
-                    except:
-                        pass
-                    kill_chromedriver_processes()
-                    self.driver = self._setup_driver()
+                    self._reset_driver()
                 else:
                     self.logger.error(f"Failed to load page after {max_retries} attempts: {url}")
                     return False
@@ -366,22 +482,17 @@ class CraigslistScraper:
         text = text.lower()
         print(f"Checking title: '{text}'")
         
-        for keyword in self.keywords:
-            keyword_lower = keyword.lower()
-            if keyword_lower in text:
-                print(f"✓ Matched keyword: '{keyword}' in title: '{text}'")
-                return True
+        keyword = self.keyword_matcher.first_match(text)
+        if keyword:
+            print(f"✓ Matched keyword: '{keyword}' in title: '{text}'")
+            return True
                 
         # Additional check for partial word matches (e.g., "developer" in "web developer")
-        text_words = text.split()
-        for keyword in self.keywords:
-            keyword_lower = keyword.lower()
-            keyword_parts = keyword_lower.split()
-            
-            for part in keyword_parts:
-                if part in text_words and len(part) > 3:  # Avoid matching short words
-                    print(f"✓ Matched partial keyword: '{part}' (from '{keyword}') in title: '{text}'")
-                    return True
+        partial = self.keyword_matcher.partial_match(text)
+        if partial:
+            part, keyword = partial
+            print(f"✓ Matched partial keyword: '{part}' (from '{keyword}') in title: '{text}'")
+            return True
                     
         print(f"✗ No keyword match for title: '{text}'")
         return False
@@ -390,16 +501,12 @@ class CraigslistScraper:
         """Check if the job is remote, non-remote, or not specified."""
         if not text:
             return "Not Specified"
-            
-        text = text.lower()
         
-        for keyword in self.remote_keywords:
-            if keyword.lower() in text:
-                return "Remote"
+        if self.remote_matcher.first_match(text):
+            return "Remote"
                 
-        for keyword in self.non_remote_keywords:
-            if keyword.lower() in text:
-                return "Non-Remote"
+        if self.non_remote_matcher.first_match(text):
+            return "Non-Remote"
                 
         return "Not Specified"
 
@@ -421,17 +528,13 @@ class CraigslistScraper:
     def _check_for_blocking(self):
         """Check if Craigslist is blocking or throttling requests."""
         try:
-            block_indicators = [
-                "IP has been automatically blocked",
-                "please solve the CAPTCHA below",
-                "your connection has been limited",
-                "detected unusual activity"
-            ]
-            
             page_source = self.driver.page_source.lower()
             
-            for indicator in block_indicators:
+            for indicator in BLOCK_INDICATORS:
                 if indicator.lower() in page_source:
+                    # Cut this host's request rate before anything else
+                    self.rate_limiter.record_block(self.driver.current_url, reason=indicator)
+                    
                     if "captcha" in indicator.lower():
                         self._captcha_detected = True
                         # Open a visible browser if in headless mode
@@ -498,129 +601,418 @@ class CraigslistScraper:
         self._captcha_detected = False
         return False
 
-    def scrape_listings(self, max_listings=None):
+    def _filter_listing(self, title, link, post_date, city):
+        """Apply keyword and blacklist checks to one search result and build its row."""
+        # Check if the title contains any of our keywords
+        if not self._has_keyword(title):
+            return None
+        
+        # Check if the title contains any blacklisted keywords
+        keyword = self.blacklist_matcher.first_match(title)
+        if keyword:
+            print(f"Skipping blacklisted title: '{title}' containing keyword: '{keyword}'")
+            print(f"❌ Skipping blacklisted: '{title}'")
+            return None
+        
+        print(f"✅ Adding listing: '{title}' from {city}")
+        return {
+            "City": city,
+            "Title": title,
+            "Link": link,
+            "Post Date": post_date,
+            "Processed": False
+        }
+
+    def _filter_rows(self, rows, city):
+        """Filter extracted search rows (title, link, post_date dicts) into listing rows."""
+        listings_found = []
+        for row in rows:
+            listing_row = self._filter_listing(row["title"], row["link"], row["post_date"], city)
+            if listing_row:
+                listings_found.append(listing_row)
+        return listings_found
+
+    def _fetch_page_html(self, url, refresh=False):
         """
-        PHASE 1: Scrape job listings from Craigslist for all URLs.
+        Return a page's HTML from the page cache, or over HTTP when that engine is on.
+        None means there is no usable copy without loading the page in the browser.
+        `refresh` skips the cached copy (outside offline mode) and replaces it.
         """
-        all_listings = []
+        if self.page_cache and not (refresh and not self.offline):
+            html = self.page_cache.get(url)
+            if html is not None:
+                return html
+        if not self.http_fetcher or self.offline:
+            return None
+        
+        result = self.http_fetcher.get(url)
+        if not result.ok:
+            return None
+        if self.page_cache:
+            self.page_cache.put(url, result.html)
+        return result.html
+
+    def _cache_current_page(self, url):
+        """Store the page loaded in the browser in the page cache."""
+        if not self.page_cache:
+            return
+        try:
+            self.page_cache.put(url, self.driver.page_source)
+        except Exception as e:
+            self.logger.warning(f"Could not cache {url}: {str(e)}")
+
+    def _fetch_search_rows(self, url):
+        """
+        Get a search page from the cache or over HTTP and parse it into (rows, page_info),
+        page_info being (page_size, total) or None. Rows are None if Selenium must be used.
+        """
+        html = self._fetch_page_html(url)
+        if html is None:
+            return None, None
+        page = parse_html(html)
+        rows = parse_search_results(page, url)
+        if not rows:
+            # Nothing parseable in the raw HTML, let the browser render it
+            return None, None
+        return rows, parse_result_count(page)
+
+    def _search_page_urls(self, url, page_info):
+        """URLs of the result pages after the first, as far as SEARCH_MAX_PAGES allows."""
+        if not page_info:
+            return []
+        page_size, total = page_info
+        if page_size <= 0 or total <= page_size:
+            return []
+        pages = min(-(-total // page_size), self.search_max_pages)
+        if pages < -(-total // page_size):
+            self.logger.info(f"{url} has {total} results, only fetching the first {pages} pages")
+        return [search_page_url(url, page, page_size) for page in range(1, pages)]
+
+    @staticmethod
+    def _split_window(url, rows, date_key):
+        """
+        Split rows into those inside the search's postedToday window and whether any
+        fell outside it. Results are newest first, so later pages are all older.
+        """
+        if 'postedToday=1' not in url:
+            return rows, False
+        # A day of slack for the gap between our clock and the site's timezone
+        oldest = (datetime.now() - timedelta(days=1)).date()
+        inside = []
+        for row in rows:
+            posted = parse_post_date(row.get(date_key))
+            if posted is not None and posted < oldest:
+                continue
+            inside.append(row)
+        return inside, len(inside) < len(rows)
+
+    def _scrape_more_pages(self, url, city, page_info, found, limit=None):
+        """
+        Fetch the remaining result pages of a search concurrently, a wave of
+        SEARCH_PAGE_WORKERS pages at a time (the host rate limiter spaces the
+        requests), and return their matching listings. Stops at the first page
+        that fails, leaves the postedToday window or fills `limit`.
+        """
+        page_urls = self._search_page_urls(url, page_info)
+        if not page_urls:
+            return []
+        
+        more = []
+        workers = self.search_page_workers
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="search") as executor:
+            for start in range(0, len(page_urls), workers):
+                wave = page_urls[start:start + workers]
+                for page_url, (rows, _) in zip(wave, executor.map(self._fetch_search_rows, wave)):
+                    if rows is None:
+                        print(f"Could not fetch {page_url}, stopping pagination")
+                        return more
+                    rows, left_window = self._split_window(url, rows, 'post_date')
+                    more.extend(self._filter_rows(rows, city))
+                    print(f"Found {len(rows)} listings on {page_url}")
+                    if left_window:
+                        print(f"Results on {page_url} are older than the postedToday window, stopping")
+                        return more
+                    if limit and found + len(more) >= limit:
+                        return more
+        return more
+
+    def _scrape_more_pages_selenium(self, url, city, found, limit=None, page_info=None):
+        """
+        Browser counterpart of _scrape_more_pages: loads the remaining result pages one by one.
+        Without `page_info` the result count is read from the first page loaded in the browser.
+        """
+        if page_info is None:
+            try:
+                page_info = parse_result_count(self.driver.page_source)
+            except Exception:
+                page_info = None
+        
+        more = []
+        for page_url in self._search_page_urls(url, page_info):
+            listings = self._scrape_search_page_selenium(page_url, city)
+            if listings is None:
+                break
+            listings, left_window = self._split_window(url, listings, 'Post Date')
+            more.extend(listings)
+            if left_window or (limit and found + len(more) >= limit):
+                break
+        return more
+
+    # Pulls every listing row off a search page in a single WebDriver round trip
+    EXTRACT_LISTINGS_SCRIPT = """
+        var listings = document.querySelectorAll('div.result-info');
+        if (!listings.length) {
+            listings = document.querySelectorAll('div.cl-search-result');
+        }
+        var rows = [];
+        for (var i = 0; i < listings.length; i++) {
+            var anchor = listings[i].querySelector('a.cl-app-anchor.cl-search-anchor.posting-title, a.posting-title');
+            if (!anchor) { continue; }
+            var title = (anchor.innerText || '').trim();
+            if (!title) {
+                var label = anchor.querySelector('span.label');
+                title = label ? (label.innerText || label.textContent || '').trim() : '';
+            }
+            var dateElement = listings[i].querySelector('span[title]') ||
+                              listings[i].querySelector('time.posted-date') ||
+                              listings[i].querySelector('time.result-date');
+            var postDate = '';
+            if (dateElement) {
+                postDate = dateElement.getAttribute('title') || (dateElement.innerText || '').trim();
+            }
+            rows.push({title: title, link: anchor.href, post_date: postDate});
+        }
+        return JSON.stringify(rows);
+    """
+
+    def _extract_search_rows_bulk(self):
+        """Extract title, link and date for all listings on the loaded page in one script call."""
+        try:
+            rows = json.loads(self.driver.execute_script(self.EXTRACT_LISTINGS_SCRIPT) or "[]")
+        except Exception as e:
+            self.logger.warning(f"Bulk listing extraction failed: {str(e)}")
+            return None
         
-        # Import scraping_status from app.py for updating current city
-        from app import scraping_status
+        for row in rows:
+            row["post_date"] = row.get("post_date") or ""
+        return [row for row in rows if row.get("title")]
+
+    def _scrape_search_page_selenium(self, url, city):
+        """Load a search page in the browser and return the matching listings."""
+        listings_found = []
         
-        for url in self.urls:
-            # Extract city name from URL for status tracking
-            city = url.split('/')[2].split('.')[0]  # e.g., "newyork" from "newyork.craigslist.org"
-            scraping_status["current_city"] = city
+        if not self._load_page_with_retry(url):
+            return None
             
-            if not self._load_page_with_retry(url):
-                continue
-                
-            # Check if we're being blocked
-            if self._check_for_blocking():
-                continue
+        # Check if we're being blocked
+        if self._check_for_blocking():
+            return None
+        
+        # Wait for the results to load
+        try:
+            # Wait for either the old or new style results container
+            WebDriverWait(self.driver, 10).until(
+                lambda driver: driver.find_elements(By.CSS_SELECTOR, "div.result-info") or 
+                             driver.find_elements(By.CSS_SELECTOR, "div.cl-search-result")
+            )
             
-            random_delay()
+            # Cache the rendered results, not the page as first parsed
+            self._cache_current_page(url)
             
-            # Wait for the results to load
-            try:
-                # Wait for either the old or new style results container
-                WebDriverWait(self.driver, 10).until(
-                    lambda driver: driver.find_elements(By.CSS_SELECTOR, "div.result-info") or 
-                                 driver.find_elements(By.CSS_SELECTOR, "div.cl-search-result")
-                )
-                
-                # Try to find listings with both old and new selectors
-                listings = (
-                    self.driver.find_elements(By.CSS_SELECTOR, "div.result-info") or 
-                    self.driver.find_elements(By.CSS_SELECTOR, "div.cl-search-result")
-                )
+            # Try to find listings with both old and new selectors
+            listings = (
+                self.driver.find_elements(By.CSS_SELECTOR, "div.result-info") or 
+                self.driver.find_elements(By.CSS_SELECTOR, "div.cl-search-result")
+            )
+            
+            if not listings:
+                print(f"No listings found for URL: {url}")
+                return None
                 
-                if not listings:
-                    print(f"No listings found for URL: {url}")
-                    continue
+            print(f"Found {len(listings)} listings for URL: {url}")
+            
+            # Fast path: read all rows at once and filter them in Python
+            rows = self._extract_search_rows_bulk()
+            if rows is not None:
+                return self._filter_rows(rows, city)
+            
+            # Process each listing
+            for listing in listings:
+                try:
+                    # Try both new and old title selectors
+                    title_element = (
+                        listing.find_element(By.CSS_SELECTOR, "a.cl-app-anchor.cl-search-anchor.posting-title") or
+                        listing.find_element(By.CSS_SELECTOR, "a.posting-title")
+                    )
                     
-                print(f"Found {len(listings)} listings for URL: {url}")
-                
-                # Process each listing
-                for listing in listings:
+                    # Get title text, checking for span.label if needed
+                    title = title_element.text.strip()
+                    if not title:
+                        try:
+                            span = title_element.find_element(By.CSS_SELECTOR, "span.label")
+                            title = span.text.strip()
+                        except:
+                            continue
+                    
+                    # Get link
+                    link = title_element.get_attribute("href")
+                    
+                    # Get post date using multiple selectors
                     try:
-                        # Try both new and old title selectors
-                        title_element = (
-                            listing.find_element(By.CSS_SELECTOR, "a.cl-app-anchor.cl-search-anchor.posting-title") or
-                            listing.find_element(By.CSS_SELECTOR, "a.posting-title")
+                        date_element = (
+                            listing.find_element(By.CSS_SELECTOR, "span[title]") or
+                            listing.find_element(By.CSS_SELECTOR, "time.posted-date") or
+                            listing.find_element(By.CSS_SELECTOR, "time.result-date")
                         )
+                        post_date = date_element.get_attribute("title") or date_element.text.strip()
+                    except:
+                        # No date on the page; a made-up one would look like an edit to incremental mode
+                        post_date = ""
                         
-                        # Get title text, checking for span.label if needed
-                        title = title_element.text.strip()
-                        if not title:
-                            try:
-                                span = title_element.find_element(By.CSS_SELECTOR, "span.label")
-                                title = span.text.strip()
-                            except:
-                                continue
-                        
-                        # Get link
-                        link = title_element.get_attribute("href")
-                        
-                        # Get post date using multiple selectors
-                        try:
-                            date_element = (
-                                listing.find_element(By.CSS_SELECTOR, "span[title]") or
-                                listing.find_element(By.CSS_SELECTOR, "time.posted-date") or
-                                listing.find_element(By.CSS_SELECTOR, "time.result-date")
-                            )
-                            post_date = date_element.get_attribute("title") or date_element.text.strip()
-                            if not post_date:
-                                post_date = datetime.now().strftime("%Y-%m-%d")
-                        except:
-                            post_date = datetime.now().strftime("%Y-%m-%d")
-                            
-                        # Check if the title contains any of our keywords
-                        if self._has_keyword(title):
-                            # Check if the title contains any blacklisted keywords
-                            contains_blacklisted = False
-                            title_lower = title.lower()
-                            
-                            # Blacklist check
-                            blacklisted_keywords = [
-                                "paid research", "get paid", "paid wellness", "sis4", 
-                                "research", "study", "studies", "make america", 
-                                "thinking about drinking less", "paid cash", "survey", 
-                                "cash relief", "local", "extra income", "daily pay", 
-                                "easiest money online", "paid to post", "paid for your opinions", 
-                                "online survey"
-                            ]
+                    listing_row = self._filter_listing(title, link, post_date, city)
+                    if listing_row:
+                        listings_found.append(listing_row)
                             
-                            for keyword in blacklisted_keywords:
-                                if keyword.lower() in title_lower:
-                                    contains_blacklisted = True
-                                    print(f"Skipping blacklisted title: '{title}' containing keyword: '{keyword}'")
-                                    break
-                            
-                            if not contains_blacklisted:
-                                print(f"✅ Adding listing: '{title}' from {city}")
-                                all_listings.append({
-                                    "City": city,
-                                    "Title": title,
-                                    "Link": link,
-                                    "Post Date": post_date,
-                                    "Processed": False
-                                })
-                            else:
-                                print(f"❌ Skipping blacklisted: '{title}'")
-                                
-                    except Exception as e:
-                        print(f"Error processing listing: {str(e)}")
-                        continue
-                        
-                    random_delay(0.5, 1.5)
-                    
-            except Exception as e:
-                print(f"Error scraping URL {url}: {str(e)}")
-                continue
+                except Exception as e:
+                    print(f"Error processing listing: {str(e)}")
+                    continue
                 
-            # Random delay between URLs
-            random_delay(5, 10)
+        except Exception as e:
+            print(f"Error scraping URL {url}: {str(e)}")
+            return None
+        
+        return listings_found
+
+    def _scrape_search_url(self, url, limit=None):
+        """
+        Scrape one search URL, all its result pages included, into matching listing rows;
+        None if the first page could not be scraped. Pagination stops once `limit` rows match.
+        """
+        # Extract city name from URL for status tracking
+        city = url.split('/')[2].split('.')[0]  # e.g., "newyork" from "newyork.craigslist.org"
+        bus.publish('city', city=city, url=url)
+        
+        listings_found = None
+        rows, page_info = self._fetch_search_rows(url)
+        if rows is not None:
+            print(f"Found {len(rows)} listings for URL: {url}")
+            rows, left_window = self._split_window(url, rows, 'post_date')
+            listings_found = self._filter_rows(rows, city)
+            if not left_window and not (limit and len(listings_found) >= limit):
+                if self.http_fetcher or self.offline:
+                    listings_found += self._scrape_more_pages(url, city, page_info, len(listings_found), limit)
+                else:
+                    # Page 1 came from the cache, but only the browser can fetch the pages after it
+                    listings_found += self._scrape_more_pages_selenium(url, city, len(listings_found), limit,
+                                                                       page_info)
+        elif self.offline:
+            print(f"No cached copy of {url}, skipping (offline mode)")
+            return None
+        elif self.http_fetcher:
+            self.logger.info(f"HTTP fetch unusable for {url}, falling back to Selenium")
+        
+        if listings_found is None:
+            listings_found = self._scrape_search_page_selenium(url, city)
+            if listings_found is None:
+                bus.publish('error', city=city, url=url, message="Search page could not be scraped")
+                return None
+            listings_found, left_window = self._split_window(url, listings_found, 'Post Date')
+            if not left_window and not (limit and len(listings_found) >= limit):
+                listings_found += self._scrape_more_pages_selenium(url, city, len(listings_found), limit)
+        
+        bus.publish('listings_found', city=city, url=url, count=len(listings_found))
+        return listings_found
+
+    def _dedupe_postings(self, listings_found, seen_ids, url):
+        """
+        Drop listings whose posting id was already discovered earlier in the run.
+        Overlapping search radii list the same posting on several subdomains.
+        Reposts under a new posting id whose title nearly matches a posting
+        kept earlier in this run or fetched in an earlier one are dropped as
+        well. Titles are only indexed for good once their posting is fetched.
+        """
+        unique = []
+        duplicates = near_duplicates = 0
+        for row in listings_found:
+            key = posting_id(row.get('Link'))
+            if key and key in seen_ids:
+                duplicates += 1
+                continue
+            seen_ids.add(key)
+            
+            if self.near_duplicates and key:
+                match = self.near_duplicates.check_and_hold(TITLE, key, row.get('Title', ''))
+                if match:
+                    print(f"Skipping near-duplicate title: '{row.get('Title')}' "
+                          f"({match[1]:.0%} similar to posting {match[0]})")
+                    near_duplicates += 1
+                    continue
+            unique.append(row)
+        
+        stats = self.discovery_stats
+        stats['postings'] += len(unique)
+        stats['duplicates'] += duplicates
+        stats['near_duplicates'] += near_duplicates
+        if duplicates:
+            print(f"Skipped {duplicates} postings from {url} already found by another search")
+        if duplicates or near_duplicates:
+            bus.publish('duplicates_skipped', url=url, count=duplicates + near_duplicates,
+                        total=stats['duplicates'] + stats['near_duplicates'], near_total=stats['near_duplicates'])
+        return unique
+
+    def _iter_search_pages(self, max_listings=None, urls=None, seen_ids=None):
+        """
+        Yield (url, listings) with the matching listings of each search URL that
+        could be scraped, without postings an earlier search of the run already
+        yielded. `urls` defaults to all configured searches; `seen_ids` holds the
+        posting ids a resumed run discovered before it was interrupted.
+        URLs whose host circuit is open are deferred to the end and skipped if
+        the host has still not cooled down by then. With `max_listings`, a search
+        stops paginating once the run has that many listings.
+        """
+        self.discovery_stats = {'postings': 0, 'duplicates': 0, 'near_duplicates': 0}
+        if self.near_duplicates:
+            self.near_duplicates.clear_held()
+        seen_ids = set() if seen_ids is None else seen_ids
+        deferred = []
+        yielded = 0
+        for url in self.urls if urls is None else urls:
+            if not self.circuit_breaker.is_available(url):
+                print(f"Deferring {url}: host circuit is open")
+                deferred.append(url)
+                continue
+            listings_found = self._scrape_search_url(url, max_listings - yielded if max_listings else None)
+            if listings_found is not None:
+                listings_found = self._dedupe_postings(listings_found, seen_ids, url)
+                yielded += len(listings_found)
+                yield url, listings_found
+        
+        for url in deferred:
+            if not self.circuit_breaker.is_available(url):
+                print(f"Skipping {url}: host is still unavailable")
+                bus.publish('error', url=url, message="Host unavailable (circuit open)")
+                continue
+            listings_found = self._scrape_search_url(url, max_listings - yielded if max_listings else None)
+            if listings_found is not None:
+                listings_found = self._dedupe_postings(listings_found, seen_ids, url)
+                yielded += len(listings_found)
+                yield url, listings_found
+        
+        stats = self.discovery_stats
+        saved = stats['duplicates'] + stats['near_duplicates']
+        print(f"Discovered {stats['postings']} unique postings; skipped {stats['duplicates']} duplicates "
+              f"from overlapping searches and {stats['near_duplicates']} near-duplicate reposts "
+              f"({saved} detail fetches saved)")
+        self.logger.info(f"Phase 1 dedupe saved {saved} detail fetches")
+
+    def scrape_listings(self, max_listings=None):
+        """
+        PHASE 1: Scrape job listings from Craigslist for all URLs.
+        """
+        all_listings = []
+        
+        for _, listings_found in self._iter_search_pages(max_listings):
+            all_listings.extend(listings_found)
             
             # If we've reached max_listings, stop
             if max_listings and len(all_listings) >= max_listings:
@@ -631,8 +1023,8 @@ class CraigslistScraper:
             df = pd.DataFrame(all_listings)
             save_to_csv(df, self.links_file)
             
-            # Update history file after saving all links
-            self._update_history_file()
+            # Update history after saving all links
+            self._update_history_file(df)
             
             return df
         else:
@@ -649,13 +1041,6 @@ class CraigslistScraper:
         if df.empty:
             return df
         
-        # Clean up titles to improve duplicate detection
-        def normalize_title(title):
-            """Normalize titles by removing emojis, extra spaces, and lowercasing"""
-            title = re.sub(r'[^\x00-\x7F]+', '', title)  # Remove emojis
-            title = re.sub(r'\s+', ' ', title)           # Remove extra spaces
-            return title.lower().strip()                 # Lowercase
-        
         # Add normalized title for comparison
         df['NormalizedTitle'] = df['Title'].apply(normalize_title)
         
@@ -678,72 +1063,35 @@ class CraigslistScraper:
         Filter out listings that contain blacklisted keywords in title or description.
         Uses case-insensitive matching for all comparisons.
         """
-        # List of blacklisted keywords to filter out
-        blacklisted_keywords = [
-            "paid research",
-            "get paid",
-            "paid wellness",
-            "sis4",
-            "research",
-            "study",
-            "studies",
-            "make america", 
-            "thinking about drinking less",
-            "paid cash",
-            "survey",
-            "cash relief",
-            "local",
-            "extra income", 
-            "daily pay",
-            "easiest money online",
-            "paid to post",
-            "paid for your opinions",
-            "online survey"
-        ]
-        
         # Make a copy to avoid modifying the original
         filtered_df = df.copy()
         
         # Initial size
         initial_size = len(filtered_df)
-        rows_to_drop = []
         
-        # Go through each row and check for blacklisted keywords
-        for idx, row in filtered_df.iterrows():
-            should_filter = False
-            
-            # Check title
-            if 'NormalizedTitle' in row:
-                title = row['NormalizedTitle'].lower()
-                for keyword in blacklisted_keywords:
-                    if keyword.lower() in title:
-                        should_filter = True
-                        print(f"Filtering out title: '{row.get('Title', '')}' containing keyword: '{keyword}'")
-                        break
-            
-            # Also check the original title
-            if not should_filter and 'Title' in row:
-                title = str(row['Title']).lower()
-                for keyword in blacklisted_keywords:
-                    if keyword.lower() in title:
-                        should_filter = True
-                        print(f"Filtering out title: '{row.get('Title', '')}' containing keyword: '{keyword}'")
-                        break
-            
-            # Check description if available
-            if not should_filter and 'Description' in row and pd.notna(row['Description']):
-                desc = str(row['Description']).lower()
-                for keyword in blacklisted_keywords:
-                    if keyword.lower() in desc:
-                        should_filter = True
-                        print(f"Filtering out listing with blacklisted keyword '{keyword}' in description: {row.get('Title', '')}")
-                        break
-            
-            if should_filter:
-                rows_to_drop.append(idx)
+        def blacklisted(column, rows):
+            mask = pd.Series(False, index=filtered_df.index)
+            if column not in filtered_df.columns:
+                return mask
+            values = filtered_df.loc[rows, column]
+            values = values[values.notna()]
+            mask.loc[values.index] = values.astype(str).str.lower().str.contains(BLACKLIST_PATTERN, regex=True)
+            return mask
+        
+        # Check normalized title, original title and description (if available) column-wise,
+        # scanning the long description text only for rows the titles did not already drop
+        all_rows = pd.Series(True, index=filtered_df.index)
+        title_mask = blacklisted('NormalizedTitle', all_rows) | blacklisted('Title', all_rows)
+        description_mask = blacklisted('Description', ~title_mask)
+        drop_mask = title_mask | description_mask
+        
+        for title in filtered_df.loc[title_mask, 'Title'] if 'Title' in filtered_df.columns else []:
+            print(f"Filtering out title: '{title}' containing a blacklisted keyword")
+        for title in filtered_df.loc[description_mask, 'Title'] if 'Title' in filtered_df.columns else []:
+            print(f"Filtering out listing with blacklisted keyword in description: {title}")
         
         # Drop the filtered rows
-        filtered_df = filtered_df.drop(rows_to_drop)
+        filtered_df = filtered_df[~drop_mask]
         
         # Report how many were filtered out
         filtered_out = initial_size - len(filtered_df)
@@ -759,15 +1107,14 @@ class CraigslistScraper:
         has_data_mask = df_copy.notna().any(axis=1) & (df_copy != "").any(axis=1)
         
         # For rows with data, replace empty values with 'null'
-        for idx in df_copy[has_data_mask].index:
-            for col in df_copy.columns:
-                if pd.isna(df_copy.at[idx, col]) or df_copy.at[idx, col] == "":
-                    df_copy.at[idx, col] = "null"
-        
-        return df_copy
+        empty_mask = df_copy.isna() | (df_copy == "")
+        return df_copy.astype(object).mask(empty_mask.mul(has_data_mask, axis=0), "null")
 
     def _extract_email_info(self, max_attempts=3):
-        """Extract email information with retries and fallbacks."""
+        """
+        Extract email information with retries and fallbacks. Returns (email_data, finished);
+        finished is False when a CAPTCHA or errors cut the reply flow short.
+        """
         email_data = {
             'Email': "Not Available",
             'Default Mail': "",
@@ -802,7 +1149,10 @@ class CraigslistScraper:
                 
                 if not reply_button:
                     self.logger.warning("Reply button not found")
-                    return email_data
+                    return email_data, True
+                
+                # The click fetches the reply options from the posting's host
+                self.rate_limiter.acquire(self.driver.current_url)
                 
                 # Click with JavaScript to avoid potential click intercepted errors
                 self.driver.execute_script("arguments[0].click();", reply_button)
@@ -813,7 +1163,7 @@ class CraigslistScraper:
                     if attempt < max_attempts - 1:
                         continue
                     else:
-                        return email_data
+                        return email_data, False
                 
                 # Try multiple approaches to get email
                 email_found = False
@@ -883,7 +1233,7 @@ class CraigslistScraper:
                                 elif "aol" in class_attr or "aol" in href:
                                     email_data['AOL'] = href
                         
-                        return email_data
+                        return email_data, True
                         
                     except Exception as e:
                         self.logger.error(f"Error extracting email info: {str(e)}")
@@ -897,27 +1247,88 @@ class CraigslistScraper:
                     time.sleep(2 * (attempt + 1))
                     continue
         
+        return email_data, False
+
+    def _record_reply_path(self, path, found, seconds):
+        with self._reply_stats_lock:
+            stats = self.reply_stats[path]
+            stats['attempts'] += 1
+            stats['found'] += int(found)
+            stats['seconds'] += seconds
+
+    def _report_reply_stats(self):
+        """Log how often each reply extraction path found an email and what it cost."""
+        if self.contact_cache:
+            stats = self.contact_cache.snapshot()
+            print(f"Contact cache: {stats['hits']} hits, {stats['negative_hits']} cached as unavailable, "
+                  f"{stats['misses'] + stats['stale']} misses")
+        for path, stats in self.reply_stats.items():
+            if not stats['attempts']:
+                continue
+            hit_rate = 100.0 * stats['found'] / stats['attempts']
+            average = stats['seconds'] / stats['attempts']
+            print(f"Reply info via {path}: {stats['found']}/{stats['attempts']} found ({hit_rate:.0f}%), "
+                  f"{average:.2f}s average")
+            self.logger.info(f"Reply {path} path: {stats['found']}/{stats['attempts']} hits, "
+                             f"{stats['seconds']:.1f}s total")
+
+    def _cached_contact(self, link):
+        """Contact fields of a posting from the contact cache, or None if they must be extracted."""
+        if not self.contact_cache:
+            return None
+        return self.contact_cache.get(link)
+
+    def _store_contact(self, link, email_info):
+        if self.contact_cache:
+            self.contact_cache.put(link, email_info)
+
+    def _extract_email_info_http(self, page, link, driver=None):
+        """
+        Fast path of _extract_email_info: request the posting's reply endpoint
+        directly, with the saved session cookies (and the browser's, when
+        `driver` is given). `page` is the posting's HTML or its parsed soup.
+        Returns the email fields, or None to fall back to the browser.
+        """
+        if not self.reply_fetcher:
+            return None
+        url = reply_url(page, link)
+        if url is None:
+            return None
+        
+        start = time.time()
+        email_data = None
+        try:
+            if driver is not None:
+                self.reply_fetcher.load_cookies(driver.get_cookies())
+            result = self.reply_fetcher.get(url)
+            if result.ok:
+                email_data = parse_reply_info(result.html)
+            elif result.blocked:
+                self.logger.warning(f"Reply endpoint challenged for {link}, falling back to the browser")
+        except Exception as e:
+            self.logger.warning(f"Reply fast path failed for {link}: {str(e)}")
+        self._record_reply_path('http', email_data is not None, time.time() - start)
         return email_data
 
     def _load_listing_page(self, url, max_retries=3):
         """Special handler for loading individual listing pages."""
+        if not self.circuit_breaker.allow(url):
+            self.logger.warning(f"Skipping {url}: host circuit is open")
+            return False
+        
         for attempt in range(max_retries):
             try:
                 self.logger.info(f"Loading listing page (attempt {attempt + 1}/{max_retries}): {url}")
                 
-                # Create fresh driver for each listing
-                if self.driver:
-                    try:
-                        self.driver.quit()
-                    except:
-                        pass
-                kill_chromedriver_processes()
-                self.driver = self._setup_driver()
+                # Reuse the warm pooled session; only start over after a failed attempt
+                if attempt > 0 or not self._is_session_alive(self.driver):
+                    self._reset_driver()
                 
                 # Set shorter timeout for listing pages
                 self.driver.set_page_load_timeout(15)
                 
                 try:
+                    self.rate_limiter.acquire(url)
                     self.driver.get(url)
                 except Exception as e:
                     if "timeout" in str(e).lower():
@@ -952,6 +1363,9 @@ class CraigslistScraper:
                 
             except Exception as e:
                 self.logger.error(f"Error loading listing page (attempt {attempt + 1}): {str(e)}")
+                if self.circuit_breaker.record_failure(url, reason=type(e).__name__):
+                    self.logger.error(f"Giving up on {url}: host circuit is open")
+                    return False
                 if attempt < max_retries - 1:
                     wait_time = 5 * (2 ** attempt)  # Exponential backoff
                     self.logger.info(f"Waiting {wait_time} seconds before retry")
@@ -962,144 +1376,575 @@ class CraigslistScraper:
         
         return False
 
-    def scrape_details(self, df=None, start_index=0, max_listings=None):
+    def _scrape_listing_browserless(self, link, listing_data):
         """
-        PHASE 2 - STEP 2: Visit each listing and extract email, description, and remote status.
+        Fill in a listing's description and remote status from the page cache or over HTTP.
+        Returns (handled, has_description); handled means no browser visit is needed.
         """
-        if df is None:
-            df = load_from_csv(self.links_file)
+        # A posting incremental mode found edited must not come back from the cache
+        html = self._fetch_page_html(link, refresh=posting_id(link) in self._changed_postings)
+        if html is None:
+            return False, False
+        
+        # Parsed once for the description, the reply button and the reply endpoint
+        page = parse_html(html)
+        description = parse_posting_body(page)
+        if description is None:
+            return False, False
+        
+        listing_data['Description'] = description
+        listing_data['Remote'] = self._check_remote_status(description)
+        
+        # Without a reply button there is no email flow to run in the browser
+        if not has_reply_button(page):
+            return True, True
+        email_info = self._cached_contact(link)
+        if email_info is None and not self.offline:
+            email_info = self._extract_email_info_http(page, link)
+            if email_info is not None:
+                self._store_contact(link, email_info)
+        if email_info is None:
+            return False, True
+        listing_data.update(email_info)
+        return True, True
+
+    def _has_posting_body(self):
+        """True if the page loaded in the browser has a posting body."""
+        try:
+            return bool(self.driver.find_elements(
+                By.CSS_SELECTOR, "#postingbody, section#postingbody, div[data-testid='postingbody']"
+            ))
+        except Exception:
+            return False
+
+    def _extract_description(self, listing_data):
+        """Read the posting body from the loaded page into the listing data."""
+        try:
+            description_element = None
+            desc_selectors = ["#postingbody", "section#postingbody", "div[data-testid='postingbody']"]
             
-        if df.empty:
-            return pd.DataFrame()
+            for selector in desc_selectors:
+                try:
+                    description_element = WebDriverWait(self.driver, 10).until(
+                        EC.presence_of_element_located((By.CSS_SELECTOR, selector))
+                    )
+                    if description_element:
+                        break
+                except:
+                    continue
             
+            if description_element:
+                description = description_element.text.strip()
+                listing_data['Description'] = description
+                listing_data['Remote'] = self._check_remote_status(description)
+        except Exception as e:
+            self.logger.error(f"Error extracting description: {str(e)}")
+
+    def _scrape_listing(self, link, listing_data, has_description=False, reply_tried=False):
+        """
+        Load one listing page and fill in its description, remote status and email info.
+        `reply_tried` means the contact cache and HTTP reply fast path already failed for this posting.
+        """
+        # Instead of using _load_page_with_retry, use the special listing page handler
+        if not self._load_listing_page(link):
+            self.logger.error(f"Failed to load listing page: {link}")
+            return has_description
+        
+        # A challenge page passes the load check too; it cuts the host's rate instead
+        blocked = self._check_for_blocking()
+        if not blocked and self._has_posting_body():
+            self.rate_limiter.record_success(link)
+            self.circuit_breaker.record_success(link)
+        if not blocked:
+            self._cache_current_page(link)
+        
+        # Extract description unless the cache or HTTP engine already did
+        if not has_description:
+            self._extract_description(listing_data)
+        
+        # Extract email information: the contact cache and the HTTP fast path first,
+        # unless both were already tried before the browser was needed
+        email_info = None
+        if not reply_tried:
+            email_info = self._cached_contact(link)
+            if email_info is None:
+                try:
+                    email_info = self._extract_email_info_http(self.driver.page_source, link, self.driver)
+                except Exception as e:
+                    self.logger.warning(f"Could not read the reply link of {link}: {str(e)}")
+                if email_info is not None:
+                    self._store_contact(link, email_info)
+        if email_info is None:
+            start = time.time()
+            email_info, finished = self._extract_email_info()
+            self._record_reply_path('browser', email_info['Email'] != "Not Available", time.time() - start)
+            # A challenge or failed click-through is no answer; don't cache it as "Not Available"
+            if finished and not blocked:
+                self._store_contact(link, email_info)
+        listing_data.update(email_info)
+        return True
+
+    def _filter_incremental(self, df):
+        """Drop listings already scraped in an earlier run; returns (remaining_df, skipped_count)."""
+        if df.empty or 'Link' not in df.columns:
+            return df, 0
+        
+        previous = self.listing_store.get_results(df['Link'].dropna().tolist())
+        
+        def already_scraped(row):
+            result = previous.get(posting_id(row['Link']))
+            if not result:
+                return False
+            if not unchanged(row, result):
+                self._changed_postings.add(posting_id(row['Link']))
+                return False
+            return True
+        
+        def unchanged(row, result):
+            # Retry postings whose earlier fetch failed
+            if str(result.get('Description', '')).startswith("Error:"):
+                return False
+            # Re-fetch postings that were edited or reposted since. Dates are only
+            # compared when the page showed one both times.
+            if str(result.get('Title')) != str(row.get('Title')):
+                return False
+            old_date, new_date = page_date(result.get('Post Date')), page_date(row.get('Post Date'))
+            return not (old_date and new_date) or old_date == new_date
+        
+        def page_date(value):
+            return "" if pd.isna(value) else str(value).strip()
+        
+        skip_mask = df.apply(already_scraped, axis=1) if previous else pd.Series(False, index=df.index)
+        skipped = int(skip_mask.sum())
+        if skipped:
+            print(f"Incremental mode: skipping {skipped} listings already scraped in earlier runs")
+        return df[~skip_mask], skipped
+
+    def _load_resume_state(self, manifest):
+        """
+        Return (results, rows_to_fetch) for continuing the run recorded in the manifest,
+        both as (position, row) pairs so the results keep the run's order. Near-duplicates
+        found in the interrupted run stay out of both.
+        """
         results = []
+        rows = []
+        finished = manifest.entries(DONE, FAILED)
+        stored = self.listing_store.get_results([entry['link'] for entry in finished])
+        
+        for position, entry in enumerate(manifest.entries()):
+            if entry['state'] == DUPLICATE:
+                continue
+            result = stored.get(posting_id(entry['link']))
+            retry = entry['state'] == PENDING or (
+                entry['state'] == FAILED and entry['attempts'] < self.max_retries
+            )
+            if retry or result is None:
+                rows.append((position, entry['row']))
+            else:
+                results.append((position, result))
+        return results, rows
+
+    def _persist_processed_flags(self, manifest):
+        """Write the Processed flag of finished links back to links.csv."""
+        if not os.path.exists(self.links_file):
+            return
+        links_df = load_from_csv(self.links_file)
+        if links_df.empty or 'Link' not in links_df.columns:
+            return
+        done_ids = {posting_id(entry['link']) for entry in manifest.entries(DONE, DUPLICATE)}
+        done = links_df['Link'].map(lambda link: posting_id(link) in done_ids)
+        # Rows outside this run (before start_index, skipped or done earlier) keep their flag
+        if 'Processed' in links_df.columns:
+            previous = links_df['Processed'].map(lambda value: str(value).strip().lower() == 'true')
+            done = previous | done
+        links_df['Processed'] = done
+        save_to_csv(links_df, self.links_file)
+
+    def _new_listing_data(self, row):
+        """Initialize the result row of a listing with the defaults of an unfetched page."""
+        listing_data = dict(row)
+        listing_data.update({
+            'Description': "Error: Failed to load page",
+            'Remote': "Not Specified",
+            'Email': "Not Available",
+            'Default Mail': "",
+            'Gmail': "",
+            'Yahoo': "",
+            'Outlook': "",
+            'AOL': "",
+            'Processed': True
+        })
+        return listing_data
+
+    def _fetch_listing(self, idx, link, listing_data, defer=True):
+        """
+        Fetch one listing's details into listing_data; errors are logged, never raised.
+        Returns False without fetching when the host's circuit is open and `defer`
+        is set; without `defer` such a listing is marked unavailable instead.
+        """
+        if not self.circuit_breaker.is_available(link):
+            if defer:
+                return False
+            listing_data['Description'] = "Error: Host unavailable (circuit open)"
+            return True
+        
+        bus.publish('city', city=listing_data.get('City', 'Unknown'), link=link)
+        
+        try:
+            # Try the cache and HTTP first; only the reply flow needs Chrome
+            handled, has_description = self._scrape_listing_browserless(link, listing_data)
+            
+            if not handled and not self.offline:
+                with self._leased_driver():
+                    try:
+                        # A fetched page with a reply button already went through the contact
+                        # cache and the HTTP fast path
+                        reply_tried = has_description and bool(self.reply_fetcher)
+                        self._scrape_listing(link, listing_data, has_description, reply_tried)
+                    except Exception as e:
+                        self.logger.error(f"Error processing listing {idx}: {str(e)}")
+                        self.logger.error(f"Traceback: {traceback.format_exc()}")
+                        
+                        # Reset driver on error
+                        self._reset_driver()
+        except Exception as e:
+            self.logger.error(f"Error processing listing {idx}: {str(e)}")
+        return True
+
+    def _result_recorder(self, store, manifest):
+        """
+        Return record(position, link, listing_data, total), which journals one finished
+        listing, checkpoints it and publishes progress. Safe to call from several workers.
+        """
+        progress_lock = threading.Lock()
+        done_count = [0]
         
-        # Handle start_index and max_listings
-        if start_index > 0:
-            if start_index >= len(df):
+        def record(position, link, listing_data, total):
+            with progress_lock:
+                failed = str(listing_data.get('Description', '')).startswith("Error:")
+                duplicate_of = None if failed else self._near_duplicate_description(link, listing_data)
+                # Reposts are remembered but kept out of the results (and email generation)
+                if duplicate_of is None:
+                    store.append(position, listing_data)
+                # Re-parsed cached pages are not a scrape; incremental mode must not count them
+                if not self.offline:
+                    self.listing_store.save_result(listing_data)
+                manifest.mark(link, FAILED if failed else DUPLICATE if duplicate_of else DONE)
+                done_count[0] += 1
+                processed = done_count[0]
+                
+                # Make progress durable after each batch
+                if processed % self.batch_size == 0:
+                    store.sync()
+                    manifest.sync()
+                    self.logger.info(f"Saved {processed} new results to {self.results_journal_file}")
+            
+            bus.publish('listing_processed', link=link, city=listing_data.get('City', 'Unknown'),
+                        ok=not failed, processed=processed, total=total, duplicate_of=duplicate_of)
+        
+        return record
+
+    def _near_duplicate_description(self, link, listing_data):
+        """
+        Index a fetched listing's title and description; returns the posting id
+        its description nearly duplicates, or None.
+        """
+        if not self.near_duplicates:
+            return None
+        if self.offline:
+            # Matched within the run too, but nothing re-parsed offline is indexed for later runs
+            match = self.near_duplicates.check_and_hold(DESCRIPTION, posting_id(link),
+                                                        listing_data.get('Description', ''))
+        else:
+            # Only postings actually fetched block similar titles in later runs
+            self.near_duplicates.add(TITLE, posting_id(link), listing_data.get('Title', ''))
+            match = self.near_duplicates.check_and_add(DESCRIPTION, posting_id(link),
+                                                       listing_data.get('Description', ''))
+        if match is None:
+            return None
+        print(f"Dropping near-duplicate listing: '{listing_data.get('Title')}' "
+              f"(description {match[1]:.0%} similar to posting {match[0]})")
+        return match[0]
+
+    def _clean_stream_rows(self, rows, seen_titles):
+        """
+        Streaming counterpart of clean_listings for one page of rows: drop titles
+        already seen earlier in the run (normalized) and blacklisted ones.
+        """
+        cleaned = []
+        for row in rows:
+            title = normalize_title(row.get('Title', ''))
+            if title in seen_titles:
+                continue
+            seen_titles.add(title)
+            if BLACKLIST_PATTERN.search(title):
+                print(f"Filtering out title: '{row.get('Title')}' containing a blacklisted keyword")
+                continue
+            cleaned.append(row)
+        return cleaned
+
+    def scrape_pipeline(self, max_listings=None, resume=False):
+        """
+        PHASE 1 + PHASE 2 as one streaming pipeline.
+        
+        Each search page's matching listings are cleaned and put on a bounded queue
+        as soon as the page is parsed, and the detail workers consume the queue
+        while the remaining search pages are still being fetched.
+        With resume=True, continue the streaming run recorded in the run manifest:
+        its unfinished listings are queued first, then its unfinished searches run.
+        """
+        manifest = RunManifest(self.run_manifest_file)
+        store = ResultStore(self.results_journal_file)
+        
+        if resume:
+            if not manifest.load() or not manifest.is_resumable():
+                print("No interrupted scraping run to resume")
                 return pd.DataFrame()
-            filtered_df = df.iloc[start_index:]
+            results, resumed = self._load_resume_state(manifest)
+            entries = manifest.entries()
+            urls = manifest.pending_searches()
+            print(f"Resuming run: {len(results)} listings already done, {len(resumed)} remaining, "
+                  f"{len(urls)} searches left")
         else:
-            filtered_df = df
+            results, resumed, entries = [], [], []
+            urls = list(self.urls)
+            manifest.start([], searches=urls)
         
-        if max_listings is not None:
-            filtered_df = filtered_df.iloc[:max_listings]
-            
-        # Import scraping_status from app.py for updating current city
-        from app import scraping_status
+        store.reset()
+        for position, listing in results:
+            store.append(position, listing)
+        record = self._result_recorder(store, manifest)
+        
+        jobs = queue.Queue(maxsize=self.pipeline_queue_size)
+        # New listings are numbered after those the interrupted run discovered
+        counts = {'queued': 0, 'skipped': 0, 'position': len(entries)}
+        discovered = [entry['row'] for entry in entries]
+        seen_ids = {posting_id(entry['link']) for entry in entries}
+        seen_titles = {normalize_title(entry['row'].get('Title', '')) for entry in entries}
+        deferred = []
+        
+        def process(job, defer=True):
+            position, link, listing_data = job
+            if not self._fetch_listing(position, link, listing_data, defer):
+                # Host circuit is open; retry once after the search pages are done
+                deferred.append(job)
+                return
+            record(position, link, listing_data, counts['queued'])
+        
+        def consume():
+            while True:
+                job = jobs.get()
+                if job is None:
+                    return
+                # A failing job must not end the worker: the producer would block on a full queue
+                try:
+                    process(job)
+                except Exception as e:
+                    self.logger.error(f"Error recording listing {job[1]}: {str(e)}")
+                    self.logger.error(f"Traceback: {traceback.format_exc()}")
+        
+        try:
+            with ThreadPoolExecutor(max_workers=self.detail_workers, thread_name_prefix="detail") as executor:
+                consumers = [executor.submit(consume) for _ in range(self.detail_workers)]
+                try:
+                    for position, row in resumed:
+                        jobs.put((position, row['Link'], self._new_listing_data(row)))
+                        counts['queued'] += 1
+                    if resumed:
+                        bus.publish('listings_total', total=counts['queued'], skipped=counts['skipped'])
+                    
+                    for url, listings_found in self._iter_search_pages(max_listings, urls, seen_ids):
+                        self._update_history_file(pd.DataFrame(listings_found))
+                        rows = self._clean_stream_rows(listings_found, seen_titles)
+                        discovered.extend(rows)
+                        
+                        # Only fetch new or changed postings in incremental mode
+                        if self.incremental and rows:
+                            fresh_df, skipped = self._filter_incremental(pd.DataFrame(rows))
+                            rows = fresh_df.to_dict('records')
+                            counts['skipped'] += skipped
+                        
+                        rows = [row for row in rows if row.get('Link')]
+                        if max_listings:
+                            rows = rows[:max_listings - counts['queued']]
+                        
+                        # Checkpoint before queueing so a crash can resume these links
+                        manifest.add(rows)
+                        manifest.finish_search(url)
+                        for row in rows:
+                            # Blocks while the workers are behind, bounding memory
+                            jobs.put((counts['position'], row['Link'], self._new_listing_data(row)))
+                            counts['position'] += 1
+                            counts['queued'] += 1
+                        bus.publish('listings_total', total=counts['queued'], skipped=counts['skipped'])
+                        
+                        if max_listings and counts['queued'] >= max_listings:
+                            break
+                finally:
+                    for _ in consumers:
+                        jobs.put(None)
+                
+                print(f"Search pages done: {counts['queued']} listings queued for details")
+                for future in consumers:
+                    future.result()
+                
+                if deferred:
+                    print(f"Retrying {len(deferred)} listings deferred while their host was unavailable")
+                    list(executor.map(lambda job: process(job, defer=False), deferred))
+            manifest.finish()
+        finally:
+            if discovered:
+                links_df = pd.DataFrame(discovered)
+                if resume and os.path.exists(self.links_file):
+                    # Keep the rows the interrupted run wrote but did not queue, e.g. skipped by incremental mode
+                    links_df = pd.concat([load_from_csv(self.links_file), links_df]).drop_duplicates(subset=['Link'])
+                save_to_csv(links_df, self.links_file)
+            final_df = store.compact(self.output_file)
+            self.logger.info(f"Final results saved to {self.output_file}")
+            manifest.sync()
+            manifest.close()
+            self._persist_processed_flags(manifest)
+            self._report_reply_stats()
+        
+        return final_df
+
+    def scrape_details(self, df=None, start_index=0, max_listings=None, resume=False):
+        """
+        PHASE 2 - STEP 2: Visit each listing and extract email, description, and remote status.
+        With resume=True, continue the run recorded in the run manifest instead.
+        """
+        manifest = RunManifest(self.run_manifest_file)
+        skipped = 0
         
-        # Add already processed listings to results
-        if start_index > 0:
-            already_processed_df = load_from_csv(self.output_file)
-            if not already_processed_df.empty:
-                results.extend(already_processed_df.to_dict('records'))
+        if resume:
+            if not manifest.load() or not manifest.is_resumable():
+                print("No interrupted scraping run to resume")
+                return pd.DataFrame()
+            
+            # Completed links come back from the listing store; only the rest are fetched
+            results, rows = self._load_resume_state(manifest)
+            # Indexed by run position, so resumed listings are journaled in their original order
+            filtered_df = pd.DataFrame([row for _, row in rows], index=[position for position, _ in rows])
+            print(f"Resuming run: {len(results)} listings already done, {len(rows)} remaining")
+        else:
+            if df is None:
+                df = load_from_csv(self.links_file)
+                
+            if df.empty:
+                return pd.DataFrame()
+                
+            results = []
+            
+            # Handle start_index and max_listings
+            if start_index > 0:
+                if start_index >= len(df):
+                    return pd.DataFrame()
+                filtered_df = df.iloc[start_index:]
+            else:
+                filtered_df = df
+            
+            # Only fetch new or changed postings in incremental mode
+            if self.incremental:
+                filtered_df, skipped = self._filter_incremental(filtered_df)
+            
+            if max_listings is not None:
+                filtered_df = filtered_df.iloc[:max_listings]
+            
+            # Add already processed listings to results
+            if start_index > 0:
+                already_processed_df = load_from_csv(self.output_file)
+                if not already_processed_df.empty:
+                    results.extend(enumerate(already_processed_df.to_dict('records')))
+            
+            # Checkpoint every listing of this run so it can be resumed by link
+            manifest.start(filtered_df.to_dict('records'))
         
-        # Reset driver before starting detail scraping
+        # Reset driver before starting detail scraping; listings use pooled sessions
         self.logger.info("Resetting driver before detail scraping...")
         try:
-            if hasattr(self, 'driver') and self.driver:
-                self.driver.quit()
+            if self._driver:
+                self._driver.quit()
         except:
             pass
-        kill_chromedriver_processes()
+        self._driver = None
         
-        # Process each listing
+        # Collect the listings to visit, keeping their input order
+        jobs = []
         for idx, row in filtered_df.iterrows():
-            if max_listings is not None and len(results) >= max_listings:
+            if max_listings is not None and len(results) + len(jobs) >= max_listings:
                 break
             
             # Check if this row has been processed already
             if 'Processed' in row and row['Processed']:
                 continue
             
-            # Update status with current city
-            city = row.get('City', 'Unknown')
-            scraping_status["current_city"] = city
-            
             link = row.get('Link', '')
             if not link:
                 continue
             
-            # Initialize listing data
-            listing_data = row.to_dict()
-            listing_data.update({
-                'Description': "Error: Failed to load page",
-                'Remote': "Not Specified",
-                'Email': "Not Available",
-                'Default Mail': "",
-                'Gmail': "",
-                'Yahoo': "",
-                'Outlook': "",
-                'AOL': "",
-                'Processed': True
-            })
-            
-            try:
-                # Instead of using _load_page_with_retry, use the special listing page handler
-                if not self._load_listing_page(link):
-                    self.logger.error(f"Failed to load listing page: {link}")
-                    results.append(listing_data)
-                    continue
-                
-                # Extract description
-                try:
-                    description_element = None
-                    desc_selectors = ["#postingbody", "section#postingbody", "div[data-testid='postingbody']"]
-                    
-                    for selector in desc_selectors:
-                        try:
-                            description_element = WebDriverWait(self.driver, 10).until(
-                                EC.presence_of_element_located((By.CSS_SELECTOR, selector))
-                            )
-                            if description_element:
-                                break
-                        except:
-                            continue
-                    
-                    if description_element:
-                        description = description_element.text.strip()
-                        listing_data['Description'] = description
-                        listing_data['Remote'] = self._check_remote_status(description)
-                except Exception as e:
-                    self.logger.error(f"Error extracting description: {str(e)}")
-                
-                # Extract email information
-                email_info = self._extract_email_info()
-                listing_data.update(email_info)
-                
-                # Add to results
-                results.append(listing_data)
-                
-                # Save progress after each batch
-                if len(results) % self.batch_size == 0:
-                    progress_df = pd.DataFrame(results)
-                    save_to_csv(progress_df, self.output_file)
-                    self.logger.info(f"Saved {len(results)} results to {self.output_file}")
-                
-                # Random delay between listings
-                time.sleep(random.uniform(2, 5))
-                
-            except Exception as e:
-                self.logger.error(f"Error processing listing {idx}: {str(e)}")
-                self.logger.error(f"Traceback: {traceback.format_exc()}")
-                results.append(listing_data)
-                
-                # Reset driver on error
-                try:
-                    if self.driver:
-                        self.driver.quit()
-                except:
-                    pass
-                kill_chromedriver_processes()
-                self.driver = self._setup_driver()
+            jobs.append((idx, link, self._new_listing_data(row.to_dict())))
+        
+        # Finished listings are journaled with their input position; results.csv is
+        # compacted from the journal in input order at the end
+        store = ResultStore(self.results_journal_file)
+        store.reset()
+        for position, listing in results:
+            store.append(position, listing)
+        # A resumed run keeps each listing's position in the run; otherwise they follow the earlier results
+        offset = len(results)
+        positions = [idx if resume else offset + position for position, (idx, _, _) in enumerate(jobs)]
+        
+        record = self._result_recorder(store, manifest)
+        bus.publish('listings_total', total=len(jobs), skipped=skipped)
+        
+        deferred = []
         
-        # Save final results
-        final_df = pd.DataFrame(results)
-        save_to_csv(final_df, self.output_file)
-        self.logger.info(f"Final results saved to {self.output_file}")
+        def process(position, defer=True):
+            idx, link, listing_data = jobs[position]
+            if not self._fetch_listing(idx, link, listing_data, defer):
+                # Host circuit is open; retry once after the other listings
+                deferred.append(position)
+                return
+            record(positions[position], link, listing_data, len(jobs))
+        
+        def run(positions, defer=True):
+            if self.detail_workers > 1 and len(positions) > 1:
+                self.logger.info(f"Scraping {len(positions)} listings with {self.detail_workers} workers")
+                with ThreadPoolExecutor(max_workers=self.detail_workers) as executor:
+                    list(executor.map(lambda position: process(position, defer), positions))
+            else:
+                for position in positions:
+                    process(position, defer)
+        
+        # Process each listing, fanning out across workers when configured
+        try:
+            run(range(len(jobs)))
+            if deferred:
+                print(f"Retrying {len(deferred)} listings deferred while their host was unavailable")
+                run(sorted(deferred), defer=False)
+            manifest.finish()
+        finally:
+            # Save final results, including a partial run that was interrupted
+            final_df = store.compact(self.output_file)
+            self.logger.info(f"Final results saved to {self.output_file}")
+            manifest.sync()
+            manifest.close()
+            self._persist_processed_flags(manifest)
+            self._report_reply_stats()
         
         return final_df
 
+    def resume(self):
+        """
+        Continue the run recorded in the run manifest. A streaming run interrupted
+        before its searches finished goes back through the pipeline; any other run
+        only fetches its remaining details.
+        """
+        manifest = RunManifest(self.run_manifest_file)
+        if manifest.load() and manifest.pending_searches():
+            return self.scrape_pipeline(resume=True)
+        return self.scrape_details(resume=True)
+
     def close(self):
         """Close the browser and save cookies."""
         if hasattr(self, 'driver') and self.driver:
@@ -1110,9 +1955,35 @@ class CraigslistScraper:
                 self.driver.quit()
             except Exception as e:
                 print(f"Error closing browser: {str(e)}")
+        
+        # Release pooled HTTP connections
+        if getattr(self, 'http_fetcher', None):
+            self.http_fetcher.close()
+        if getattr(self, 'reply_fetcher', None) and self.reply_fetcher is not self.http_fetcher:
+            self.reply_fetcher.close()
+        
+        if getattr(self, 'page_cache', None):
+            self.page_cache.close()
+        
+        if getattr(self, 'contact_cache', None):
+            self.contact_cache.close()
+        
+        if getattr(self, 'near_duplicates', None):
+            self.near_duplicates.close()
+        
+        # Close the pooled listing sessions, keeping cookies from the warmest one
+        if hasattr(self, 'driver_pool'):
+            cookies_saved = []
+            
+            def save_first_cookies(driver):
+                if not cookies_saved:
+                    self._save_cookies(driver)
+                    cookies_saved.append(True)
+            
+            self.driver_pool.close(before_quit=save_first_cookies)
                 
         # Clean up the temporary user data directory
-        if hasattr(self, 'user_data_dir') and os.path.exists(self.user_data_dir):
+        if getattr(self, 'user_data_dir', None) and os.path.exists(self.user_data_dir):
             try:
                 shutil.rmtree(self.user_data_dir)
                 print(f"Removed temporary user data directory: {self.user_data_dir}")
@@ -1122,67 +1993,91 @@ class CraigslistScraper:
         # Reset CAPTCHA flag
         self._captcha_detected = False
 
-    def _update_history_file(self):
-        """Update the history file with new links from the current scraping run"""
+    def _update_history_file(self, df=None):
+        """Record links from the current scraping run in the listing history"""
+        # Offline runs only re-parse pages scraped earlier
+        if self.offline:
+            return
         try:
-            # Read existing links from history file
-            existing_links = set()
-            if os.path.exists(self.history_links_file):
-                with open(self.history_links_file, 'r', encoding='utf-8') as f:
-                    # Skip header
-                    next(f)
-                    for line in f:
-                        link = line.split(',')[0].strip()
-                        existing_links.add(link)
-
             # Read new links from current scraping run
-            new_links = []
-            if os.path.exists(self.links_file):
-                with open(self.links_file, 'r', encoding='utf-8') as f:
-                    # Skip header
-                    next(f)
-                    for line in f:
-                        parts = line.strip().split(',')
-                        if len(parts) >= 3:
-                            link, city, title = parts[0], parts[1], parts[2]
-                            if link not in existing_links:
-                                new_links.append(f"{link},{city},{title},{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-
-            # Append new links to history file
-            if new_links:
-                with open(self.history_links_file, 'a', encoding='utf-8') as f:
-                    f.writelines(new_links)
-                print(f"Added {len(new_links)} new links to history file")
+            if df is None:
+                if not os.path.exists(self.links_file):
+                    return
+                df = load_from_csv(self.links_file)
+            if df.empty or 'Link' not in df.columns:
+                return
+            
+            added = self.listing_store.record_links(df.to_dict('records'))
+            if added:
+                print(f"Added {added} new links to listing history")
 
         except Exception as e:
-            print(f"Error updating history file: {str(e)}")
+            print(f"Error updating history: {str(e)}")
 
     def cleanup(self):
-        """Cleanup method that also updates the history file"""
+        """Cleanup method that also updates the listing history"""
         self._update_history_file()
         # Add any other cleanup code here 
 
-    def _save_cookies(self):
+    def _save_cookies(self, driver=None):
         """Save current cookies to file."""
-        if self.driver:
+        driver = driver or self.driver
+        if driver:
             try:
-                cookies = self.driver.get_cookies()
-                with open(COOKIES_FILE, 'w') as f:
-                    json.dump(cookies, f)
+                cookies = driver.get_cookies()
+                # Write atomically, new drivers may be reading the file concurrently
+                with self._cookies_lock:
+                    temp_path = f"{COOKIES_FILE}.tmp"
+                    with open(temp_path, 'w') as f:
+                        json.dump(cookies, f)
+                    os.replace(temp_path, COOKIES_FILE)
                 print("Successfully saved cookies to file")
             except Exception as e:
                 print(f"Error saving cookies: {str(e)}")
 
+    def _restore_session(self, driver, profile_dir=None):
+        """
+        Load the saved session into a new driver before its first navigation.
+        Returns True if the driver already has a usable session and needs no warm-up.
+        """
+        if not self.session_reuse:
+            return False
+        
+        cookies = saved_cookies(COOKIES_FILE, self.session_max_age_hours)
+        if cookies and inject_cookies(driver, cookies):
+            self.logger.info(f"Loaded {len(cookies)} saved cookies, skipping warm-up")
+            return True
+        
+        if profile_dir and profile_has_cookies(profile_dir):
+            self.logger.info(f"Reusing the session in {profile_dir}, skipping warm-up")
+            return True
+        return False
+
     def _setup_driver(self):
-        """Set up and return a Chrome WebDriver instance."""
+        """Set up and return the scraper's own Chrome WebDriver instance."""
+        driver, self.user_data_dir = self._create_driver()
+        return driver
+
+    def _create_driver(self):
+        """
+        Create a Chrome WebDriver instance and return it with its user data directory.
+        The directory is None for persistent profiles, which must outlive the driver.
+        """
+        user_data_dir = None
+        profile_dir = None
         try:
             chrome_options = Options()
             if self.use_headless:
                 chrome_options.add_argument("--headless=new")
             
-            # Create a temporary directory for user data
-            self.user_data_dir = tempfile.mkdtemp()
-            chrome_options.add_argument(f"--user-data-dir={self.user_data_dir}")
+            if self.profiles:
+                # Persistent profile: keeps cookies and cache between runs
+                profile_dir = self.profiles.claim()
+                chrome_options.add_argument(f"--user-data-dir={profile_dir}")
+            else:
+                # Create a temporary directory for user data
+                user_data_dir = tempfile.mkdtemp()
+                chrome_options.add_argument(f"--user-data-dir={user_data_dir}")
             
             # Add essential options
             chrome_options.add_argument("--disable-dev-shm-usage")
@@ -1191,7 +2086,7 @@ class CraigslistScraper:
             chrome_options.add_argument("--window-size=1920,1080")
             chrome_options.add_argument("--disable-notifications")
             chrome_options.add_argument("--disable-popup-blocking")
-            chrome_options.add_argument("--disable-features=VizDisplayCompositor")
+            chrome_options.add_argument(disabled_features_argument(self.lean_browser))
             chrome_options.add_argument("--disable-site-isolation-trials")
             chrome_options.add_argument("--disable-web-security")  # Add this to handle cross-domain issues
             chrome_options.add_argument("--allow-running-insecure-content")  # Add this for mixed content
@@ -1211,6 +2106,10 @@ class CraigslistScraper:
                 "profile.default_content_settings.cookies": 1,  # Allow cookies
                 "profile.block_third_party_cookies": False  # Allow third-party cookies
             }
+            
+            # Skip images, media, fonts and third-party hosts, and stop waiting at DOMContentLoaded
+            if self.lean_browser:
+                apply_lean_options(chrome_options, prefs)
             chrome_options.add_experimental_option("prefs", prefs)
             
             # Set up service
@@ -1220,24 +2119,38 @@ class CraigslistScraper:
             # Create driver
             self.logger.info("Creating Chrome WebDriver instance...")
             driver = webdriver.Chrome(service=service, options=chrome_options)
+            if profile_dir:
+                self.profiles.bind(profile_dir, driver)
             driver.set_page_load_timeout(30)
+            if self.lean_browser:
+                block_resources(driver)
+            
+            if self._restore_session(driver, profile_dir):
+                return driver, user_data_dir
             
             # Test the driver
             try:
                 self.logger.info("Testing driver with initial page load...")
+                self.rate_limiter.acquire("https://www.craigslist.org")
                 driver.get("https://www.craigslist.org")
                 time.sleep(2)  # Short wait to ensure page loads
             except Exception as e:
                 self.logger.error(f"Error during initial page load: {str(e)}")
                 raise
             
-            return driver
+            # Share the warmed-up session with the drivers created after this one
+            if self.session_reuse and not saved_cookies(COOKIES_FILE, self.session_max_age_hours):
+                self._save_cookies(driver)
+            
+            return driver, user_data_dir
             
         except Exception as e:
             self.logger.error(f"Error setting up Chrome WebDriver: {str(e)}")
-            if hasattr(self, 'user_data_dir') and os.path.exists(self.user_data_dir):
+            if profile_dir:
+                self.profiles.release(profile_dir)
+            if user_data_dir and os.path.exists(user_data_dir):
                 try:
-                    shutil.rmtree(self.user_data_dir)
+                    shutil.rmtree(user_data_dir)
                 except Exception:
                     pass
             raise 
\ No newline at end of file
@@ -34,26 +34,6 @@ def get_random_user_agent():
         return "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
     return random.choice(USER_AGENTS)
 
-def random_delay(min_delay=None, max_delay=None):
-    """Apply a random delay within the specified range."""
-    try:
-        if min_delay is None:
-            min_delay = float(os.getenv('MIN_DELAY_BETWEEN_ACTIONS', 2))
-        if max_delay is None:
-            max_delay = float(os.getenv('MAX_DELAY_BETWEEN_ACTIONS', 5))
-        
-        # Ensure valid delay values
-        min_delay = max(0.1, float(min_delay))
-        max_delay = max(min_delay, float(max_delay))
-        
-        delay = random.uniform(min_delay, max_delay)
-        time.sleep(delay)
-        return delay
-    except (ValueError, TypeError) as e:
-        print(f"Warning in random_delay: {str(e)}. Using default delay.")
-        time.sleep(2)
-        return 2
-
 def save_to_csv(data, filepath):
     """Save data to a CSV file."""
     try: